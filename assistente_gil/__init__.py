@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Motores do Assistente Virtual da GIL, independentes do Streamlit.
+
+Erros e avisos não são exibidos diretamente: são devolvidos como objetos
+`Mensagem`, no atributo `mensagens` dos processadores ou na lista passada
+no parâmetro `mensagens` das funções.
+"""
+from .aquecimento import preparar_artefatos
+from .chatbot import DOCUMENTOS_PRE_CARREGADOS, PROMPTS_POR_DOCUMENTO, carregar_documento_do_disco
+from .diarios import (
+    AdministrativeProcessor,
+    ExecutiveProcessor,
+    LegislativeProcessor,
+    extrair_texto_legislativo,
+)
+from .documento import DocumentoPDF
+from .exemplos_indexacao import ExemploIndexacao, buscar_exemplos, extrair_exemplos_do_pdf
+from .exportacao import dataframes_para_xlsx, exportar_dataframes
+from .indice import consultar_indice, indexar_edicao
+from .ingestao import ingerir_periodo
+from .jornal import gerar_link_edicao
+from .llm import answer_from_document, gerar_resumo, gerar_termos_llm, pre_aquecer_cache_respostas
+from .mensagens import NIVEL_AVISO, NIVEL_ERRO, NIVEL_INFO, Mensagem
+from .ocr import FilaJobsOCR, correct_ocr_text
+from .termos import aplicar_logica_hierarquia, carregar_dicionario_termos, gerar_resumo_e_termos
+
+__all__ = [
+    "AdministrativeProcessor",
+    "DOCUMENTOS_PRE_CARREGADOS",
+    "DocumentoPDF",
+    "ExemploIndexacao",
+    "ExecutiveProcessor",
+    "FilaJobsOCR",
+    "LegislativeProcessor",
+    "Mensagem",
+    "NIVEL_AVISO",
+    "NIVEL_ERRO",
+    "NIVEL_INFO",
+    "PROMPTS_POR_DOCUMENTO",
+    "answer_from_document",
+    "aplicar_logica_hierarquia",
+    "buscar_exemplos",
+    "carregar_dicionario_termos",
+    "carregar_documento_do_disco",
+    "consultar_indice",
+    "correct_ocr_text",
+    "dataframes_para_xlsx",
+    "exportar_dataframes",
+    "extrair_exemplos_do_pdf",
+    "extrair_texto_legislativo",
+    "gerar_link_edicao",
+    "gerar_resumo",
+    "gerar_resumo_e_termos",
+    "gerar_termos_llm",
+    "indexar_edicao",
+    "ingerir_periodo",
+    "pre_aquecer_cache_respostas",
+    "preparar_artefatos",
+]
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Linha de comando dos motores do Assistente Virtual da GIL.
+
+Exemplos:
+    python -m assistente_gil diario legislativo diario.pdf -o Legislativo_Extraido.xlsx
+    python -m assistente_gil diario executivo diario.pdf --data-edicao 2025-03-14
+    python -m assistente_gil consultar PL 1.234 2025
+    python -m assistente_gil ingerir legislativo 2025-03-01 2025-03-31 --url-modelo "http://espelho/{diario}/{data:%Y-%m-%d}.pdf"
+    python -m assistente_gil pre-aquecer-cache proposicoes/*.txt
+    python -m assistente_gil preparar-artefatos
+    python -m assistente_gil --diagnostico diario executivo diario.pdf
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+from .aquecimento import SITUACAO_FALHOU, preparar_artefatos
+from .artefatos import DIRETORIO_ARTEFATOS
+from .configuracao import caminho_documento
+from .diagnostico import configurar_log_json
+from .diarios import AdministrativeProcessor, ExecutiveProcessor, LegislativeProcessor, extrair_texto_legislativo
+from .exportacao import dataframes_para_xlsx
+from .indice import consultar_indice
+from .ingestao import DIARIOS_INGESTAO, INGESTAO_MAX_TRABALHOS, INGESTAO_URL_MODELO, gerador_de_links, ingerir_periodo
+from .llm import pre_aquecer_cache_respostas
+from .mensagens import possui_erro
+from .termos import ARQUIVO_DICIONARIO_TERMOS, obter_dicionario_termos
+
+def imprimir_mensagens(mensagens):
+    for mensagem in mensagens:
+        print(f"[{mensagem.nivel}] {mensagem.texto}", file=sys.stderr)
+
+def comando_diario(args):
+    indexacao = {"edicao": args.data_edicao, "origem": os.path.basename(args.pdf)}
+    if args.tipo == "legislativo":
+        processor = LegislativeProcessor(extrair_texto_legislativo(args.pdf))
+        dados = dataframes_para_xlsx(processor.process_all(**indexacao)).getvalue()
+        saida = args.saida or "Legislativo_Extraido.xlsx"
+    elif args.tipo == "administrativo":
+        processor = AdministrativeProcessor(args.pdf)
+        dados = processor.to_csv(**indexacao)
+        saida = args.saida or "Administrativo_Extraido.csv"
+    else:
+        processor = ExecutiveProcessor(args.pdf)
+        dados = processor.to_csv(**indexacao)
+        saida = args.saida or "Executivo_Extraido.csv"
+
+    imprimir_mensagens(processor.mensagens)
+    if not dados:
+        print("Nenhum dado extraído.", file=sys.stderr)
+        return 1
+    with open(saida, "wb") as f:
+        f.write(dados)
+    print(saida)
+    return 1 if possui_erro(processor.mensagens) else 0
+
+def comando_consultar(args):
+    resultado = consultar_indice(args.sigla, args.numero, args.ano or "", args.diario)
+    if resultado.empty:
+        print("Nenhuma edição indexada contém esse ato.", file=sys.stderr)
+        return 1
+    resultado.to_csv(sys.stdout, index=False)
+    return 0
+
+def comando_ingerir(args):
+    try:
+        gerar_link = gerador_de_links(args.diario, args.url_modelo)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    mensagens = []
+    contagem = ingerir_periodo(
+        args.diario, args.inicio, args.fim, gerar_link,
+        max_trabalhos=args.trabalhos, refazer=args.refazer, mensagens=mensagens,
+        progresso=lambda feitas, total: print(f"{feitas}/{total}", file=sys.stderr)
+    )
+    imprimir_mensagens(mensagens)
+    print(", ".join(f"{status}: {quantidade}" for status, quantidade in contagem.items()))
+    return 1 if possui_erro(mensagens) else 0
+
+def comando_pre_aquecer_cache(args):
+    mensagens = []
+    termos_dicionario, _ = obter_dicionario_termos(caminho_documento(ARQUIVO_DICIONARIO_TERMOS), mensagens)
+    if "Minas Gerais (MG)" in termos_dicionario:
+        termos_dicionario.remove("Minas Gerais (MG)")
+
+    textos = []
+    for caminho in args.arquivos:
+        with open(caminho, "r", encoding="utf-8") as f:
+            textos.append(f.read())
+    total = pre_aquecer_cache_respostas(
+        textos, termos_dicionario, opcoes_num_termos=args.num_termos,
+        incluir_resumo=not args.sem_resumo, mensagens=mensagens
+    )
+    imprimir_mensagens(mensagens)
+    print(f"{total} texto(s) processado(s).")
+    return 1 if possui_erro(mensagens) else 0
+
+def comando_preparar_artefatos(args):
+    mensagens = []
+    situacoes = preparar_artefatos(mensagens)
+    imprimir_mensagens(mensagens)
+    for nome, situacao in situacoes.items():
+        print(f"{nome}: {situacao}")
+    print(DIRETORIO_ARTEFATOS)
+    return 1 if possui_erro(mensagens) or SITUACAO_FALHOU in situacoes.values() else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="assistente_gil", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--diagnostico", action="store_true",
+                        help="Registra no stderr o tempo e a memória de cada etapa, em JSON.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    parser_diario = subparsers.add_parser("diario", help="Extrai dados de um Diário Oficial em PDF.")
+    parser_diario.add_argument("tipo", choices=("legislativo", "administrativo", "executivo"))
+    parser_diario.add_argument("pdf")
+    parser_diario.add_argument("-o", "--saida")
+    parser_diario.add_argument("--data-edicao", type=date.fromisoformat, metavar="AAAA-MM-DD",
+                               help="Grava as linhas extraídas no índice de edições, com esta data.")
+    parser_diario.set_defaults(funcao=comando_diario)
+
+    parser_consultar = subparsers.add_parser(
+        "consultar", help="Lista, em CSV, as edições indexadas em que aparece um ato."
+    )
+    parser_consultar.add_argument("sigla", help="Ex.: PL, RQN, LEI, DEC.")
+    parser_consultar.add_argument("numero")
+    parser_consultar.add_argument("ano", nargs="?")
+    parser_consultar.add_argument("--diario", choices=("legislativo", "administrativo", "executivo"))
+    parser_consultar.set_defaults(funcao=comando_consultar)
+
+    parser_ingerir = subparsers.add_parser(
+        "ingerir", help="Baixa, extrai e indexa as edições de um período, retomando de onde parou."
+    )
+    parser_ingerir.add_argument("diario", choices=DIARIOS_INGESTAO)
+    parser_ingerir.add_argument("inicio", type=date.fromisoformat, metavar="AAAA-MM-DD")
+    parser_ingerir.add_argument("fim", type=date.fromisoformat, metavar="AAAA-MM-DD")
+    parser_ingerir.add_argument("--url-modelo", default=INGESTAO_URL_MODELO, required=not INGESTAO_URL_MODELO,
+                                help="Link do PDF de cada edição, com {data:%%Y-%%m-%%d} e {diario}. "
+                                     "Padrão: GIL_INGESTAO_URL_MODELO.")
+    parser_ingerir.add_argument("--trabalhos", type=int, default=INGESTAO_MAX_TRABALHOS)
+    parser_ingerir.add_argument("--refazer", action="store_true",
+                                help="Processa de novo também as datas já concluídas ou sem edição.")
+    parser_ingerir.set_defaults(funcao=comando_ingerir)
+
+    parser_cache = subparsers.add_parser(
+        "pre-aquecer-cache", help="Gera e guarda em cache resumos e termos para textos de proposições."
+    )
+    parser_cache.add_argument("arquivos", nargs="+", help="Arquivos .txt, um texto de proposição por arquivo.")
+    parser_cache.add_argument("--num-termos", type=int, nargs="+", default=[3, 5, 10])
+    parser_cache.add_argument("--sem-resumo", action="store_true")
+    parser_cache.set_defaults(funcao=comando_pre_aquecer_cache)
+
+    parser_artefatos = subparsers.add_parser(
+        "preparar-artefatos",
+        help="Extrai e indexa os documentos estáticos (PDFs do Chatbot, Manual de Indexação, Thesaurus) "
+             "em artefatos prontos para carregar; use na construção da imagem do servidor."
+    )
+    parser_artefatos.set_defaults(funcao=comando_preparar_artefatos)
+
+    args = parser.parse_args(argv)
+    if args.diagnostico:
+        configurar_log_json()
+    if not os.environ.get("GOOGLE_API_KEY") and args.comando == "pre-aquecer-cache":
+        print("Aviso: GOOGLE_API_KEY não definida; apenas respostas já em cache serão aproveitadas.", file=sys.stderr)
+    return args.funcao(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Aquecimento do servidor: prepara os artefatos dos documentos estáticos (ver
+`artefatos`) e monta no processo o que, de outro modo, só seria montado no
+primeiro uso (índice de exemplos do Manual de Indexação, regras dos motores),
+para que o primeiro usuário depois de um deploy não espere por isso.
+"""
+import os
+
+from .artefatos import artefato_valido
+from .chatbot import DOCUMENTOS_PRE_CARREGADOS, carregar_documento
+from .configuracao import caminho_documento
+from .diagnostico import medir
+from .diarios import ExecutiveProcessor, LegislativeProcessor
+from .exemplos_indexacao import ARQUIVO_MANUAL_INDEXACAO, obter_indice_exemplos
+from .mensagens import NIVEL_AVISO, NIVEL_ERRO, registrar
+from .termos import ARQUIVO_DICIONARIO_TERMOS, obter_dicionario_termos
+
+SITUACAO_EM_DIA = "em dia"
+SITUACAO_GERADO = "gerado"
+SITUACAO_FALHOU = "falhou"
+
+def _artefatos(mensagens):
+    """(tipo, caminho do arquivo de origem, função que carrega ou gera o artefato)."""
+    for nome_arquivo in DOCUMENTOS_PRE_CARREGADOS.values():
+        caminho = caminho_documento(nome_arquivo)
+        yield "texto", caminho, lambda caminho=caminho: carregar_documento(caminho, mensagens)
+    yield "exemplos", caminho_documento(ARQUIVO_MANUAL_INDEXACAO), obter_indice_exemplos
+    caminho = caminho_documento(ARQUIVO_DICIONARIO_TERMOS)
+    yield "thesaurus", caminho, lambda: obter_dicionario_termos(caminho, mensagens)
+
+def preparar_artefatos(mensagens=None, etapas=None):
+    """Gera os artefatos que faltam ou estão desatualizados; retorna {"arquivo (tipo)": situação}."""
+    situacoes = {}
+    for tipo, caminho, carregar in _artefatos(mensagens):
+        nome = f"{os.path.basename(caminho)} ({tipo})"
+        if not os.path.exists(caminho):
+            registrar(mensagens, NIVEL_AVISO, f"Documento não encontrado, artefato não gerado: {caminho}")
+            continue
+        if artefato_valido(tipo, caminho):
+            situacao = SITUACAO_EM_DIA
+        else:
+            with medir(f"artefatos.{tipo}", etapas, arquivo=os.path.basename(caminho)):
+                try:
+                    carregar()
+                except Exception as e:
+                    registrar(mensagens, NIVEL_ERRO, f"Erro ao gerar o artefato {nome}: {e}")
+            situacao = SITUACAO_GERADO if artefato_valido(tipo, caminho) else SITUACAO_FALHOU
+        situacoes[nome] = situacao
+    return situacoes
+
+def aquecer_regras(etapas=None):
+    """Compila as expressões regulares dos motores (cache do módulo `re`) com um texto mínimo."""
+    with medir("aquecimento.regras", etapas):
+        LegislativeProcessor("TRAMITAÇÃO DE PROPOSIÇÕES\nRECEBIMENTO DE PROPOSIÇÃO\n").process_all(paralelo=False)
+        ExecutiveProcessor(b"")
+
+def aquecer(mensagens=None, etapas=None):
+    """Artefatos em disco, índice de exemplos e regras prontos no processo."""
+    situacoes = preparar_artefatos(mensagens, etapas)
+    with medir("aquecimento.exemplos", etapas):
+        try:
+            obter_indice_exemplos()
+        except Exception as e:
+            registrar(mensagens, NIVEL_AVISO, f"Índice de exemplos do Manual de Indexação não montado: {e}")
+    aquecer_regras(etapas)
+    return situacoes
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Artefatos pré-processados dos documentos estáticos (texto dos PDFs do Chatbot,
+exemplos do Manual de Indexação, Thesaurus), gravados em disco para que o
+servidor não refaça a extração a cada reinício. Cada artefato guarda o hash do
+arquivo de origem e é refeito quando o arquivo muda. Os artefatos são JSON (só
+dados: ler um artefato adulterado no diretório não executa código), por isso quem
+os constrói devolve tipos simples (str, list, dict, números).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from .configuracao import CACHE_DIR
+
+# Incrementar quando o formato de algum artefato mudar, para descartar os antigos.
+VERSAO_ARTEFATOS = "2"
+DIRETORIO_ARTEFATOS = os.environ.get("GIL_ARTEFATOS_DIR", os.path.join(CACHE_DIR, "artefatos"))
+
+_travas = {}
+_trava_travas = threading.Lock()
+
+def _trava(caminho):
+    """Uma trava por artefato, para que duas threads não montem o mesmo artefato ao mesmo tempo."""
+    with _trava_travas:
+        return _travas.setdefault(caminho, threading.Lock())
+
+def hash_arquivo(caminho):
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def caminho_artefato(tipo, arquivo_origem):
+    return os.path.join(DIRETORIO_ARTEFATOS, f"{os.path.basename(arquivo_origem)}.{tipo}.json")
+
+def _ler(caminho, assinatura):
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            registro = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(registro, dict) or registro.get("versao") != VERSAO_ARTEFATOS or registro.get("origem") != assinatura:
+        return None
+    return registro
+
+def _gravar(caminho, assinatura, dados):
+    conteudo = json.dumps({"versao": VERSAO_ARTEFATOS, "origem": assinatura, "dados": dados}, ensure_ascii=False)
+    temporario = None
+    try:
+        os.makedirs(DIRETORIO_ARTEFATOS, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=DIRETORIO_ARTEFATOS, suffix=".tmp", delete=False) as f:
+            temporario = f.name
+            f.write(conteudo)
+        # O temporário nasce só com leitura do dono; o servidor pode rodar com outro usuário que o da construção.
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, caminho)  # atômico: quem lê nunca vê um artefato pela metade
+    except OSError:
+        # Disco cheio, sem permissão...: segue sem o artefato, mas não deixa o temporário para trás.
+        if temporario is not None and os.path.exists(temporario):
+            os.unlink(temporario)
+
+def artefato_valido(tipo, arquivo_origem):
+    try:
+        assinatura = hash_arquivo(arquivo_origem)
+    except OSError:
+        return False
+    return _ler(caminho_artefato(tipo, arquivo_origem), assinatura) is not None
+
+def carregar_ou_construir(tipo, arquivo_origem, construir):
+    """
+    Dados do artefato `tipo` de `arquivo_origem`. Sem artefato válido, chama `construir()`
+    e grava o resultado para as próximas vezes (None, usado para indicar falha, não é gravado).
+    Os dados precisam ser serializáveis em JSON; tuplas voltam do disco como listas.
+    """
+    try:
+        assinatura = hash_arquivo(arquivo_origem)
+    except OSError:
+        return construir()  # arquivo ausente: quem constrói registra o erro
+    caminho = caminho_artefato(tipo, arquivo_origem)
+    with _trava(caminho):
+        registro = _ler(caminho, assinatura)
+        if registro is not None:
+            return registro["dados"]
+        dados = construir()
+        if dados is not None:
+            _gravar(caminho, assinatura, dados)
+        return dados
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+
+CACHE_DIR = os.environ.get("GIL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "gil_cache"))
+
+def obter_api_key():
+    return os.environ.get("GOOGLE_API_KEY")
+
+# Documentos estáticos (PDFs do chatbot e dicionário de termos) ficam na raiz do repositório.
+DIRETORIO_DOCUMENTOS = os.environ.get(
+    "GIL_DOCUMENTOS_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+def caminho_documento(nome_arquivo):
+    return os.path.join(DIRETORIO_DOCUMENTOS, nome_arquivo)
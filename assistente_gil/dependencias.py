@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import importlib
+import importlib.util
+
+class ModuloTardio:
+    """Adia a importação de uma dependência até o primeiro acesso a um de seus atributos."""
+    def __init__(self, nome):
+        self._nome = nome
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nome)
+        return getattr(self._modulo, atributo)
+
+def disponivel(nome):
+    """Indica se a dependência opcional está instalada, sem importá-la."""
+    return importlib.util.find_spec(nome) is not None
+
+pd = ModuloTardio("pandas")
+pypdf = ModuloTardio("pypdf")
+fitz = ModuloTardio("fitz")  # PyMuPDF
+requests = ModuloTardio("requests")
+docx = ModuloTardio("docx")
+openpyxl = ModuloTardio("openpyxl")
+xlsxwriter = ModuloTardio("xlsxwriter")
+sklearn_texto = ModuloTardio("sklearn.feature_extraction.text")
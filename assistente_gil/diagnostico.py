@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Medição por etapa (tempo de relógio, tempo de CPU e memória) dos fluxos do
+assistente. Cada etapa medida é registrada como log JSON no logger
+"assistente_gil.diagnostico" e, se uma lista for passada, devolvida como
+objeto `Etapa` para exibição.
+
+O pico de memória Python (tracemalloc, acima do início da etapa) só é medido
+com GIL_DIAGNOSTICO_TRACEMALLOC=1, porque o rastreamento deixa as extrações bem
+mais lentas. Com várias threads medindo ao mesmo tempo, esse pico é aproximado.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger("assistente_gil.diagnostico")
+
+DIAGNOSTICO_TRACEMALLOC = os.environ.get("GIL_DIAGNOSTICO_TRACEMALLOC") == "1"
+
+@dataclass(frozen=True)
+class Etapa:
+    nome: str
+    segundos: float
+    cpu_segundos: float
+    pico_rss_bytes: int | None = None
+    pico_python_bytes: int | None = None
+    atributos: dict = field(default_factory=dict)
+
+def pico_rss_bytes():
+    """Maior memória residente do processo até agora (não é reiniciada entre etapas)."""
+    if resource is None:
+        return None
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS.
+    fator = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * fator
+
+_pilha_tracemalloc = threading.local()
+
+def _iniciar_tracemalloc():
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    pilha = getattr(_pilha_tracemalloc, "etapas", None)
+    if pilha is None:
+        pilha = _pilha_tracemalloc.etapas = []
+    atual, pico = tracemalloc.get_traced_memory()
+    # O pico é global: guarda o da etapa externa antes de reiniciá-lo para a interna.
+    if pilha:
+        pilha[-1][1] = max(pilha[-1][1], pico)
+    tracemalloc.reset_peak()
+    pilha.append([atual, atual])
+
+def _finalizar_tracemalloc():
+    """Retorna quanto a memória Python subiu, no pico, acima do início da etapa."""
+    pilha = _pilha_tracemalloc.etapas
+    inicio, pico = pilha.pop()
+    pico = max(pico, tracemalloc.get_traced_memory()[1])
+    if pilha:
+        pilha[-1][1] = max(pilha[-1][1], pico)
+    return max(0, pico - inicio)
+
+@contextmanager
+def medir(nome, etapas=None, **atributos):
+    """
+    Mede o bloco como a etapa `nome`. Os atributos (tamanho, número de páginas etc.)
+    vão para o log; a etapa também é anexada a `etapas`, se não for None.
+    """
+    if DIAGNOSTICO_TRACEMALLOC:
+        _iniciar_tracemalloc()
+    inicio = time.perf_counter()
+    inicio_cpu = time.process_time()
+    erro = None
+    try:
+        yield atributos
+    except BaseException as e:
+        erro = type(e).__name__
+        raise
+    finally:
+        etapa = Etapa(
+            nome=nome,
+            segundos=time.perf_counter() - inicio,
+            cpu_segundos=time.process_time() - inicio_cpu,
+            pico_rss_bytes=pico_rss_bytes(),
+            pico_python_bytes=_finalizar_tracemalloc() if DIAGNOSTICO_TRACEMALLOC else None,
+            atributos=dict(atributos, erro=erro) if erro else dict(atributos),
+        )
+        if etapas is not None:
+            etapas.append(etapa)
+        logger.info(json.dumps(
+            {"evento": "etapa", "registrado_em": datetime.now().isoformat(), **asdict(etapa)},
+            ensure_ascii=False, default=str
+        ))
+
+def configurar_log_json(stream=None):
+    """Envia o log de diagnóstico, uma linha JSON por etapa, para `stream` (padrão: stderr). Pode ser chamada várias vezes."""
+    if any(getattr(handler, "log_json_gil", False) for handler in logger.handlers):
+        return
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.log_json_gil = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def etapas_para_json(etapas):
+    return json.dumps([asdict(etapa) for etapa in etapas], ensure_ascii=False, default=str)
+
+def etapas_de_json(texto):
+    return [Etapa(**dados) for dados in json.loads(texto)] if texto else []
@@ -0,0 +1,835 @@
+# -*- coding: utf-8 -*-
+"""Motores de extração dos Diários Oficiais (Legislativo, Administrativo e Executivo)."""
+from __future__ import annotations
+
+import bisect
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+from .dependencias import pd
+from .diagnostico import medir
+from .documento import DocumentoPDF
+from .exportacao import dataframe_para_csv
+from .indice import indexar_edicao
+from .mensagens import NIVEL_AVISO, NIVEL_ERRO, possui_erro, registrar
+from .normalizacao import TextoNormalizado, compilar_normalizado, normalizar
+
+# --- Constantes e Mapeamentos para Extrator de Diários Oficiais ---
+TIPO_MAP_NORMA = {
+    "LEI": "LEI",
+    "RESOLUÇÃO": "RAL",
+    "LEI COMPLEMENTAR": "LCP",
+    "EMENDA À CONSTITUIÇÃO": "EMC",
+    "DELIBERAÇÃO DA MESA": "DLB"
+}
+
+TIPO_MAP_PROP = {
+    "PROJETO DE LEI": "PL",
+    "PROJETO DE LEI COMPLEMENTAR": "PLC",
+    "INDICAÇÃO": "IND",
+    "PROJETO DE RESOLUÇÃO": "PRE",
+    "PROPOSTA DE EMENDA À CONSTITUIÇÃO": "PEC",
+    "MENSAGEM": "MSG",
+    "VETO": "VET"
+}
+
+SIGLA_MAP_PARECER = {
+    "requerimento": "RQN",
+    "projeto de lei": "PL",
+    "pl": "PL",
+    "projeto de resolução": "PRE",
+    "pre": "PRE",
+    "proposta de emenda à constituição": "PEC",
+    "pec": "PEC",
+    "projeto de lei complementar": "PLC",
+    "plc": "PLC",
+    "emendas ao projeto de lei": "EMENDA"
+}
+
+# Chaves normalizadas (ver `normalizacao`): "MARÇO" e o "MARCO" de textos sem acento caem em "marco".
+meses = {
+    "janeiro": "01", "fevereiro": "02", "marco": "03",
+    "abril": "04", "maio": "05", "junho": "06", "julho": "07",
+    "agosto": "08", "setembro": "09", "outubro": "10", "novembro": "11", "dezembro": "12"
+}
+
+# Trecho que identifica cada classificação de requerimento, na ordem de prioridade.
+CLASSIFICACOES_REQUERIMENTO = tuple(
+    (normalizar(trecho), classificacao) for trecho, classificacao in (
+        ("seja formulado voto de congratulações", "Voto de congratulações"),
+        ("manifestação de pesar", "Manifestação de pesar"),
+        ("manifestação de repúdio", "Manifestação de repúdio"),
+        ("moção de aplauso", "Moção de aplauso"),
+        ("r seja formulada manifestação de apoio", "Manifestação de apoio"),
+    )
+)
+
+# Títulos de seção do Diário do Legislativo, com a mesma diferenciação de maiúsculas
+# das regras que os usam.
+PADROES_SECOES_LEGISLATIVO = {
+    "tramitacao": re.compile(r"TRAMITAÇÃO DE PROPOSIÇÕES"),
+    "recebimento": re.compile(r"RECEBIMENTO DE PROPOSIÇÃO", re.IGNORECASE),
+    "nao_recebidas": re.compile(r"PROPOSIÇÕES\s*NÃO\s*RECEBIDAS", re.IGNORECASE),
+}
+
+# Abas da planilha do Legislativo e o método de LegislativeProcessor que produz cada uma.
+ETAPAS_LEGISLATIVO = (
+    ("Normas", "process_normas"),
+    ("Proposicoes", "process_proposicoes"),
+    ("Requerimentos", "process_requerimentos"),
+    ("Pareceres", "process_pareceres"),
+)
+LEGISLATIVO_MAX_PROCESSOS = min(len(ETAPAS_LEGISLATIVO), os.cpu_count() or 1)
+# Em edições menores que isso (em caracteres), abrir processos custa mais do que se ganha.
+LEGISLATIVO_LIMIAR_PARALELO = int(os.environ.get("GIL_LEGISLATIVO_LIMIAR_PARALELO", "3000000"))
+
+# --- Funções Utilitárias para Extrator de Diários Oficiais ---
+def _gravar_no_indice(processor, tabelas, edicao, origem):
+    if possui_erro(processor.mensagens):
+        # Uma extração com erro não substitui o que já estiver indexado para a edição.
+        registrar(processor.mensagens, NIVEL_AVISO, "A edição não foi gravada no índice por causa dos erros na extração.")
+        return
+    with medir("indice.gravar", processor.etapas, diario=processor.nome_etapas) as atributos:
+        atributos["registros"] = indexar_edicao(processor.nome_etapas, edicao, tabelas, origem, processor.mensagens)
+
+def _intervalos_x(blocos) -> list:
+    """Faixas horizontais ocupadas pelos blocos, unindo as que se sobrepõem, da esquerda para a direita."""
+    intervalos = []
+    for x0, _, x1, *_ in sorted(blocos, key=lambda b: b[0]):
+        if intervalos and x0 <= intervalos[-1][1]:
+            intervalos[-1][1] = max(intervalos[-1][1], x1)
+        else:
+            intervalos.append([x0, x1])
+    return intervalos
+
+def _sobrepoe(a, b) -> bool:
+    return a[0] < b[1] and a[1] > b[0]
+
+def _mesmo_layout(colunas, intervalos) -> bool:
+    """Indica se uma nova linha de blocos continua as colunas da faixa atual."""
+    for intervalo in intervalos:
+        sobrepostas = [coluna for coluna in colunas if _sobrepoe(coluna, intervalo)]
+        if len(sobrepostas) > 1:
+            return False  # bloco largo (título) cruzando colunas
+        if not sobrepostas and any(c[1] <= intervalo[0] for c in colunas) and any(c[0] >= intervalo[1] for c in colunas):
+            return False  # coluna nova entre as existentes: mudou a divisão da página
+    return all(sum(_sobrepoe(coluna, intervalo) for intervalo in intervalos) <= 1 for coluna in colunas)
+
+def _titulo_entre_faixas(blocos_linha, colunas, seguinte) -> bool:
+    """
+    Indica se a linha é um título entre duas faixas de colunas, mesmo estreito e alinhado à
+    margem: um só bloco curto (até duas linhas de texto), sem nada nas outras colunas da faixa
+    na mesma altura, seguido de texto em outra coluna. Pela largura, ele passaria por parte
+    da coluna em que cai.
+    """
+    if len(colunas) < 2 or len(blocos_linha) != 1 or blocos_linha[0][4].strip().count("\n") > 1:
+        return False
+    intervalo = (blocos_linha[0][0], blocos_linha[0][2])
+    return any(not _sobrepoe(intervalo, (b[0], b[2])) for b in seguinte)
+
+def colunas_da_pagina(page) -> list:
+    """
+    Texto de uma página do PyMuPDF em ordem de leitura, como lista de (coluna, texto).
+    Os blocos de texto são agrupados em linhas (blocos que se sobrepõem na vertical) e as
+    linhas em faixas com a mesma divisão de colunas; um título (que cruza as colunas ou que
+    fica sozinho na sua altura, ver `_titulo_entre_faixas`) ou uma mudança no número de
+    colunas abre uma nova faixa. Cada faixa é lida coluna a coluna,
+    da esquerda para a direita, numeradas a partir de 1.
+    """
+    blocos = sorted(
+        (b for b in page.get_text("blocks") if b[6] == 0 and b[4].strip()),
+        key=lambda b: (b[1], b[0])
+    )
+    linhas = []
+    for bloco in blocos:
+        if linhas and bloco[1] < linhas[-1][0]:
+            linhas[-1][0] = max(linhas[-1][0], bloco[3])
+            linhas[-1][1].append(bloco)
+        else:
+            linhas.append([bloco[3], [bloco]])
+
+    faixas = []
+    titulo = False  # a última faixa é um título: a linha seguinte abre outra
+    for posicao, (_, blocos_linha) in enumerate(linhas):
+        seguinte = linhas[posicao + 1][1] if posicao + 1 < len(linhas) else []
+        colunas = _intervalos_x(faixas[-1]) if faixas and not titulo else []
+        if _titulo_entre_faixas(blocos_linha, colunas, seguinte):
+            faixas.append(list(blocos_linha))
+            titulo = True
+        elif colunas and _mesmo_layout(colunas, _intervalos_x(blocos_linha)):
+            faixas[-1].extend(blocos_linha)
+        else:
+            faixas.append(list(blocos_linha))
+            titulo = False
+
+    resultado = []
+    for blocos_faixa in faixas:
+        blocos_faixa.sort(key=lambda b: (b[1], b[0]))
+        for coluna, intervalo in enumerate(_intervalos_x(blocos_faixa), start=1):
+            texto = " ".join(b[4] for b in blocos_faixa if _sobrepoe(intervalo, (b[0], b[2])))
+            resultado.append((coluna, texto))
+    return resultado
+
+def indexar_secoes(text: str) -> dict:
+    """
+    Devolve {seção: [(início, fim) de cada título, em ordem]}. Cada título é uma busca
+    literal (rápida); um único padrão com alternativas saía mais lento.
+    """
+    return {
+        nome: [match.span() for match in padrao.finditer(text)]
+        for nome, padrao in PADROES_SECOES_LEGISLATIVO.items()
+    }
+
+def classify_req(segment: str) -> str:
+    """`segment`: trecho do texto normalizado (ver `LegislativeProcessor.normalizado`)."""
+    for trecho, classificacao in CLASSIFICACOES_REQUERIMENTO:
+        if trecho in segment:
+            return classificacao
+    return ""
+
+# --- Classes de Processamento para Extrator de Diários Oficiais ---
+class LegislativeProcessor:
+    nome_etapas = "legislativo"
+
+    def __init__(self, text: str):
+        self.text = text
+        self.mensagens = []
+        self.etapas = []
+        self._secoes = None
+        self._normalizado = None
+
+    @property
+    def secoes(self) -> dict:
+        """Índice dos títulos de seção (ver `indexar_secoes`), calculado no primeiro uso."""
+        if self._secoes is None:
+            self._secoes = indexar_secoes(self.text)
+        return self._secoes
+
+    @property
+    def normalizado(self) -> TextoNormalizado:
+        """
+        Texto sem acentos e em minúsculas, calculado no primeiro uso, para as regras que não
+        diferenciam maiúsculas. As que diferenciam (títulos em maiúsculas, "Nº" de RQN e "nº"
+        de RQC) continuam casando contra `text`.
+        """
+        if self._normalizado is None:
+            self._normalizado = TextoNormalizado(self.text)
+        return self._normalizado
+
+    def process_normas(self) -> pd.DataFrame:
+        pattern = re.compile(
+            r"^(LEI COMPLEMENTAR|LEI|RESOLUÇÃO|EMENDA À CONSTITUIÇÃO|DELIBERAÇÃO DA MESA) Nº (\d{1,5}(?:\.\d{0,3})?)(?:/(\d{4}))?(?:, DE .+ DE (\d{4}))?$",
+            re.MULTILINE
+        )
+        normas = []
+        for match in pattern.finditer(self.text):
+            tipo_extenso = match.group(1)
+            numero_raw = match.group(2).replace(".", "")
+            ano = match.group(3) if match.group(3) else match.group(4)
+            if not ano:
+                continue
+            sigla = TIPO_MAP_NORMA[tipo_extenso]
+            normas.append([sigla, numero_raw, ano])
+        return pd.DataFrame(normas, columns=['Sigla', 'Número', 'Ano'])
+
+    def process_proposicoes(self) -> pd.DataFrame:
+        pattern_prop = re.compile(
+            r"^\s*(?:- )?\s*(PROJETO DE LEI COMPLEMENTAR|PROJETO DE LEI|INDICAÇÃO|PROJETO DE RESOLUÇÃO|PROPOSTA DE EMENDA À CONSTITUIÇÃO|MENSAGEM|VETO) Nº (\d{1,4}\.?\d{0,3}/\d{4})",
+            re.MULTILINE
+        )
+        pattern_utilidade = compilar_normalizado(r"Declara de utilidade pública")
+        ignore_redacao_final = compilar_normalizado(r"opinamos por se dar à proposição a seguinte redação final")
+        ignore_publicada_antes = compilar_normalizado(r"foi publicad[ao] na edição anterior\.")
+        ignore_em_epigrafe = compilar_normalizado(r"Na publicação da matéria em epígrafe")
+
+        normalizado = self.normalizado
+        proposicoes = []
+        for match in pattern_prop.finditer(self.text):
+            start_idx = match.start()
+            end_idx = match.end()
+            contexto_antes = normalizado.trecho(max(0, start_idx - 200), start_idx)
+            contexto_depois = normalizado.trecho(end_idx, end_idx + 250)
+
+            if ignore_em_epigrafe.search(contexto_depois):
+                continue
+            if ignore_redacao_final.search(contexto_antes) or ignore_publicada_antes.search(contexto_depois):
+                continue
+            subseq_text = self.text[end_idx:end_idx + 250]
+            if "(Redação do Vencido)" in subseq_text:
+                continue
+
+            tipo_extenso = match.group(1)
+            numero_ano = match.group(2).replace(".", "")
+            numero, ano = numero_ano.split("/")
+            sigla = TIPO_MAP_PROP[tipo_extenso]
+            categoria = "UP" if pattern_utilidade.search(contexto_depois) else ""
+            proposicoes.append([sigla, numero, ano, categoria])
+
+        return pd.DataFrame(
+            proposicoes,
+            columns=['Sigla', 'Número', 'Ano', 'Categoria']
+        )
+
+    def process_requerimentos(self) -> pd.DataFrame:
+        requerimentos = []
+        # As regras sem diferença de maiúsculas casam contra o texto normalizado; os grupos
+        # usados são só números, iguais nos dois textos.
+        normalizado = self.normalizado
+        ignore_pattern = compilar_normalizado(
+            r"Ofício nº .*?,.*?relativas ao Requerimento\s*nº (\d{1,4}\.?\d{0,3}/\d{4})",
+            re.DOTALL
+        )
+        aprovado_pattern = compilar_normalizado(
+            r"(da Comissão.*?, informando que, na.*?foi aprovado o Requerimento\s*nº (\d{1,5}(?:\.\d{0,3})?)/(\d{4}))",
+            re.DOTALL
+        )
+        reqs_to_ignore = set()
+        for match in ignore_pattern.finditer(normalizado.texto):
+            numero_ano = match.group(1).replace(".", "")
+            reqs_to_ignore.add(numero_ano)
+
+        for match in aprovado_pattern.finditer(normalizado.texto):
+            num_part = match.group(2).replace('.', '')
+            ano = match.group(3)
+            numero_ano = f"{num_part}/{ano}"
+            reqs_to_ignore.add(numero_ano)
+
+        req_recebimento_pattern = re.compile(
+            r"RECEBIMENTO DE PROPOSIÇÃO[\s\S]*?REQUERIMENTO Nº (\d{1,5}(?:\.\d{0,3})?)/(\d{4})",
+            re.IGNORECASE | re.DOTALL
+        )
+        # Todo match começa num título "RECEBIMENTO DE PROPOSIÇÃO": em vez de varrer o texto,
+        # testa só os títulos do índice, pulando os que caem dentro do match anterior (como o finditer).
+        fim_anterior = 0
+        for inicio, _ in self.secoes["recebimento"]:
+            if inicio < fim_anterior:
+                continue
+            match = req_recebimento_pattern.match(self.text, inicio)
+            if not match:
+                continue
+            fim_anterior = match.end()
+            num_part = match.group(1).replace('.', '')
+            ano = match.group(2)
+            numero_ano = f"{num_part}/{ano}"
+            if numero_ano not in reqs_to_ignore:
+                requerimentos.append(["RQN", num_part, ano, "", "", "Recebido"])
+
+        rqc_pattern_aprovado = compilar_normalizado(
+            r"É\s+recebido\s+pela\s+presidência,\s+submetido\s+a\s+votação\s+e\s+aprovado\s+o\s+Requerimento(?:s)?(?: nº| n\u00b0)?\s*(\d{1,5}(?:\.\d{0,3})?)/\s*(\d{4})"
+        )
+        for match in rqc_pattern_aprovado.finditer(normalizado.texto):
+            num_part = match.group(1).replace('.', '')
+            ano = match.group(2)
+            numero_ano = f"{num_part}/{ano}"
+            if numero_ano not in reqs_to_ignore:
+                requerimentos.append(["RQC", num_part, ano, "", "", "Aprovado"])
+
+        rqc_recebido_apreciacao_pattern = compilar_normalizado(
+            r"É recebido pela\s+presidência, para posterior apreciação, o Requerimento(?: nº)?\s*(\d{1,5}(?:\.\d{0,3})?)/(\d{4})",
+            re.DOTALL
+        )
+        for match in rqc_recebido_apreciacao_pattern.finditer(normalizado.texto):
+            num_part = match.group(1).replace('.', '')
+            ano = match.group(2)
+            numero_ano = f"{num_part}/{ano}"
+            if numero_ano not in reqs_to_ignore:
+                requerimentos.append(["RQC", num_part, ano, "", "", "Recebido para apreciação"])
+
+        rqn_pattern = re.compile(r"^(?:\s*)(Nº)\s+(\d{2}\.?\d{3}/\d{4})\s*,\s*(do|da)", re.MULTILINE)
+        rqc_old_pattern = re.compile(r"^(?:\s*)(nº)\s+(\d{2}\.?\d{3}/\d{4})\s*,\s*(do|da)", re.MULTILINE)
+        proximo_numero_pattern = re.compile(r"^(?:\s*)(Nº|nº)\s+(\d{2}\.?\d{3}/\d{4})", re.MULTILINE)
+        numero_no_inicio_pattern = re.compile(r"(?:\s*)(Nº|nº)\s+(\d{2}\.?\d{3}/\d{4})")
+        for pattern, sigla_prefix in [(rqn_pattern, "RQN"), (rqc_old_pattern, "RQC")]:
+            for match in pattern.finditer(self.text):
+                start_idx = match.start()
+                # Mesmo resultado de buscar em self.text[start_idx + 1:] (onde ^ também casa no
+                # início do recorte), mas sem copiar o restante do texto a cada requerimento.
+                if numero_no_inicio_pattern.match(self.text, start_idx + 1):
+                    end_idx = start_idx + 1
+                else:
+                    next_match = proximo_numero_pattern.search(self.text, start_idx + 1)
+                    end_idx = next_match.start() if next_match else len(self.text)
+                block = self.text[start_idx:end_idx]
+                nums_in_block = re.findall(r'\d{2}\.?\d{3}/\d{4}', block)
+                if not nums_in_block:
+                    continue
+                num_part, ano = nums_in_block[0].replace(".", "").split("/")
+                numero_ano = f"{num_part}/{ano}"
+                if numero_ano not in reqs_to_ignore:
+                    classif = classify_req(normalizado.trecho(start_idx, end_idx))
+                    requerimentos.append([sigla_prefix, num_part, ano, "", "", classif])
+
+        if self.secoes["nao_recebidas"]:
+            start_idx = self.secoes["nao_recebidas"][0][1]
+            next_section_pattern = re.compile(r"^\s*(\*?)\s*.*\s*(\*?)\s*$", re.MULTILINE)
+            next_section_match = next_section_pattern.search(self.text, start_idx)
+            end_idx = next_section_match.start() if next_section_match else len(self.text)
+            nao_recebidos_block = normalizado.trecho(start_idx, end_idx)
+            rqn_nao_recebido_pattern = compilar_normalizado(r"REQUERIMENTO Nº (\d{2}\.?\d{3}/\d{4})")
+            for match in rqn_nao_recebido_pattern.finditer(nao_recebidos_block):
+                numero_ano = match.group(1).replace(".", "")
+                num_part, ano = numero_ano.split("/")
+                if numero_ano not in reqs_to_ignore:
+                    requerimentos.append(["RQN", num_part, ano, "", "", "NÃO RECEBIDO"])
+
+        unique_reqs = []
+        seen = set()
+        for r in requerimentos:
+            key = (r[0], r[1], r[2])
+            if key not in seen:
+                seen.add(key)
+                unique_reqs.append(r)
+
+        return pd.DataFrame(unique_reqs, columns=['Sigla', 'Número', 'Ano', 'Coluna4', 'Coluna5', 'Classificação'])
+
+    def process_pareceres(self) -> pd.DataFrame:
+        found_projects = {}
+        votacao_pattern = re.compile(
+            r"(Votação do Requerimento[\s\S]*?)(?=Votação do Requerimento|Diário do Legislativo|Projetos de Lei Complementar|Diário do Legislativo - Poder Legislativo|$)",
+            re.IGNORECASE
+        )
+        if not self.secoes["tramitacao"]:
+            return pd.DataFrame(columns=['Sigla', 'Número', 'Ano', 'Tipo'])
+
+        pareceres_text = self.text[self.secoes["tramitacao"][0][1]:]
+        clean_text = pareceres_text
+        for match in votacao_pattern.finditer(pareceres_text):
+            clean_text = clean_text.replace(match.group(0), "")
+
+        emenda_projeto_lei_pattern = re.compile(
+            r"EMENDAS AO PROJETO DE LEI Nº (\d{1,4}\.?\d{0,3})/(\d{4})",
+            re.IGNORECASE | re.DOTALL
+        )
+        for match in emenda_projeto_lei_pattern.finditer(clean_text):
+            numero_raw = match.group(1).replace('.', '')
+            ano = match.group(2)
+            project_key = ("PL", numero_raw, ano)
+            if project_key not in found_projects:
+                found_projects[project_key] = set()
+            found_projects[project_key].add("EMENDA")
+
+        emenda_completa_pattern = re.compile(
+            r"EMENDA Nº (\d+)\s+AO\s+(?:SUBSTITUTIVO Nº \d+\s+AO\s+)?PROJETO DE LEI(?: COMPLEMENTAR)? Nº (\d{1,4}\.?\d{0,3})/(\d{4})",
+            re.IGNORECASE
+        )
+        emenda_pattern = re.compile(r"^(?:\s*)EMENDA Nº (\d+)\s*", re.MULTILINE)
+        substitutivo_pattern = re.compile(r"^(?:\s*)SUBSTITUTIVO Nº (\d+)\s*", re.MULTILINE)
+        project_pattern = re.compile(
+            r"Conclusão\s*([\s\S]*?)(Projeto de Lei|PL|Projeto de Resolução|PRE|Proposta de Emenda à Constituição|PEC|Projeto de Lei Complementar|PLC|Requerimento)\s+(?:nº|Nº)?\s*(\d{1,4}(?:\.\d{1,3})?)\s*/\s*(\d{4})",
+            re.IGNORECASE | re.DOTALL
+        )
+
+        for match in emenda_completa_pattern.finditer(clean_text):
+            numero = match.group(2).replace(".", "")
+            ano = match.group(3)
+            sigla = "PLC" if "COMPLEMENTAR" in match.group(0).upper() else "PL"
+            project_key = (sigla, numero, ano)
+            if project_key not in found_projects:
+                found_projects[project_key] = set()
+            found_projects[project_key].add("EMENDA")
+
+        all_matches = sorted(
+            list(emenda_pattern.finditer(clean_text)) + list(substitutivo_pattern.finditer(clean_text)),
+            key=lambda x: x.start()
+        )
+
+        # Conclusões indexadas uma vez. A última conclusão antes de cada título é a última que
+        # termina antes dele; só a conclusão seguinte, que cruza o título, precisa ser
+        # reprocessada no texto cortado (endpos), onde pode casar de outra forma.
+        conclusoes = list(project_pattern.finditer(clean_text))
+        fins_conclusoes = [match.end() for match in conclusoes]
+        for title_match in all_matches:
+            corte = title_match.start()
+            k = bisect.bisect_right(fins_conclusoes, corte)
+            last_project_match = conclusoes[k - 1] if k else None
+            if k < len(conclusoes):
+                for match in project_pattern.finditer(clean_text, conclusoes[k].start(), corte):
+                    last_project_match = match
+
+            if last_project_match:
+                sigla_raw = last_project_match.group(2)
+                sigla = SIGLA_MAP_PARECER.get(sigla_raw.lower(), sigla_raw.upper())
+                numero = last_project_match.group(3).replace(".", "")
+                ano = last_project_match.group(4)
+                project_key = (sigla, numero, ano)
+                item_type = "EMENDA" if "EMENDA" in title_match.group(0).upper() else "SUBSTITUTIVO"
+                if project_key not in found_projects:
+                    found_projects[project_key] = set()
+                found_projects[project_key].add(item_type)
+
+        emenda_projeto_lei_pattern = re.compile(r"EMENDAS AO PROJETO DE LEI Nº (\d{1,4}\.?\d{0,3})/(\d{4})", re.IGNORECASE)
+        for match in emenda_projeto_lei_pattern.finditer(clean_text):
+            numero_raw = match.group(1).replace('.', '')
+            ano = match.group(2)
+            project_key = ("PL", numero_raw, ano)
+            if project_key not in found_projects:
+                found_projects[project_key] = set()
+            found_projects[project_key].add("EMENDA")
+
+        pareceres = []
+        for (sigla, numero, ano), types in found_projects.items():
+            type_str = "SUB/EMENDA" if len(types) > 1 else list(types)[0]
+            pareceres.append([sigla, numero, ano, type_str])
+
+        return pd.DataFrame(pareceres, columns=['Sigla', 'Número', 'Ano', 'Tipo'])
+
+    def _executar_etapa(self, metodo):
+        with medir(f"legislativo.{metodo}", self.etapas) as atributos:
+            df = getattr(self, metodo)()
+            atributos["linhas"] = len(df)
+        return df
+
+    def process_all(self, paralelo=None, edicao=None, origem="") -> dict:
+        """
+        Executa as quatro regras. Com `paralelo=None`, elas rodam em processos separados
+        só se houver mais de um núcleo e o texto tiver ao menos LEGISLATIVO_LIMIAR_PARALELO caracteres.
+        Com `edicao` (data da edição), as linhas também são gravadas no índice de edições.
+        """
+        if paralelo is None:
+            paralelo = LEGISLATIVO_MAX_PROCESSOS > 1 and len(self.text) >= LEGISLATIVO_LIMIAR_PARALELO
+        resultado = None
+        if paralelo:
+            try:
+                resultado = self._process_all_paralelo()
+            except (OSError, BrokenProcessPool):
+                # Sem processos disponíveis (ex.: limite do contêiner): segue em série.
+                descartar_pool_legislativo()
+        if resultado is None:
+            with medir("legislativo.indexar_secoes", self.etapas):
+                self.secoes
+            resultado = {sheet_name: self._executar_etapa(metodo) for sheet_name, metodo in ETAPAS_LEGISLATIVO}
+        if edicao is not None:
+            _gravar_no_indice(self, resultado, edicao, origem)
+        return resultado
+
+    def _process_all_paralelo(self) -> dict:
+        # O texto vai uma única vez para a memória compartilhada, em vez de ser serializado para cada processo.
+        dados = self.text.encode("utf-8")
+        memoria = shared_memory.SharedMemory(create=True, size=max(1, len(dados)))
+        try:
+            memoria.buf[:len(dados)] = dados
+            with medir("legislativo.process_all_paralelo", self.etapas, processos=LEGISLATIVO_MAX_PROCESSOS):
+                pool = obter_pool_legislativo()
+                futuros = {
+                    sheet_name: pool.submit(_executar_etapa_legislativo, memoria.name, len(dados), metodo)
+                    for sheet_name, metodo in ETAPAS_LEGISLATIVO
+                }
+                resultado = {}
+                for sheet_name, futuro in futuros.items():
+                    resultado[sheet_name], mensagens, etapas = futuro.result()
+                    self.mensagens.extend(mensagens)
+                    self.etapas.extend(etapas)
+            return resultado
+        finally:
+            memoria.close()
+            memoria.unlink()
+
+def _executar_etapa_legislativo(nome_memoria, tamanho, metodo):
+    """Roda num processo do pool: lê o texto da memória compartilhada e executa uma regra."""
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    try:
+        with memoria.buf[:tamanho] as buffer:
+            text = str(buffer, "utf-8")
+    finally:
+        memoria.close()
+    processor = LegislativeProcessor(text)
+    df = processor._executar_etapa(metodo)
+    return df, processor.mensagens, processor.etapas
+
+_pool_legislativo = None
+_trava_pool_legislativo = threading.Lock()
+
+def obter_pool_legislativo():
+    """Pool de processos único, criado no primeiro uso e reaproveitado entre extrações."""
+    global _pool_legislativo
+    with _trava_pool_legislativo:
+        if _pool_legislativo is None:
+            # "spawn": o servidor do Streamlit tem várias threads, e fork com threads não é seguro.
+            _pool_legislativo = ProcessPoolExecutor(
+                max_workers=LEGISLATIVO_MAX_PROCESSOS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool_legislativo
+
+def descartar_pool_legislativo():
+    global _pool_legislativo
+    with _trava_pool_legislativo:
+        if _pool_legislativo is not None:
+            _pool_legislativo.shutdown(wait=False, cancel_futures=True)
+            _pool_legislativo = None
+
+class AdministrativeProcessor:
+    nome_etapas = "administrativo"
+
+    def __init__(self, pdf):
+        # `pdf`: DocumentoPDF, caminho do arquivo ou bytes.
+        self.documento = DocumentoPDF.de(pdf)
+        self.mensagens = []
+        self.etapas = []
+
+    def process_pdf(self):
+        try:
+            doc = self.documento.abrir_fitz()
+        except Exception as e:
+            registrar(self.mensagens, NIVEL_ERRO, f"Erro ao abrir o arquivo PDF: {e}")
+            return None
+
+        resultados = []
+        regex = re.compile(
+            r'(DELIBERAÇÃO DA MESA|PORTARIA DGE|ORDEM DE SERVIÇO PRES/PSEC)\s+Nº\s+([\d\.]+)\/(\d{4})'
+        )
+        regex_dcs = re.compile(r'DECIS[ÃA]O DA 1ª-SECRETARIA')
+
+        for page in doc:
+            text = page.get_text("text")
+            text = re.sub(r'\s+', ' ', text)
+            for match in regex.finditer(text):
+                tipo_texto = match.group(1)
+                numero = match.group(2).replace('.', '')
+                ano = match.group(3)
+                sigla = {
+                    "DELIBERAÇÃO DA MESA": "DLB",
+                    "PORTARIA DGE": "PRT",
+                    "ORDEM DE SERVIÇO PRES/PSEC": "OSV"
+                }.get(tipo_texto, None)
+                if sigla:
+                    resultados.append([sigla, numero, ano])
+            if regex_dcs.search(text):
+                resultados.append(["DCS", "", ""])
+        doc.close()
+        return pd.DataFrame(resultados, columns=['Sigla', 'Número', 'Ano'])
+
+    def to_csv(self, edicao=None, origem=""):
+        """CSV das linhas extraídas; com `edicao` (data da edição), elas também vão para o índice de edições."""
+        with medir(f"{self.nome_etapas}.process_pdf", self.etapas, bytes=self.documento.tamanho) as atributos:
+            df = self.process_pdf()
+            atributos["linhas"] = 0 if df is None else len(df)
+        if df is not None and edicao is not None:
+            _gravar_no_indice(self, {self.nome_etapas.capitalize(): df}, edicao, origem)
+        if df is None or df.empty:
+            return None
+        with medir(f"{self.nome_etapas}.csv", self.etapas):
+            return dataframe_para_csv(df)
+
+class ExecutiveProcessor:
+    nome_etapas = "executivo"
+
+    def __init__(self, pdf):
+        # `pdf`: DocumentoPDF, caminho do arquivo ou bytes.
+        self.documento = DocumentoPDF.de(pdf)
+        self.mensagens = []
+        self.etapas = []
+        # Chaves normalizadas: o tipo é lido do texto normalizado de cada trecho.
+        self.mapa_tipos = {
+            "lei": "LEI",
+            "lei complementar": "LCP",
+            "decreto": "DEC",
+            "decreto ne": "DNE"
+        }
+        # Uma só varredura para os dois tipos de evento (publicação de norma e comando de
+        # alteração). Os dois ramos ficam dentro de um lookahead para que um evento não
+        # esconda outro que comece dentro dele, como acontecia com duas buscas separadas;
+        # o prefixo [LDFfPp] deixa o motor pular direto para as posições candidatas.
+        self.eventos_regex = re.compile(
+            r'(?=[LDFfPp])(?='
+            r'\b(?P<norma>(?P<tipo>LEI\s+COMPLEMENTAR|LEI|DECRETO\s+NE|DECRETO)\s+N[º°]\s*(?P<numero>[\d\s\.]+),\s*DE\s+(?P<data>[A-ZÇ\s\d]+)\b)'
+            r'|(?P<comando>(?i:Ficam\s+revogados|Fica\s+acrescentado|Ficam\s+alterados|passando\s+o\s+item|passa\s+a\s+vigorar|passam\s+a\s+vigorar))'
+            r')'
+        )
+        # Casa contra o texto normalizado do trecho (ver `indexar_referencias`). O ano é
+        # procurado só logo após o "de" (a data por extenso cabe em 40 caracteres), para
+        # não pegar um número de quatro dígitos de outra norma mais adiante no trecho.
+        self.norma_alterada_regex = compilar_normalizado(
+            r'(?=[ld])(LEI\s+COMPLEMENTAR|LEI|DECRETO\s+NE|DECRETO)\s+N[º°]?\s*([\d\s\./]+)(?:,\s*de\s*(?:[^\n]{0,40}?(\d{4}))?)?'
+        )
+
+    def eventos(self, texto):
+        """Gera ("norma", match) e ("comando", match) na ordem em que aparecem no texto."""
+        fim_norma = fim_comando = 0
+        for m in self.eventos_regex.finditer(texto):
+            if m.group("norma") is not None:
+                if m.start() >= fim_norma:
+                    fim_norma = m.end("norma")
+                    yield "norma", m
+            elif m.start() >= fim_comando:
+                fim_comando = m.end("comando")
+                yield "comando", m
+
+    def indexar_referencias(self, normalizado):
+        """
+        Referências a normas (candidatas a alteradas) de um trecho (TextoNormalizado):
+        (posições de início no texto original, [(tipo, número, chave)]), em ordem, para busca por bisect.
+        """
+        inicios, referencias = [], []
+        for alt in self.norma_alterada_regex.finditer(normalizado.texto):
+            tipo_alt_raw = alt.group(1).strip()
+            tipo_alt = self.mapa_tipos.get(tipo_alt_raw, tipo_alt_raw.upper())
+            num_alt = alt.group(2).replace(" ", "").replace(".", "").replace("/", "")
+            chave_alt = f"{tipo_alt} {num_alt}"
+            if alt.group(3):
+                chave_alt += f" {alt.group(3)}"
+            inicios.append(normalizado.posicao_original(alt.start()))
+            referencias.append((tipo_alt, num_alt, chave_alt))
+        return inicios, referencias
+
+    def find_relevant_pages(self) -> tuple:
+        try:
+            reader = self.documento.abrir_pypdf()
+            start_page_num, end_page_num = None, None
+
+            for i, page in enumerate(reader.pages):
+                text = page.extract_text() or ""
+                if not text.strip():
+                    continue
+                if re.search(r'Leis\s*e\s*Decretos', text, re.IGNORECASE):
+                    start_page_num = i
+                if re.search(r'Atos\s*do\s*Governador', text, re.IGNORECASE):
+                    end_page_num = i
+
+            if start_page_num is None or end_page_num is None or start_page_num > end_page_num:
+                registrar(self.mensagens, NIVEL_AVISO, "Não foi encontrado o trecho de 'Leis e Decretos' ou 'Atos do Governador' para delimitar a seção.")
+                return None, None
+
+            return start_page_num, end_page_num + 1
+
+        except Exception as e:
+            registrar(self.mensagens, NIVEL_ERRO, f"Erro ao buscar páginas relevantes com PyPDF: {e}")
+            return None, None
+
+    def process_pdf(self) -> pd.DataFrame:
+        with medir("executivo.find_relevant_pages", self.etapas):
+            start_page_idx, end_page_idx = self.find_relevant_pages()
+        if start_page_idx is None:
+            return pd.DataFrame()
+
+        trechos = []
+        try:
+            with medir("executivo.colunas", self.etapas, paginas=end_page_idx - start_page_idx), \
+                    self.documento.abrir_fitz() as doc:
+                for i in range(start_page_idx, end_page_idx):
+                    for col_num, coluna in colunas_da_pagina(doc[i]):
+                        texto_limpo = re.sub(r'\s+', ' ', coluna).strip()
+                        trechos.append({
+                            "pagina": i + 1,
+                            "coluna": col_num,
+                            "texto": texto_limpo
+                        })
+        except Exception as e:
+            registrar(self.mensagens, NIVEL_ERRO, f"Erro ao extrair texto detalhado do PDF do Executivo: {e}")
+            return pd.DataFrame()
+
+        with medir("executivo.eventos", self.etapas, trechos=len(trechos)):
+            dados = []
+            ultima_norma = None
+            seen_alteracoes = set()
+
+            for t in trechos:
+                pagina = t["pagina"]
+                coluna = t["coluna"]
+                texto = t["texto"]
+
+                normalizado = TextoNormalizado(texto)
+                indice_referencias = None
+
+                for tipo_ev, match in self.eventos(texto):
+                    if tipo_ev == 'norma':
+                        tipo_raw = match.group("tipo").strip()
+                        tipo = self.mapa_tipos.get(normalizado.trecho(*match.span("tipo")).strip(), tipo_raw)
+                        numero = match.group("numero").replace(" ", "").replace(".", "")
+                        data_texto = normalizado.trecho(*match.span("data")).strip()
+
+                        try:
+                            partes = data_texto.split(" de ")
+                            dia = partes[0].zfill(2)
+                            mes = meses[partes[1]]
+                            ano = partes[2]
+                            sancao = f"{dia}/{mes}/{ano}"
+                        except:
+                            sancao = ""
+
+                        linha = {
+                            "Página": pagina,
+                            "Coluna": coluna,
+                            "Sanção": sancao,
+                            "Tipo": tipo,
+                            "Número": numero,
+                            "Alterações": ""
+                        }
+                        dados.append(linha)
+                        ultima_norma = linha
+                        seen_alteracoes = set()
+
+                    elif tipo_ev == 'comando':
+                        if ultima_norma is None:
+                            continue
+                        if indice_referencias is None:
+                            indice_referencias = self.indexar_referencias(normalizado)
+                        inicios, referencias = indice_referencias
+
+                        # Referências que começam a até 150 caracteres do comando.
+                        raio = 150
+                        pos_ev = match.start()
+                        primeira = bisect.bisect_left(inicios, pos_ev - raio)
+                        ultima = bisect.bisect_left(inicios, pos_ev + raio, primeira)
+
+                        if 'revogado' in normalizado.trecho(*match.span("comando")):
+                            alteracoes_para_processar = referencias[primeira:ultima]
+                        else:
+                            # A mais próxima do comando (no empate, a anterior a ele).
+                            seguinte = bisect.bisect_left(inicios, pos_ev, primeira, ultima)
+                            vizinhas = [k for k in (seguinte - 1, seguinte) if primeira <= k < ultima]
+                            alteracoes_para_processar = [
+                                referencias[min(vizinhas, key=lambda k: abs(inicios[k] - pos_ev))]
+                            ] if vizinhas else []
+
+                        for tipo_alt, num_alt, chave_alt in alteracoes_para_processar:
+                            if tipo_alt == ultima_norma["Tipo"] and num_alt == ultima_norma["Número"]:
+                                continue
+
+                            if chave_alt in seen_alteracoes:
+                                continue
+                            seen_alteracoes.add(chave_alt)
+
+                            if ultima_norma["Alterações"] == "":
+                                ultima_norma["Alterações"] = chave_alt
+                            else:
+                                dados.append({
+                                    "Página": "",
+                                    "Coluna": "",
+                                    "Sanção": "",
+                                    "Tipo": "",
+                                    "Número": "",
+                                    "Alterações": chave_alt
+                                })
+
+        return pd.DataFrame(dados) if dados else pd.DataFrame()
+
+    def to_csv(self, edicao=None, origem=""):
+        """CSV das linhas extraídas; com `edicao` (data da edição), elas também vão para o índice de edições."""
+        with medir(f"{self.nome_etapas}.process_pdf", self.etapas, bytes=self.documento.tamanho) as atributos:
+            df = self.process_pdf()
+            atributos["linhas"] = 0 if df is None else len(df)
+        if df is not None and edicao is not None:
+            _gravar_no_indice(self, {self.nome_etapas.capitalize(): df}, edicao, origem)
+        if df is None or df.empty:
+            return None
+        with medir(f"{self.nome_etapas}.csv", self.etapas):
+            return dataframe_para_csv(df)
+
+def extrair_texto_legislativo(pdf, etapas=None) -> str:
+    documento = DocumentoPDF.de(pdf)
+    with medir("legislativo.extrair_texto", etapas, bytes=documento.tamanho) as atributos:
+        reader = documento.abrir_pypdf()
+        atributos["paginas"] = len(reader.pages)
+        text = ""
+        for page in reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n+", "\n", text)
+    return text
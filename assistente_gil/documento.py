@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Acesso único a um PDF pelos dois leitores usados nos motores (pypdf e PyMuPDF).
+Um upload é copiado para disco uma vez; daí em diante o PyMuPDF lê pelo caminho
+do arquivo e o pypdf por um mapeamento em memória (mmap), de modo que o
+conteúdo não é duplicado em RAM a cada leitor.
+"""
+import io
+import mmap
+import os
+import shutil
+import tempfile
+
+from .configuracao import CACHE_DIR
+from .dependencias import fitz, pypdf
+
+DIRETORIO_UPLOADS = os.path.join(CACHE_DIR, "uploads")
+
+class DocumentoPDF:
+    """
+    PDF em disco (`caminho`) ou, para quem já tem os bytes em mãos, em memória (`dados`).
+    Pode ser usado como gerenciador de contexto; ao fechar, o arquivo temporário
+    criado por `de_arquivo` é removido e `ao_fechar(caminho)`, se informado, é chamado
+    (ex.: `liberar_download`, para devolver um PDF do cache de downloads).
+    """
+    def __init__(self, caminho=None, dados=None, temporario=False, ao_fechar=None):
+        if (caminho is None) == (dados is None):
+            raise ValueError("Informe o caminho ou os bytes do PDF.")
+        self.caminho = caminho
+        self.dados = dados
+        self.temporario = temporario
+        self.ao_fechar = ao_fechar
+        self._mapas = []
+
+    @classmethod
+    def de(cls, pdf):
+        """Aceita um DocumentoPDF, um caminho ou os bytes do PDF."""
+        if isinstance(pdf, cls):
+            return pdf
+        if isinstance(pdf, (str, os.PathLike)):
+            return cls(caminho=os.fspath(pdf))
+        return cls(dados=pdf)
+
+    @classmethod
+    def de_arquivo(cls, arquivo):
+        """Copia um arquivo aberto (ex.: o UploadedFile do Streamlit) para um temporário em disco, em blocos."""
+        os.makedirs(DIRETORIO_UPLOADS, exist_ok=True)
+        arquivo.seek(0)
+        with tempfile.NamedTemporaryFile(dir=DIRETORIO_UPLOADS, suffix=".pdf", delete=False) as destino:
+            shutil.copyfileobj(arquivo, destino, 1024 * 1024)
+        return cls(caminho=destino.name, temporario=True)
+
+    @property
+    def tamanho(self):
+        return len(self.dados) if self.dados is not None else os.path.getsize(self.caminho)
+
+    def _fluxo(self):
+        if self.dados is not None:
+            return io.BytesIO(self.dados)
+        if self.tamanho == 0:  # mmap não aceita arquivo vazio; o leitor acusa o erro
+            return io.BytesIO(b"")
+        # Cada leitor recebe seu próprio mapeamento (posição independente); todos
+        # compartilham as mesmas páginas do arquivo no cache do sistema operacional.
+        with open(self.caminho, "rb") as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapas.append(mapa)
+        return mapa
+
+    def abrir_pypdf(self):
+        return pypdf.PdfReader(self._fluxo())
+
+    def abrir_fitz(self):
+        if self.caminho is not None:
+            return fitz.open(self.caminho)
+        return fitz.open(stream=self.dados, filetype="pdf")
+
+    def ler_bytes(self):
+        if self.dados is not None:
+            return self.dados
+        with open(self.caminho, "rb") as f:
+            return f.read()
+
+    def fechar(self):
+        for mapa in self._mapas:
+            try:
+                mapa.close()
+            except BufferError:  # ainda referenciado por um leitor; é liberado junto com ele
+                pass
+        self._mapas = []
+        if self.temporario and os.path.exists(self.caminho):
+            os.unlink(self.caminho)
+        if self.ao_fechar is not None:
+            ao_fechar, self.ao_fechar = self.ao_fechar, None
+            ao_fechar(self.caminho)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
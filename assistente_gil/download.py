@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Download dos PDFs informados por link. O corpo é gravado em disco aos poucos
+(sem passar inteiro pela memória), com tamanho máximo, e fica num cache local
+por URL; quando o link é usado de novo, o servidor só reenvia o arquivo se ele
+mudou (ETag / Last-Modified).
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from .configuracao import CACHE_DIR
+from .dependencias import requests
+from .mensagens import NIVEL_AVISO, NIVEL_ERRO, registrar
+
+DOWNLOAD_CACHE_DIR = os.path.join(CACHE_DIR, "downloads")
+DOWNLOAD_CACHE_DB = os.path.join(CACHE_DIR, "downloads.sqlite3")
+DOWNLOAD_CACHE_MAX_BYTES = int(os.environ.get("GIL_DOWNLOAD_CACHE_MAX_MB", "500")) * 1024 * 1024
+DOWNLOAD_MAX_BYTES = int(os.environ.get("GIL_DOWNLOAD_MAX_MB", "200")) * 1024 * 1024
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_TAMANHO_BLOCO = 1024 * 1024
+
+class DownloadMuitoGrande(Exception):
+    pass
+
+# Arquivos do cache entregues a quem chamou `baixar_pdf` e ainda não liberados
+# (ex.: um DocumentoPDF aberto em outra sessão); a limpeza do cache não os remove.
+# Uma versão nova do PDF vai para outro arquivo; a antiga, se ainda estiver em uso,
+# fica em `_downloads_substituidos` e é apagada quando o último a liberar.
+_downloads_em_uso = {}
+_downloads_substituidos = set()
+_trava_downloads_em_uso = threading.Lock()
+
+def reservar_download(caminho):
+    arquivo = os.path.basename(caminho)
+    with _trava_downloads_em_uso:
+        _downloads_em_uso[arquivo] = _downloads_em_uso.get(arquivo, 0) + 1
+
+def liberar_download(caminho):
+    """Devolve um arquivo entregue por `baixar_pdf`; pode ser chamada como `ao_fechar` do DocumentoPDF."""
+    arquivo = os.path.basename(caminho)
+    with _trava_downloads_em_uso:
+        restantes = _downloads_em_uso.get(arquivo, 0) - 1
+        if restantes > 0:
+            _downloads_em_uso[arquivo] = restantes
+            return
+        _downloads_em_uso.pop(arquivo, None)
+        if arquivo in _downloads_substituidos:
+            _downloads_substituidos.discard(arquivo)
+            _apagar_download(arquivo)
+
+def _apagar_download(arquivo):
+    caminho = os.path.join(DOWNLOAD_CACHE_DIR, arquivo)
+    if os.path.exists(caminho):
+        os.unlink(caminho)
+
+def _substituir_download(anterior, novo):
+    """Apaga a versão anterior do arquivo de uma URL, ou adia a remoção se ela ainda estiver em uso."""
+    with _trava_downloads_em_uso:
+        _downloads_substituidos.discard(novo)
+        if anterior is None or anterior == novo:
+            return
+        if anterior in _downloads_em_uso:
+            _downloads_substituidos.add(anterior)
+        else:
+            _apagar_download(anterior)
+
+_sessao = None
+_trava_sessao = threading.Lock()
+
+def obter_sessao():
+    """Sessão HTTP única do processo, com pool de conexões e novas tentativas em falhas temporárias."""
+    global _sessao
+    with _trava_sessao:
+        if _sessao is None:
+            from urllib3.util.retry import Retry
+            sessao = requests.Session()
+            adaptador = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=8,
+                max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                                  allowed_methods=("GET", "HEAD"))
+            )
+            sessao.mount("http://", adaptador)
+            sessao.mount("https://", adaptador)
+            _sessao = sessao
+        return _sessao
+
+def _conectar_cache_downloads():
+    os.makedirs(DOWNLOAD_CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(DOWNLOAD_CACHE_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS downloads ("
+        "url TEXT PRIMARY KEY, arquivo TEXT NOT NULL, etag TEXT NOT NULL DEFAULT '', "
+        "last_modified TEXT NOT NULL DEFAULT '', content_type TEXT NOT NULL DEFAULT '', "
+        "tamanho INTEGER NOT NULL, ultimo_acesso REAL NOT NULL)"
+    )
+    return conn
+
+def _entrada_em_cache(conn, url):
+    row = conn.execute("SELECT * FROM downloads WHERE url = ?", (url,)).fetchone()
+    if row is None or not os.path.exists(os.path.join(DOWNLOAD_CACHE_DIR, row["arquivo"])):
+        return None
+    return dict(row)
+
+def _remover_downloads_excedentes(conn):
+    # Mesmo critério do cache de artefatos do OCR: sai primeiro o usado há mais tempo,
+    # pulando os arquivos ainda em uso (o cache pode passar do limite enquanto isso).
+    total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM downloads").fetchone()[0]
+    if total <= DOWNLOAD_CACHE_MAX_BYTES:
+        return
+    removidos = []
+    with _trava_downloads_em_uso:
+        for row in conn.execute("SELECT url, arquivo, tamanho FROM downloads ORDER BY ultimo_acesso"):
+            if total <= DOWNLOAD_CACHE_MAX_BYTES:
+                break
+            if row["arquivo"] in _downloads_em_uso:
+                continue
+            removidos.append((row["url"], row["arquivo"]))
+            total -= row["tamanho"]
+        for _, arquivo in removidos:
+            _apagar_download(arquivo)
+    conn.executemany("DELETE FROM downloads WHERE url = ?", [(url,) for url, _ in removidos])
+    conn.commit()
+
+def _gravar_corpo(resposta, url, max_bytes):
+    """
+    Grava o corpo da resposta no cache em blocos, interrompendo se passar de `max_bytes`.
+    Retorna (arquivo, tamanho). O nome do arquivo inclui o hash do conteúdo: uma versão nova
+    do PDF nunca sobrescreve a que outra sessão ainda pode estar lendo.
+    """
+    tamanho_declarado = resposta.headers.get("Content-Length")
+    if tamanho_declarado and tamanho_declarado.isdigit() and int(tamanho_declarado) > max_bytes:
+        raise DownloadMuitoGrande(int(tamanho_declarado))
+    prefixo = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    caminho_temporario = os.path.join(DOWNLOAD_CACHE_DIR, f"{prefixo}.{os.getpid()}.{threading.get_ident()}.tmp")
+    hash_conteudo = hashlib.sha256()
+    tamanho = 0
+    try:
+        with open(caminho_temporario, "wb") as f:
+            for bloco in resposta.iter_content(DOWNLOAD_TAMANHO_BLOCO):
+                tamanho += len(bloco)
+                if tamanho > max_bytes:
+                    raise DownloadMuitoGrande(tamanho)
+                hash_conteudo.update(bloco)
+                f.write(bloco)
+        arquivo = f"{prefixo}-{hash_conteudo.hexdigest()[:16]}"
+        os.replace(caminho_temporario, os.path.join(DOWNLOAD_CACHE_DIR, arquivo))
+    finally:
+        if os.path.exists(caminho_temporario):
+            os.unlink(caminho_temporario)
+    return arquivo, tamanho
+
+def baixar_pdf(url, mensagens=None, max_bytes=DOWNLOAD_MAX_BYTES):
+    """
+    Retorna o caminho local do PDF de `url` (dentro do cache de downloads), ou None em caso de erro.
+    O arquivo só deve ser lido, nunca alterado ou removido por quem chamou, e fica reservado
+    (fora da limpeza do cache) até que quem chamou o devolva com `liberar_download`.
+    """
+    return baixar_pdf_com_status(url, mensagens, max_bytes)[0]
+
+def baixar_pdf_com_status(url, mensagens=None, max_bytes=DOWNLOAD_MAX_BYTES):
+    """Como `baixar_pdf`, mas devolve (caminho ou None, status HTTP ou None se não houve resposta)."""
+    status, reservado = None, None
+    try:
+        with closing(_conectar_cache_downloads()) as conn:
+            entrada = _entrada_em_cache(conn, url)
+            cabecalhos = {}
+            if entrada and entrada["etag"]:
+                cabecalhos["If-None-Match"] = entrada["etag"]
+            if entrada and entrada["last_modified"]:
+                cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+
+            try:
+                resposta = obter_sessao().get(url, headers=cabecalhos, stream=True, timeout=DOWNLOAD_TIMEOUT)
+            except requests.exceptions.RequestException as e:
+                if entrada is None:
+                    raise
+                registrar(mensagens, NIVEL_AVISO,
+                          f"Não foi possível verificar se o PDF mudou ({e}). Usando a cópia baixada anteriormente.")
+                resposta = None
+            if resposta is not None:
+                status = resposta.status_code
+
+            try:
+                if resposta is None or resposta.status_code == 304:
+                    conn.execute("UPDATE downloads SET ultimo_acesso = ? WHERE url = ?", (time.time(), url))
+                    conn.commit()
+                    content_type, arquivo = entrada["content_type"], entrada["arquivo"]
+                    reservar_download(arquivo)
+                    reservado = arquivo
+                elif resposta.status_code == 200:
+                    arquivo, tamanho = _gravar_corpo(resposta, url, max_bytes)
+                    reservar_download(arquivo)
+                    reservado = arquivo
+                    content_type = resposta.headers.get("Content-Type", "")
+                    conn.execute(
+                        "INSERT OR REPLACE INTO downloads "
+                        "(url, arquivo, etag, last_modified, content_type, tamanho, ultimo_acesso) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (url, arquivo, resposta.headers.get("ETag", ""), resposta.headers.get("Last-Modified", ""),
+                         content_type, tamanho, time.time())
+                    )
+                    conn.commit()
+                    _substituir_download(entrada["arquivo"] if entrada else None, arquivo)
+                    _remover_downloads_excedentes(conn)
+                else:
+                    registrar(mensagens, NIVEL_ERRO, f"Falha ao baixar (status {resposta.status_code}).")
+                    return None, status
+            finally:
+                if resposta is not None:
+                    resposta.close()
+
+        if ("pdf" not in content_type.lower()) and (not url.lower().endswith(".pdf")):
+            registrar(mensagens, NIVEL_AVISO, "O link não parece apontar para um PDF (Content-Type != PDF). Tentarei processar mesmo assim.")
+        return os.path.join(DOWNLOAD_CACHE_DIR, arquivo), status
+    except DownloadMuitoGrande:
+        registrar(mensagens, NIVEL_ERRO,
+                  f"O PDF ultrapassa o tamanho máximo permitido ({max_bytes // (1024 * 1024)} MB).")
+    except Exception as e:
+        registrar(mensagens, NIVEL_ERRO, f"Erro ao baixar o PDF: {e}")
+    if reservado is not None:
+        liberar_download(reservado)
+    return None, status
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Quadros de exemplo do Manual de Indexação (Tipo / Ementa / Indexação / Resumo)
+como registros estruturados, com a página e a seção do manual, e busca dos
+exemplos mais parecidos com um texto por TF-IDF sobre a ementa. Assim o
+Chatbot e o Gerador de Termos mandam ao modelo só os exemplos relevantes, e
+não o manual inteiro.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import asdict, dataclass
+
+from .artefatos import carregar_ou_construir
+from .configuracao import caminho_documento
+from .dependencias import fitz, sklearn_texto
+from .mensagens import NIVEL_AVISO, registrar
+from .normalizacao import normalizar
+
+ARQUIVO_MANUAL_INDEXACAO = "manual_indexacao.pdf"
+EXEMPLOS_POR_CONSULTA = 5
+# Cosseno mínimo entre o texto e a ementa para que o exemplo conte como parecido.
+SIMILARIDADE_MINIMA = 0.1
+# Parte mínima das palavras da pergunta do Chatbot que aparecem em alguma ementa; abaixo
+# disso a pergunta trata de assunto que os exemplos não cobrem ("Qual é a capital da França?").
+COBERTURA_MINIMA_PERGUNTA = 0.6
+
+# Palavras que não dizem nada sobre o assunto: as palavras vazias do português e as que
+# descrevem a própria tarefa de indexação ("como indexar", "regras para o resumo").
+PALAVRAS_VAZIAS = """
+a à ao aos as às até com como contra da das de dela dele deles depois do dos e é ela elas ele eles
+em entre era essa essas esse esses esta estas está este estes eu foi for há isso isto já lhe
+lhes mais mas me mesmo meu minha muito na nas não nem no nos nós num numa o os ou para pela
+pelas pelo pelos por qual quais quando que quem se sem ser seu seus sob sobre sua suas também
+te tem têm um uma umas uns você vocês onde porque deve devem devo pode podem posso fazer faz
+faço usar uso utilizar correto correta forma maneira caso casos geral gerais diferença
+exemplo exemplos indexar indexação indexa resumo resumos resumir ementa ementas termo termos
+regra regras manual thesaurus escrever redigir
+""".split()
+
+@dataclass(frozen=True)
+class ExemploIndexacao:
+    tipo: str
+    ementa: str
+    indexacao: tuple
+    resumo: str
+    pagina: int
+    secao: str = ""
+    outros: tuple = ()  # (rótulo, texto) de campos menos comuns, como "Apelido" e "Nomes"
+
+    @classmethod
+    def de_dicionario(cls, dados):
+        """Inverso de `dataclasses.asdict`, para exemplos lidos do artefato (JSON, sem tuplas)."""
+        return cls(**{**dados, "indexacao": tuple(dados["indexacao"]),
+                      "outros": tuple(tuple(campo) for campo in dados["outros"])})
+
+    @property
+    def termos(self):
+        """Termo mais específico de cada linha da indexação ("Thesaurus/Tema/[...]/ICMS" -> "ICMS")."""
+        termos = [linha.rstrip("/").rsplit("/", 1)[-1].strip() for linha in self.indexacao]
+        return [termo for termo in termos if termo and termo != "#"]
+
+ROTULO_QUADRO = re.compile(r"^(Tipo|Ementa|Indexação|Resumo)\s*:\s*(.*)$")
+ROTULO_EXTRA = re.compile(r"^(Apelido|Nomes|Entidade|Evento|Norma|Especificador)\s*:\s*(.*)$")
+TITULO_SECAO = re.compile(r"^\d+(?:\.\d+)+\.?\s+\S")
+# Linha com o ato do exemplo quando o quadro não tem o rótulo "Tipo:" (ex.: "PL 3.583/2022", "RQN 201 2023").
+LINHA_TIPO = re.compile(r"^[^\W\d_]{2,}(?:\s+nº)?\s+[\d\.]+(?:/\d{2,4}|,?\s+(?:de\s+|DE\s+)?[\d/]+)?\b", re.IGNORECASE)
+
+def _linhas_das_paginas(paginas):
+    """(página, linha) de todas as páginas, sem o número de página do rodapé e sem linhas vazias nas bordas das páginas."""
+    for numero, texto in enumerate(paginas, start=1):
+        linhas = [linha.strip() for linha in texto.split("\n")]
+        while linhas and (not linhas[-1] or linhas[-1].isdigit()):
+            linhas.pop()
+        while linhas and not linhas[0]:
+            linhas.pop(0)
+        for linha in linhas:
+            yield numero, linha
+
+def extrair_exemplos(paginas):
+    """
+    Reconhece os quadros de exemplo no texto das páginas do manual. Um quadro começa no
+    rótulo "Ementa:" (precedido do "Tipo:" ou da linha com o ato) e termina numa linha em
+    branco, num título de seção ou no início de outro quadro; pode continuar na página seguinte.
+    """
+    exemplos = []
+    secao = ""
+    atual = None  # campos do quadro em leitura
+    campo = None
+    anterior = ("", 0)  # última linha de texto fora de quadro, candidata a "Tipo"
+    tipo_rotulado = None
+
+    def fechar():
+        nonlocal atual, campo
+        if atual and atual["ementa"]:
+            exemplos.append(ExemploIndexacao(
+                tipo=atual["tipo"],
+                ementa=" ".join(atual["ementa"]),
+                indexacao=tuple(atual["indexacao"]),
+                resumo=" ".join(atual["resumo"]),
+                pagina=atual["pagina"],
+                secao=atual["secao"],
+                outros=tuple((rotulo, " ".join(linhas)) for rotulo, linhas in atual["outros"]),
+            ))
+        atual, campo = None, None
+
+    linhas = list(_linhas_das_paginas(paginas))
+    for posicao, (pagina, linha) in enumerate(linhas):
+        if not linha:
+            fechar()
+            continue
+        seguinte = linhas[posicao + 1][1] if posicao + 1 < len(linhas) else ""
+        if atual is not None and seguinte.startswith("Ementa:") and LINHA_TIPO.match(linha) and len(linha) <= 80:
+            # Ato do próximo quadro, colado ao fim do quadro anterior sem linha em branco.
+            fechar()
+            anterior = (linha, pagina)
+            continue
+        if TITULO_SECAO.match(linha):
+            fechar()
+            secao = linha
+            tipo_rotulado = None
+            continue
+        rotulo = ROTULO_QUADRO.match(linha)
+        if rotulo:
+            nome, resto = rotulo.group(1), rotulo.group(2).strip()
+            if nome == "Tipo":
+                fechar()
+                tipo_rotulado = (resto, pagina)
+                campo = "tipo"
+                continue
+            if nome == "Ementa":
+                fechar()
+                tipo, pagina_tipo = tipo_rotulado or (
+                    anterior if LINHA_TIPO.match(anterior[0]) and len(anterior[0]) <= 80 else ("", pagina)
+                )
+                atual = {"tipo": tipo, "ementa": [], "indexacao": [], "resumo": [], "outros": [],
+                         "pagina": pagina_tipo or pagina, "secao": secao}
+                tipo_rotulado = None
+            if atual is None:
+                continue  # "Indexação:" ou "Resumo:" de uma regra geral, fora de quadro
+            campo = {"Ementa": "ementa", "Indexação": "indexacao", "Resumo": "resumo"}[nome]
+            linha = resto
+            if not linha:
+                continue
+
+        extra = ROTULO_EXTRA.match(linha) if atual is not None else None
+        if extra:
+            atual["outros"].append((extra.group(1), [extra.group(2).strip()] if extra.group(2).strip() else []))
+            campo = "outros"
+            continue
+
+        if campo == "tipo" and tipo_rotulado is not None and atual is None:
+            tipo_rotulado = ((tipo_rotulado[0] + " " + linha).strip(), tipo_rotulado[1])
+        elif atual is not None and campo == "indexacao":
+            if linha.startswith("Thesaurus") or not atual["indexacao"]:
+                atual["indexacao"].append(linha)
+            else:  # linha longa quebrada
+                atual["indexacao"][-1] += " " + linha
+        elif atual is not None and campo == "outros":
+            atual["outros"][-1][1].append(linha)
+        elif atual is not None and campo:
+            atual[campo].append(linha)
+        else:
+            anterior = (linha, pagina)
+    fechar()
+    return exemplos
+
+def ler_paginas_do_pdf(caminho_pdf):
+    with fitz.open(caminho_pdf) as doc:
+        return [page.get_text() for page in doc]
+
+def extrair_exemplos_do_pdf(caminho_pdf):
+    return extrair_exemplos(ler_paginas_do_pdf(caminho_pdf))
+
+def _paginas_e_exemplos(caminho_pdf):
+    """Conteúdo do artefato "exemplos": o texto das páginas e os exemplos como dicionários."""
+    paginas = ler_paginas_do_pdf(caminho_pdf)
+    return {"paginas": paginas, "exemplos": [asdict(exemplo) for exemplo in extrair_exemplos(paginas)]}
+
+class IndiceExemplos:
+    """
+    Busca dos exemplos mais parecidos com um texto (similaridade de cosseno entre vetores
+    TF-IDF das ementas). `paginas` (texto de cada página do manual) é opcional e serve
+    para acompanhar os exemplos com as regras da mesma página.
+    """
+    def __init__(self, exemplos, paginas=None):
+        self.exemplos = list(exemplos)
+        self.paginas = list(paginas or [])
+        self.vetorizador = sklearn_texto.TfidfVectorizer(
+            strip_accents="unicode", lowercase=True, sublinear_tf=True,
+            stop_words=sorted({normalizar(palavra) for palavra in PALAVRAS_VAZIAS}),
+        )
+        self.matriz = self.vetorizador.fit_transform([exemplo.ementa for exemplo in self.exemplos])
+        self.analisador = self.vetorizador.build_analyzer()
+
+    def buscar(self, texto, quantidade=EXEMPLOS_POR_CONSULTA, cobertura_minima=0.0):
+        """
+        Até `quantidade` exemplos com similaridade de pelo menos SIMILARIDADE_MINIMA. Com
+        `cobertura_minima`, retorna lista vazia se uma parte menor que essa das palavras do
+        texto (fora as vazias) não aparecer em nenhuma ementa.
+        """
+        if not self.exemplos or not texto or not texto.strip():
+            return []
+        palavras = self.analisador(texto)
+        conhecidas = sum(palavra in self.vetorizador.vocabulary_ for palavra in palavras)
+        if not conhecidas or conhecidas < cobertura_minima * len(palavras):
+            return []
+        # Os vetores já saem normalizados (norma L2): o produto escalar é o cosseno.
+        similaridades = (self.matriz @ self.vetorizador.transform([texto]).T).toarray().ravel()
+        ordem = similaridades.argsort()[::-1][:quantidade]
+        return [self.exemplos[i] for i in ordem if similaridades[i] >= SIMILARIDADE_MINIMA]
+
+_indice_exemplos = None
+_trava_indice_exemplos = threading.Lock()
+
+def obter_indice_exemplos():
+    """
+    Índice único do processo, montado no primeiro uso. O texto das páginas e os exemplos
+    vêm do artefato pré-processado do manual (ver `artefatos`); só o TF-IDF é recalculado.
+    """
+    global _indice_exemplos
+    with _trava_indice_exemplos:
+        if _indice_exemplos is None:
+            caminho = caminho_documento(ARQUIVO_MANUAL_INDEXACAO)
+            dados = carregar_ou_construir("exemplos", caminho, lambda: _paginas_e_exemplos(caminho))
+            _indice_exemplos = IndiceExemplos(map(ExemploIndexacao.de_dicionario, dados["exemplos"]), dados["paginas"])
+        return _indice_exemplos
+
+def buscar_exemplos(texto, quantidade=EXEMPLOS_POR_CONSULTA, mensagens=None, cobertura_minima=0.0):
+    """Exemplos do manual mais parecidos com `texto`; lista vazia (com aviso) se o manual não puder ser lido."""
+    try:
+        return obter_indice_exemplos().buscar(texto, quantidade, cobertura_minima)
+    except Exception as e:
+        registrar(mensagens, NIVEL_AVISO, f"Não foi possível consultar os exemplos do Manual de Indexação: {e}")
+        return []
+
+def formatar_exemplo(exemplo):
+    """Quadro do exemplo em Markdown, no formato usado nos prompts do Manual de Indexação."""
+    indexacao = "<br>".join(exemplo.indexacao) or "#"
+    return (
+        f"| Tipo: | {exemplo.tipo} |\n"
+        "| :--- | :--- |\n"
+        f"| **Ementa:** | {exemplo.ementa} |\n"
+        f"| **Indexação:** | {indexacao} |\n"
+        f"| **Resumo:** | {exemplo.resumo or '#'} |\n"
+        f"(página {exemplo.pagina} do Manual de Indexação{', seção ' + exemplo.secao if exemplo.secao else ''})"
+    )
+
+def contexto_manual_indexacao(pergunta, quantidade=EXEMPLOS_POR_CONSULTA, mensagens=None):
+    """
+    Trecho do manual para o prompt do Chatbot: as páginas dos exemplos mais parecidos com a
+    pergunta, com o número da página, seguidas dos quadros desses exemplos. Retorna None se
+    nenhum exemplo for parecido ou se a pergunta tratar de outro assunto (regras gerais do
+    manual, temas que os exemplos não cobrem), caso em que o manual inteiro deve ser usado.
+    """
+    exemplos = buscar_exemplos(pergunta, quantidade, mensagens, COBERTURA_MINIMA_PERGUNTA)
+    if not exemplos:
+        return None
+    paginas = obter_indice_exemplos().paginas
+    partes = [
+        f"[Página {numero}]\n{paginas[numero - 1].strip()}"
+        for numero in sorted({exemplo.pagina for exemplo in exemplos}) if numero <= len(paginas)
+    ]
+    partes.append("Exemplos do manual mais próximos da pergunta:\n\n" + "\n\n".join(formatar_exemplo(e) for e in exemplos))
+    return "\n\n".join(partes)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Exportação dos resultados das extrações."""
+import io
+import zipfile
+
+from .dependencias import disponivel, openpyxl, xlsxwriter
+
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MIME_ZIP = "application/zip"
+MIME_CSV = "text/csv"
+
+def _linhas(df):
+    """Cabeçalho e linhas do DataFrame, com células vazias no lugar de NaN (como o to_excel)."""
+    yield [str(coluna) for coluna in df.columns]
+    valores = df.astype(object).where(df.notna(), None)
+    yield from valores.itertuples(index=False, name=None)
+
+def dataframes_para_xlsx(dados):
+    """
+    Grava cada DataFrame de `dados` ({nome_da_aba: DataFrame}) numa aba de uma planilha Excel.
+    As linhas são escritas em sequência, sem montar a planilha inteira em memória: com o
+    xlsxwriter em modo constant_memory ou, se ele não estiver instalado, com o openpyxl em write-only.
+    """
+    output = io.BytesIO()
+    if disponivel("xlsxwriter"):
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True, "in_memory": True})
+        for sheet_name, df in dados.items():
+            worksheet = workbook.add_worksheet(sheet_name)
+            for i, linha in enumerate(_linhas(df)):
+                worksheet.write_row(i, 0, linha)
+        workbook.close()
+    else:
+        workbook = openpyxl.Workbook(write_only=True)
+        for sheet_name, df in dados.items():
+            worksheet = workbook.create_sheet(sheet_name)
+            for linha in _linhas(df):
+                worksheet.append(linha)
+        workbook.save(output)
+    output.seek(0)
+    return output
+
+def dataframe_para_csv(df):
+    """CSV (UTF-8) do DataFrame, gravado direto em bytes."""
+    output = io.BytesIO()
+    df.to_csv(output, index=False, encoding="utf-8")
+    return output.getvalue()
+
+def dataframes_para_zip_csv(dados):
+    """Um CSV por aba, compactados num único ZIP."""
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for sheet_name, df in dados.items():
+            with zf.open(f"{sheet_name}.csv", "w") as f:
+                df.to_csv(f, index=False, encoding="utf-8")
+    output.seek(0)
+    return output
+
+def dataframes_para_zip_parquet(dados):
+    """Um arquivo Parquet por aba, num único ZIP (as abas têm colunas diferentes)."""
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as zf:
+        for sheet_name, df in dados.items():
+            with zf.open(f"{sheet_name}.parquet", "w") as f:
+                df.to_parquet(f, index=False)
+    output.seek(0)
+    return output
+
+# Formato: (função, extensão, MIME, dependência opcional necessária)
+FORMATOS_EXPORTACAO = {
+    "Excel (.xlsx)": (dataframes_para_xlsx, ".xlsx", MIME_XLSX, None),
+    "CSV (um arquivo por aba, em .zip)": (dataframes_para_zip_csv, ".zip", MIME_ZIP, None),
+    "Parquet (um arquivo por aba, em .zip)": (dataframes_para_zip_parquet, ".zip", MIME_ZIP, "pyarrow"),
+}
+
+def formatos_exportacao_disponiveis():
+    return [nome for nome, (*_, dependencia) in FORMATOS_EXPORTACAO.items()
+            if dependencia is None or disponivel(dependencia)]
+
+def exportar_dataframes(dados, formato):
+    """Retorna (BytesIO, extensão, MIME) de `dados` no formato escolhido em FORMATOS_EXPORTACAO."""
+    funcao, extensao, mime, _ = FORMATOS_EXPORTACAO[formato]
+    return funcao(dados), extensao, mime
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Índice, entre edições, dos atos extraídos dos Diários (normas, proposições,
+requerimentos, pareceres). Cada extração pode gravar suas linhas com a data
+da edição, e a consulta por sigla, número e ano usa um índice do SQLite, sem
+reprocessar PDFs.
+"""
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+from .configuracao import CACHE_DIR
+from .dependencias import pd
+from .mensagens import NIVEL_AVISO, registrar
+
+INDICE_DB = os.environ.get("GIL_INDICE_DB", os.path.join(CACHE_DIR, "indice_edicoes.sqlite3"))
+INDICE_LIMITE_CONSULTA = 1000
+
+COLUNAS_CONSULTA = ["Diário", "Edição", "Tabela", "Sigla", "Número", "Ano", "Página", "Detalhes", "Origem"]
+
+def _conectar_indice():
+    os.makedirs(os.path.dirname(INDICE_DB) or ".", exist_ok=True)
+    conn = sqlite3.connect(INDICE_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS edicoes ("
+        "id INTEGER PRIMARY KEY, diario TEXT NOT NULL, data TEXT NOT NULL, "
+        "origem TEXT NOT NULL DEFAULT '', indexado_em TEXT NOT NULL, UNIQUE (diario, data))"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS registros ("
+        "edicao_id INTEGER NOT NULL, tabela TEXT NOT NULL, sigla TEXT NOT NULL, numero TEXT NOT NULL, "
+        "ano TEXT NOT NULL, pagina INTEGER, detalhes TEXT NOT NULL DEFAULT '')"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS registros_sigla_numero_ano ON registros (sigla, numero, ano)")
+    conn.execute("CREATE INDEX IF NOT EXISTS registros_numero_ano ON registros (numero, ano)")
+    conn.execute("CREATE INDEX IF NOT EXISTS registros_edicao ON registros (edicao_id)")
+    return conn
+
+def normalizar_numero(numero):
+    """'1.234' e ' 1234 ' viram '1234', como os motores gravam o número."""
+    return str(numero).replace(".", "").replace(" ", "").strip()
+
+def _texto(valor):
+    return "" if valor is None or (isinstance(valor, float) and valor != valor) else str(valor).strip()
+
+def _detalhes(linha, chaves):
+    return {coluna: _texto(valor) for coluna, valor in linha.items() if coluna not in chaves and _texto(valor)}
+
+def registros_de_tabelas(tabelas):
+    """
+    Converte as tabelas de uma extração ({nome: DataFrame}) em registros
+    (tabela, sigla, número, ano, página, detalhes). Tabelas com colunas
+    Sigla/Número/Ano (Legislativo e Administrativo) e a do Executivo
+    (Tipo/Número/Sanção/Página, com as alterações em linhas de continuação) são aceitas.
+    """
+    registros = []
+    for nome, df in tabelas.items():
+        if df is None or df.empty:
+            continue
+        if {"Sigla", "Número", "Ano"} <= set(df.columns):
+            for linha in df.to_dict("records"):
+                registros.append([
+                    nome, _texto(linha["Sigla"]).upper(), normalizar_numero(_texto(linha["Número"])),
+                    _texto(linha["Ano"]), None, _detalhes(linha, ("Sigla", "Número", "Ano"))
+                ])
+        elif {"Tipo", "Número", "Sanção"} <= set(df.columns):
+            anterior = None
+            for linha in df.to_dict("records"):
+                tipo = _texto(linha["Tipo"])
+                if not tipo:
+                    # Linha de continuação: mais uma norma alterada pela norma anterior.
+                    if anterior is not None and _texto(linha.get("Alterações")):
+                        alteracoes = anterior[5].get("Alterações")
+                        anterior[5]["Alterações"] = "; ".join(filter(None, [alteracoes, _texto(linha["Alterações"])]))
+                    continue
+                sancao = _texto(linha["Sanção"])
+                pagina = _texto(linha.get("Página"))
+                anterior = [
+                    nome, tipo.upper(), normalizar_numero(_texto(linha["Número"])), sancao[-4:] if sancao else "",
+                    int(pagina) if pagina.isdigit() else None, _detalhes(linha, ("Tipo", "Número", "Página"))
+                ]
+                registros.append(anterior)
+    return registros
+
+def indexar_edicao(diario, data_edicao, tabelas, origem="", mensagens=None):
+    """
+    Grava no índice as linhas extraídas de uma edição (`data_edicao`: date) do Diário
+    `diario`. Indexar de novo a mesma edição substitui as linhas anteriores.
+    Retorna o número de registros gravados (0 em caso de erro).
+    """
+    registros = registros_de_tabelas(tabelas)
+    try:
+        with closing(_conectar_indice()) as conn, conn:
+            conn.execute(
+                "INSERT INTO edicoes (diario, data, origem, indexado_em) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (diario, data) DO UPDATE SET origem = excluded.origem, indexado_em = excluded.indexado_em",
+                (diario, data_edicao.isoformat(), origem or "", datetime.now().isoformat())
+            )
+            edicao_id = conn.execute(
+                "SELECT id FROM edicoes WHERE diario = ? AND data = ?", (diario, data_edicao.isoformat())
+            ).fetchone()["id"]
+            conn.execute("DELETE FROM registros WHERE edicao_id = ?", (edicao_id,))
+            conn.executemany(
+                "INSERT INTO registros (edicao_id, tabela, sigla, numero, ano, pagina, detalhes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(edicao_id, tabela, sigla, numero, ano, pagina, json.dumps(detalhes, ensure_ascii=False) if detalhes else "")
+                 for tabela, sigla, numero, ano, pagina, detalhes in registros]
+            )
+    except sqlite3.Error as e:
+        registrar(mensagens, NIVEL_AVISO, f"Não foi possível gravar a edição no índice: {e}")
+        return 0
+    return len(registros)
+
+def consultar_indice(sigla="", numero="", ano="", diario=None, limite=INDICE_LIMITE_CONSULTA):
+    """Edições em que aparece o ato procurado (campos vazios não filtram), da mais recente para a mais antiga."""
+    condicoes, parametros = [], []
+    for coluna, valor in (("r.sigla", _texto(sigla).upper()), ("r.numero", normalizar_numero(numero)),
+                          ("r.ano", _texto(ano)), ("e.diario", _texto(diario).lower())):
+        if valor:
+            condicoes.append(f"{coluna} = ?")
+            parametros.append(valor)
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    with closing(_conectar_indice()) as conn:
+        linhas = conn.execute(
+            "SELECT e.diario, e.data, r.tabela, r.sigla, r.numero, r.ano, r.pagina, r.detalhes, e.origem "
+            f"FROM registros r JOIN edicoes e ON e.id = r.edicao_id {where} "
+            "ORDER BY e.data DESC, e.diario, r.rowid LIMIT ?",
+            (*parametros, limite)
+        ).fetchall()
+    return pd.DataFrame(
+        [[linha[0].capitalize(), *linha[1:7], ", ".join(f"{k}: {v}" for k, v in json.loads(linha[7]).items()) if linha[7] else "", linha[8]]
+         for linha in linhas],
+        columns=COLUNAS_CONSULTA
+    ).astype({"Página": "Int64"})
+
+def resumo_indice():
+    """Quantidade de edições e registros e o período coberto pelo índice."""
+    with closing(_conectar_indice()) as conn:
+        edicoes, primeira, ultima = conn.execute("SELECT COUNT(*), MIN(data), MAX(data) FROM edicoes").fetchone()
+        registros = conn.execute("SELECT COUNT(*) FROM registros").fetchone()[0]
+        siglas = [row[0] for row in conn.execute("SELECT DISTINCT sigla FROM registros ORDER BY sigla")]
+    return {"edicoes": edicoes, "registros": registros, "primeira": primeira, "ultima": ultima, "siglas": siglas}
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Ingestão de um período de edições: para cada data, monta o link da edição,
+baixa o PDF, extrai os dados com o processador do Diário e grava no índice de
+edições. O andamento de cada data fica registrado (no mesmo banco do índice),
+de modo que uma ingestão interrompida recomeça de onde parou e as datas já
+concluídas ou sem edição não são baixadas de novo.
+"""
+import os
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from .diarios import AdministrativeProcessor, ExecutiveProcessor, LegislativeProcessor, extrair_texto_legislativo
+from .documento import DocumentoPDF
+from .download import baixar_pdf_com_status, liberar_download
+from .indice import INDICE_DB
+from .mensagens import NIVEL_ERRO, possui_erro, registrar
+
+INGESTAO_MAX_TRABALHOS = int(os.environ.get("GIL_INGESTAO_MAX_TRABALHOS", "2"))
+# Modelo do link do PDF de cada edição, ex.: "https://espelho.exemplo/{diario}/{data:%Y-%m-%d}.pdf".
+# Não há padrão: o link da edição do dia do Jornal Minas Gerais abre uma página HTML, não o PDF.
+INGESTAO_URL_MODELO = os.environ.get("GIL_INGESTAO_URL_MODELO", "")
+
+STATUS_INGESTAO_CONCLUIDA = "Concluída"
+STATUS_INGESTAO_SEM_EDICAO = "Sem edição"
+STATUS_INGESTAO_ERRO = "Erro"
+
+# Datas com esses status não são baixadas de novo (a não ser com refazer=True).
+STATUS_INGESTAO_FINAIS = (STATUS_INGESTAO_CONCLUIDA, STATUS_INGESTAO_SEM_EDICAO)
+# Respostas que indicam que não houve edição na data (fim de semana, feriado).
+STATUS_HTTP_SEM_EDICAO = (404, 410)
+
+DIARIOS_INGESTAO = ("legislativo", "administrativo", "executivo")
+
+def _conectar_ingestao():
+    os.makedirs(os.path.dirname(INDICE_DB) or ".", exist_ok=True)
+    conn = sqlite3.connect(INDICE_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS ingestao ("
+        "diario TEXT NOT NULL, data TEXT NOT NULL, status TEXT NOT NULL, link TEXT NOT NULL, "
+        "mensagem TEXT NOT NULL DEFAULT '', registros INTEGER NOT NULL DEFAULT 0, "
+        "atualizado_em TEXT NOT NULL, PRIMARY KEY (diario, data))"
+    )
+    return conn
+
+def _registrar_andamento(diario, data, status, link, mensagem="", registros=0):
+    with closing(_conectar_ingestao()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO ingestao (diario, data, status, link, mensagem, registros, atualizado_em) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (diario, data.isoformat(), status, link, mensagem, registros, datetime.now().isoformat())
+        )
+
+def obter_andamento_ingestao(diario, inicio, fim):
+    """{data ISO: linha da tabela de andamento} das datas do período já tentadas."""
+    with closing(_conectar_ingestao()) as conn:
+        linhas = conn.execute(
+            "SELECT * FROM ingestao WHERE diario = ? AND data BETWEEN ? AND ? ORDER BY data",
+            (diario, inicio.isoformat(), fim.isoformat())
+        ).fetchall()
+    return {linha["data"]: dict(linha) for linha in linhas}
+
+def gerador_de_links(diario, modelo=INGESTAO_URL_MODELO):
+    """Função data -> link do PDF, a partir de `modelo` (com {data} e, opcionalmente, {diario})."""
+    if not modelo:
+        raise ValueError(
+            "Informe o modelo do link do PDF de cada edição (GIL_INGESTAO_URL_MODELO ou --url-modelo), "
+            "ex.: https://servidor/{diario}/{data:%Y-%m-%d}.pdf"
+        )
+    if "{data" not in modelo:
+        raise ValueError(f"O modelo do link do PDF não contém {{data}}: {modelo}")
+    return lambda data: modelo.format(data=data, diario=diario)
+
+
+def datas_do_periodo(inicio, fim):
+    return [inicio + timedelta(days=i) for i in range((fim - inicio).days + 1)]
+
+def ingerir_edicao(diario, data, link):
+    """Baixa, extrai e indexa uma edição; retorna (status, mensagem, registros)."""
+    mensagens = []
+    caminho, status_http = baixar_pdf_com_status(link, mensagens)
+    if caminho is None:
+        if status_http in STATUS_HTTP_SEM_EDICAO:
+            return STATUS_INGESTAO_SEM_EDICAO, "", 0
+        return STATUS_INGESTAO_ERRO, "; ".join(m.texto for m in mensagens), 0
+
+    try:
+        with DocumentoPDF(caminho=caminho, ao_fechar=liberar_download) as documento:
+            if diario == "legislativo":
+                processor = LegislativeProcessor(extrair_texto_legislativo(documento))
+                processor.process_all(edicao=data, origem=link)
+            else:
+                processor = {"administrativo": AdministrativeProcessor, "executivo": ExecutiveProcessor}[diario](documento)
+                processor.to_csv(edicao=data, origem=link)
+    except Exception as e:
+        return STATUS_INGESTAO_ERRO, f"Erro ao processar o PDF: {e}", 0
+
+    mensagens.extend(processor.mensagens)
+    registros = sum(etapa.atributos.get("registros", 0) for etapa in processor.etapas if etapa.nome == "indice.gravar")
+    status = STATUS_INGESTAO_ERRO if possui_erro(processor.mensagens) else STATUS_INGESTAO_CONCLUIDA
+    return status, "; ".join(m.texto for m in mensagens), registros
+
+def ingerir_periodo(diario, inicio, fim, gerar_link=None, max_trabalhos=INGESTAO_MAX_TRABALHOS,
+                    refazer=False, mensagens=None, progresso=None):
+    """
+    Ingere as edições de `inicio` a `fim` (datas, inclusive) do Diário `diario`.
+    `gerar_link(data)` monta o link do PDF de cada data (padrão: `gerador_de_links(diario)`).
+    As edições são processadas por até `max_trabalhos` threads; `progresso(feitas, total)`
+    é chamado a cada edição terminada.
+    Retorna {status: quantidade de datas}, incluindo as puladas por já estarem no andamento.
+    """
+    if diario not in DIARIOS_INGESTAO:
+        raise ValueError(f"Diário desconhecido: {diario}")
+    gerar_link = gerar_link or gerador_de_links(diario)
+    andamento = {} if refazer else obter_andamento_ingestao(diario, inicio, fim)
+    pendentes = [
+        data for data in datas_do_periodo(inicio, fim)
+        if andamento.get(data.isoformat(), {}).get("status") not in STATUS_INGESTAO_FINAIS
+    ]
+    contagem = {STATUS_INGESTAO_CONCLUIDA: 0, STATUS_INGESTAO_SEM_EDICAO: 0, STATUS_INGESTAO_ERRO: 0}
+    for linha in andamento.values():
+        if linha["status"] in STATUS_INGESTAO_FINAIS:
+            contagem[linha["status"]] += 1
+
+    feitas = 0
+    fila = iter(pendentes)
+    # Só há no máximo 2 * max_trabalhos edições submetidas de cada vez, para que
+    # períodos longos não criem milhares de tarefas de uma só vez.
+    with ThreadPoolExecutor(max_workers=max(1, max_trabalhos)) as executor:
+        em_andamento = {}
+
+        def submeter():
+            for data in fila:
+                link = gerar_link(data)
+                em_andamento[executor.submit(ingerir_edicao, diario, data, link)] = (data, link)
+                if len(em_andamento) >= 2 * max(1, max_trabalhos):
+                    return
+
+        submeter()
+        while em_andamento:
+            prontos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                data, link = em_andamento.pop(futuro)
+                try:
+                    status, mensagem, registros = futuro.result()
+                except Exception as e:
+                    status, mensagem, registros = STATUS_INGESTAO_ERRO, str(e), 0
+                _registrar_andamento(diario, data, status, link, mensagem, registros)
+                contagem[status] += 1
+                if status == STATUS_INGESTAO_ERRO:
+                    registrar(mensagens, NIVEL_ERRO, f"{data.strftime('%d/%m/%Y')}: {mensagem}")
+                feitas += 1
+                if progresso:
+                    progresso(feitas, len(pendentes))
+            submeter()
+    return contagem
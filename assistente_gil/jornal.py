@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""Links das edições do Jornal Minas Gerais."""
+import json
+
+URL_EDICAO_DO_DIA = "https://www.jornalminasgerais.mg.gov.br/edicao-do-dia"
+
+def gerar_link_edicao(data):
+    data_formatada_link = data.strftime("%Y-%m-%d")
+    dados_dict = {"dataPublicacaoSelecionada": f"{data_formatada_link}T06:00:00.000Z"}
+    json_str = json.dumps(dados_dict, separators=(',', ':'))
+    novo_dados = json_str.replace("{", "%7B").replace("}", "%7D").replace('"', "%22")
+    return f"{URL_EDICAO_DO_DIA}?dados={novo_dados}"
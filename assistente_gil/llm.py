@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""Cliente da API Gemini usado pelo Chatbot, pelo Gerador de Termos e Resumos e pelo Conversor OCR."""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+from .configuracao import CACHE_DIR, obter_api_key
+from .dependencias import requests
+from .exemplos_indexacao import buscar_exemplos
+from .mensagens import NIVEL_AVISO, NIVEL_ERRO, registrar
+
+GEMINI_API_URL = os.environ.get("GIL_GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1beta")
+MODELO_CHATBOT = "gemini-2.0-flash"
+
+def answer_from_document(prompt_completo, api_key, documento=None, mensagens=None):
+    """
+    Responde `prompt_completo`. Com `documento` (texto do documento, fora do prompt), o
+    documento é referenciado pelo contexto em cache da API, criado na primeira pergunta;
+    se o cache não estiver disponível, o documento vai no próprio pedido, antes do prompt.
+    """
+    if not api_key:
+        return "Erro: Chave de API ausente."
+
+    url = f"{GEMINI_API_URL}/models/{MODELO_CHATBOT}:generateContent?key={api_key}"
+    contexto = obter_contexto_em_cache(documento, api_key, mensagens) if documento else None
+
+    try:
+        if contexto:
+            response = requests.post(url, json={"cachedContent": contexto, "contents": [{"role": "user", "parts": [{"text": prompt_completo}]}]})
+            if response.status_code in STATUS_CONTEXTO_INVALIDO:
+                # Cache apagado ou expirado antes do previsto: esquece o registro e envia o documento no pedido.
+                _esquecer_contexto(documento, api_key)
+                contexto = None
+        if not contexto:
+            partes = ([{"text": documento}] if documento else []) + [{"text": prompt_completo}]
+            response = requests.post(url, json={"contents": [{"role": "user", "parts": partes}]})
+        response.raise_for_status()
+        result = response.json()
+        resposta = result.get("candidates", [])[0].get("content", {}).get("parts", [])[0].get("text", "Não foi possível gerar a resposta.")
+        return resposta
+    except requests.exceptions.HTTPError as http_err:
+        return f"Erro na comunicação com a API: {http_err}"
+    except Exception as e:
+        return f"Ocorreu um erro: {e}"
+
+# --- Contexto em Cache da API (documentos do Chatbot) ---
+# O texto de cada documento é enviado uma vez para a API (cachedContents) e as perguntas só
+# o referenciam pelo nome. O registro local guarda, por hash do modelo, da chave de API (um
+# contexto só pode ser usado pela chave que o criou) e do texto, o nome do
+# contexto e quando ele expira; o prazo é renovado quando falta menos da metade do TTL.
+CONTEXTO_CACHE_HABILITADO = os.environ.get("GIL_CONTEXTO_CACHE", "1") == "1"
+CONTEXTO_CACHE_TTL_SEGUNDOS = int(os.environ.get("GIL_CONTEXTO_CACHE_TTL", "3600"))
+# Margem para não usar um contexto prestes a expirar.
+CONTEXTO_CACHE_MARGEM_SEGUNDOS = 60
+# Respostas que indicam que o contexto não existe mais (ou não pode ser usado por esta chave).
+# Um 400 é erro no pedido: não justifica criar (e pagar) outro contexto.
+STATUS_CONTEXTO_INVALIDO = (403, 404)
+
+_travas_contextos = {}  # chave do contexto -> [trava, quantas chamadas a usam]
+_trava_travas_contextos = threading.Lock()
+
+@contextmanager
+def _trava_contexto(chave):
+    """
+    Uma trava por documento: só perguntas sobre o mesmo documento esperam a criação do
+    contexto. A trava sai do dicionário quando a última chamada que a usa termina.
+    """
+    with _trava_travas_contextos:
+        entrada = _travas_contextos.setdefault(chave, [threading.Lock(), 0])
+        entrada[1] += 1
+    try:
+        with entrada[0]:
+            yield
+    finally:
+        with _trava_travas_contextos:
+            entrada[1] -= 1
+            if not entrada[1]:
+                del _travas_contextos[chave]
+
+def _conectar_contextos():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(CACHE_RESPOSTAS_DB, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS contextos ("
+        "chave TEXT PRIMARY KEY, nome TEXT NOT NULL, expira_em REAL NOT NULL, criado_em TEXT NOT NULL)"
+    )
+    return conn
+
+def chave_contexto(documento, api_key):
+    hash_api_key = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{MODELO_CHATBOT}\x1f{hash_api_key}\x1f{documento}".encode("utf-8")).hexdigest()
+
+def _ler_contexto(chave):
+    with closing(_conectar_contextos()) as conn:
+        return conn.execute("SELECT nome, expira_em FROM contextos WHERE chave = ?", (chave,)).fetchone()
+
+def _gravar_contexto(chave, nome):
+    with closing(_conectar_contextos()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO contextos (chave, nome, expira_em, criado_em) VALUES (?, ?, ?, ?)",
+            (chave, nome, time.time() + CONTEXTO_CACHE_TTL_SEGUNDOS, datetime.now().isoformat())
+        )
+
+def _esquecer_contexto(documento, api_key):
+    try:
+        with closing(_conectar_contextos()) as conn, conn:
+            conn.execute("DELETE FROM contextos WHERE chave = ?", (chave_contexto(documento, api_key),))
+    except sqlite3.Error:
+        pass
+
+def _criar_contexto(documento, api_key):
+    response = requests.post(
+        f"{GEMINI_API_URL}/cachedContents?key={api_key}",
+        json={
+            "model": f"models/{MODELO_CHATBOT}",
+            "contents": [{"role": "user", "parts": [{"text": documento}]}],
+            "ttl": f"{CONTEXTO_CACHE_TTL_SEGUNDOS}s",
+        },
+    )
+    response.raise_for_status()
+    return response.json()["name"]
+
+def _renovar_contexto(nome, api_key):
+    response = requests.patch(
+        f"{GEMINI_API_URL}/{nome}?key={api_key}&updateMask=ttl",
+        json={"ttl": f"{CONTEXTO_CACHE_TTL_SEGUNDOS}s"},
+    )
+    response.raise_for_status()
+
+def obter_contexto_em_cache(documento, api_key, mensagens=None):
+    """
+    Nome do contexto em cache ("cachedContents/...") com o texto de `documento`, criando ou
+    renovando-o se preciso. Retorna None se o cache estiver desabilitado ou a API recusá-lo
+    (ex.: documento pequeno demais para o cache); nesse caso, a recusa fica registrada por um
+    TTL, para não tentar de novo a cada pergunta.
+    """
+    if not CONTEXTO_CACHE_HABILITADO or not documento or not api_key:
+        return None
+    chave = chave_contexto(documento, api_key)
+    # O banco só fica aberto para ler e gravar o registro, não durante as chamadas à API.
+    with _trava_contexto(chave):
+        try:
+            row = _ler_contexto(chave)
+        except sqlite3.Error:
+            return None
+        agora = time.time()
+        if row and row[1] > agora + CONTEXTO_CACHE_MARGEM_SEGUNDOS:
+            nome, expira_em = row
+            if not nome:
+                return None
+            if expira_em - agora >= CONTEXTO_CACHE_TTL_SEGUNDOS / 2:
+                return nome
+            try:
+                _renovar_contexto(nome, api_key)
+            except requests.exceptions.RequestException:
+                nome = ""  # não foi possível renovar: cria outro abaixo
+        else:
+            nome = ""
+        if not nome:
+            try:
+                nome = _criar_contexto(documento, api_key)
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                # Sem o texto da exceção, que traz a URL com a chave de API.
+                resposta = getattr(e, "response", None)
+                motivo = f"HTTP {resposta.status_code}" if resposta is not None else type(e).__name__
+                registrar(mensagens, NIVEL_AVISO, f"Cache de contexto indisponível ({motivo}); o documento será enviado a cada pergunta.")
+                nome = ""
+        try:
+            _gravar_contexto(chave, nome)
+        except sqlite3.Error:
+            pass
+        return nome or None
+
+class LimitadorDeTaxa:
+    """Garante um intervalo mínimo entre requisições disparadas por várias threads."""
+    def __init__(self, max_por_minuto):
+        self.intervalo = 60.0 / max_por_minuto if max_por_minuto > 0 else 0.0
+        self._lock = threading.Lock()
+        self._proximo = 0.0
+
+    def aguardar(self):
+        with self._lock:
+            agora = time.monotonic()
+            espera = self._proximo - agora
+            self._proximo = max(agora, self._proximo) + self.intervalo
+        if espera > 0:
+            time.sleep(espera)
+
+# --- Cache de Respostas da IA (Gerador de Termos e Resumos) ---
+CACHE_RESPOSTAS_DB = os.path.join(CACHE_DIR, "respostas_llm.sqlite3")
+
+MODELO_RESUMO = "gemini-2.5-flash"
+MODELO_TERMOS = "gemini-2.5-flash"
+# Incrementar sempre que o texto dos prompts mudar, para invalidar respostas antigas.
+VERSAO_PROMPT_RESUMO = "1"
+VERSAO_PROMPT_TERMOS = "2"
+
+def normalizar_texto_cache(texto):
+    texto = unicodedata.normalize("NFC", texto or "")
+    return re.sub(r"\s+", " ", texto).strip()
+
+def chave_cache_resposta(funcao, texto, modelo, versao_prompt, num_termos=None, extra=""):
+    partes = [
+        funcao,
+        modelo,
+        versao_prompt,
+        "" if num_termos is None else str(num_termos),
+        extra,
+        normalizar_texto_cache(texto),
+    ]
+    return hashlib.sha256("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+def _conectar_cache_respostas():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(CACHE_RESPOSTAS_DB, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS respostas ("
+        "chave TEXT PRIMARY KEY, funcao TEXT NOT NULL, resposta TEXT NOT NULL, criado_em TEXT NOT NULL)"
+    )
+    return conn
+
+def ler_cache_resposta(chave):
+    try:
+        with closing(_conectar_cache_respostas()) as conn:
+            row = conn.execute("SELECT resposta FROM respostas WHERE chave = ?", (chave,)).fetchone()
+    except sqlite3.Error:
+        return None
+    return json.loads(row[0]) if row else None
+
+def gravar_cache_resposta(chave, funcao, resposta):
+    try:
+        with closing(_conectar_cache_respostas()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO respostas (chave, funcao, resposta, criado_em) VALUES (?, ?, ?, ?)",
+                (chave, funcao, json.dumps(resposta, ensure_ascii=False), datetime.now().isoformat())
+            )
+            conn.commit()
+    except sqlite3.Error:
+        pass
+
+def hash_dicionario_termos(termos_dicionario):
+    return hashlib.sha256("\n".join(termos_dicionario).encode("utf-8")).hexdigest()
+
+def _exemplos_para_prompt(exemplos):
+    """Linhas "Ementa -> termos" dos exemplos do Manual de Indexação (os que têm indexação)."""
+    return "\n".join(
+        f"- Ementa: {exemplo.ementa}\n  Termos: {json.dumps(exemplo.termos, ensure_ascii=False)}"
+        for exemplo in exemplos or () if exemplo.indexacao
+    )
+
+def gerar_resumo(texto_original, api_key=None, mensagens=None):
+    chave_cache = chave_cache_resposta("resumo", texto_original, MODELO_RESUMO, VERSAO_PROMPT_RESUMO)
+    resumo_em_cache = ler_cache_resposta(chave_cache)
+    if resumo_em_cache is not None:
+        return resumo_em_cache
+
+    api_key = api_key or obter_api_key()
+    
+    if not api_key:
+        registrar(mensagens, NIVEL_ERRO, "Erro: A chave de API não foi configurada.")
+        return None
+
+    url = f"{GEMINI_API_URL}/models/{MODELO_RESUMO}:generateContent?key={api_key}"
+    
+    regras_adicionais = """
+    - Mantenha o resumo em um único parágrafo, com no máximo 4 frases.
+    - Use linguagem formal e evite gírias.
+    - Mantenha um tom objetivo e neutro.
+    - Use verbos na terceira pessoa do singular, na voz ativa.
+    - Para descrever ações ou responsabilidades de autoridades, prefira o uso de verbos auxiliares como 'deve' ou 'pode' para indicar obrigação ou possibilidade.
+    - Evite o uso de verbos com partícula apassivadora ou de indeterminação do sujeito.
+    - Evite iniciar frases com 'Esta política', 'A lei' ou termos semelhantes.
+    - Separe as siglas com o caractere "–".
+    - Inicie o resumo diretamente com um verbo na terceira pessoa do singular, sem sujeito explícito.
+    - Não inclua a parte sobre a vigência da lei.
+    - O resumo deve focar em três pontos principais:
+        1. O que o programa institui e a quem se destina.
+        2. Quem aciona o alerta e em que condições.
+        3. Quais informações podem ser incluídas nas mensagens e quais tecnologias são permitidas.
+    - O resumo não deve mencionar:
+        - Detalhes sobre a Lei Geral de Proteção de Dados – LGPD.
+        - Detalhes específicos sobre a Defesa Civil, ANATEL ou outros órgãos.
+        - Nomes específicos de programas.
+        - 'Minas Gerais' ou 'Estado de Minas Gerais'.
+    - Todas as palavras de origem estrangeira devem ser escritas entre aspas.
+    - Represente os numerais de 0 a 9 por extenso, para 10 ou mais, use apenas o algarismo.
+    """
+
+    prompt_resumo = f"""
+    Resuma a seguinte proposição legislativa de forma clara, concisa e com as regras abaixo.
+    
+    Regras para o Resumo:
+    {regras_adicionais}
+    
+    Texto da Proposição: {texto_original}
+    """
+    
+    payload = {
+        "contents": [{"parts": [{"text": prompt_resumo}]}],
+        "tools": [{"google_search": {}}]
+    }
+
+    try:
+        response = requests.post(url, json=payload)
+        response.raise_for_status()
+        result = response.json()
+        resumo = result.get("candidates", [])[0].get("content", {}).get("parts", [])[0].get("text", "")
+        if resumo:
+            gravar_cache_resposta(chave_cache, "resumo", resumo)
+        return resumo
+    except requests.exceptions.HTTPError as http_err:
+        registrar(mensagens, NIVEL_ERRO, f"Erro na comunicação com a API: {http_err}")
+    except Exception as e:
+        registrar(mensagens, NIVEL_ERRO, f"Ocorreu um erro: {e}")
+        
+    return "Não foi possível gerar o resumo."
+
+def gerar_termos_llm(texto_original, termos_dicionario, num_termos, api_key=None, mensagens=None, exemplos=None):
+    """`exemplos`: quadros do Manual de Indexação (ExemploIndexacao) mostrados ao modelo como referência."""
+    exemplos_prompt = _exemplos_para_prompt(exemplos)
+    chave_cache = chave_cache_resposta(
+        "termos", texto_original, MODELO_TERMOS, VERSAO_PROMPT_TERMOS, num_termos=num_termos,
+        extra=hash_dicionario_termos(termos_dicionario) + hashlib.sha256(exemplos_prompt.encode("utf-8")).hexdigest()
+    )
+    termos_em_cache = ler_cache_resposta(chave_cache)
+    if termos_em_cache:  # listas vazias gravadas por versões anteriores não contam
+        return termos_em_cache
+
+    api_key = api_key or obter_api_key()
+    
+    if not api_key:
+        registrar(mensagens, NIVEL_ERRO, "Erro: A chave de API não foi configurada.")
+        return None
+
+    url = f"{GEMINI_API_URL}/models/{MODELO_TERMOS}:generateContent?key={api_key}"
+
+    bloco_exemplos = (
+        f"Exemplos de indexação do Manual de Indexação para ementas parecidas:\n{exemplos_prompt}\n"
+        if exemplos_prompt else ""
+    )
+    prompt_termos = f"""
+    A partir do texto abaixo, selecione até {num_termos} termos de indexação relevantes.
+    Os termos de indexação devem ser selecionados EXCLUSIVAMENTE da seguinte lista:
+    {', '.join(termos_dicionario)}
+    Se nenhum termo da lista for aplicável, a resposta deve ser uma lista JSON vazia: [].
+    A resposta DEVE ser uma lista JSON de strings, sem texto adicional antes ou depois.
+    {bloco_exemplos}
+    Texto da Proposição: {texto_original}
+    """
+    
+    payload = {
+        "contents": [{"parts": [{"text": prompt_termos}]}],
+        "tools": [{"google_search": {}}]
+    }
+
+    try:
+        response = requests.post(url, json=payload)
+        response.raise_for_status()
+        result = response.json()
+        
+        json_string = result.get("candidates", [])[0].get("content", {}).get("parts", [])[0].get("text", "")
+        
+        termos_sugeridos = []
+        matches = re.findall(r'(\[.*?\])', json_string, re.DOTALL)
+        
+        for match in matches:
+            cleaned_string = match.replace("'", '"')
+            try:
+                parsed_list = json.loads(cleaned_string)
+                if isinstance(parsed_list, list) and all(isinstance(item, str) for item in parsed_list):
+                    termos_sugeridos = parsed_list
+                    break
+            except json.JSONDecodeError:
+                continue
+        
+        # Só uma lista lida com sucesso e não vazia vai para o cache: uma resposta vazia ou
+        # ilegível do modelo deixaria o texto sem termos para sempre.
+        if termos_sugeridos:
+            gravar_cache_resposta(chave_cache, "termos", termos_sugeridos)
+        return termos_sugeridos
+        
+    except requests.exceptions.HTTPError as http_err:
+        registrar(mensagens, NIVEL_ERRO, f"Erro na comunicação com a API: {http_err}")
+    except Exception as e:
+        registrar(mensagens, NIVEL_ERRO, f"Ocorreu um erro: {e}")
+        
+    return []
+
+def pre_aquecer_cache_respostas(textos, termos_dicionario, api_key=None, opcoes_num_termos=(3, 5, 10),
+                                incluir_resumo=True, mensagens=None, usar_exemplos=True):
+    """
+    Popula o cache de respostas para uma lista de textos (uso em lote), de modo que
+    consultas posteriores com o mesmo texto retornem sem chamar a API.
+    `usar_exemplos` deve ser o mesmo das consultas (ver `gerar_resumo_e_termos`).
+    """
+    total = 0
+    for texto in textos:
+        if not texto or not texto.strip():
+            continue
+        if incluir_resumo:
+            gerar_resumo(texto, api_key, mensagens)
+        exemplos = buscar_exemplos(texto, mensagens=mensagens) if usar_exemplos else []
+        for num_termos in opcoes_num_termos:
+            gerar_termos_llm(texto, termos_dicionario, num_termos, api_key, mensagens, exemplos=exemplos)
+        total += 1
+    return total
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from dataclasses import dataclass
+
+NIVEL_ERRO = "erro"
+NIVEL_AVISO = "aviso"
+NIVEL_INFO = "info"
+
+@dataclass(frozen=True)
+class Mensagem:
+    """Erro ou aviso produzido pelo motor, devolvido a quem chamou para exibição ou registro."""
+    nivel: str
+    texto: str
+
+def registrar(mensagens, nivel, texto):
+    if mensagens is not None:
+        mensagens.append(Mensagem(nivel, texto))
+
+def possui_erro(mensagens):
+    return any(mensagem.nivel == NIVEL_ERRO for mensagem in mensagens)
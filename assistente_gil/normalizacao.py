@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Camada de texto normalizado (casefold e sem acentos) para as regras que não
+diferenciam maiúsculas nem acentos. O documento é normalizado uma vez; as regras
+casam contra a cópia normalizada e as posições voltam ao texto original pelo mapa
+de posições, de modo que "MARÇO", "Março" e "MARCO" (texto de OCR) caem na mesma
+chave sem `.lower()`/`.upper()` a cada match.
+"""
+import bisect
+import re
+import unicodedata
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def normalizar_caractere(caractere):
+    """'Ç' -> 'c', 'ß' -> 'ss'; marcas combinantes soltas (texto em NFD) viram ''."""
+    decomposto = unicodedata.normalize("NFD", caractere.casefold())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+class TextoNormalizado:
+    """
+    Cópia normalizada de `original`. `mapa[i]` é a posição, no original, do caractere
+    que gerou o i-ésimo caractere normalizado; fica None quando cada caractere vira
+    exatamente um (o caso comum em português), e as posições coincidem.
+    """
+    def __init__(self, original):
+        self.original = original
+        caracteres = {c: normalizar_caractere(c) for c in set(original)}
+        if all(len(r) == 1 for r in caracteres.values()):
+            self.texto = original.translate({ord(c): r for c, r in caracteres.items() if r != c})
+            self.mapa = None
+        else:
+            partes, mapa = [], []
+            for posicao, c in enumerate(original):
+                r = caracteres[c]
+                partes.append(r)
+                mapa.extend([posicao] * len(r))
+            self.texto = "".join(partes)
+            self.mapa = mapa
+
+    def posicao_original(self, posicao):
+        """Posição no original correspondente a uma posição (início ou fim) no texto normalizado."""
+        if self.mapa is None:
+            return posicao
+        if posicao >= len(self.mapa):
+            return len(self.original)
+        return self.mapa[posicao]
+
+    def posicao_normalizada(self, posicao):
+        """Posição no texto normalizado correspondente a uma posição no original."""
+        if self.mapa is None:
+            return posicao
+        return bisect.bisect_left(self.mapa, posicao)
+
+    def trecho(self, inicio, fim):
+        """Texto normalizado do trecho [inicio, fim) do original."""
+        return self.texto[self.posicao_normalizada(inicio):self.posicao_normalizada(fim)]
+
+    def span_original(self, match, grupo=0):
+        """(início, fim) no original de um grupo de um match feito no texto normalizado."""
+        inicio, fim = match.span(grupo)
+        return self.posicao_original(inicio), self.posicao_original(fim)
+
+def normalizar(texto):
+    """Texto normalizado de uma string curta (chaves de mapeamentos, literais das regras)."""
+    return "".join(normalizar_caractere(c) for c in texto)
+
+def compilar_normalizado(padrao, flags=0):
+    """
+    Compila uma regra escrita como no texto original ("É recebido pela presidência")
+    para casar contra o texto normalizado. O padrão passa pela mesma normalização, por
+    isso não pode usar classes em maiúscula (\\S, \\W, \\D, \\B...), que virariam outras.
+    """
+    if re.search(r"\\[A-Z]", padrao):
+        raise ValueError(f"Padrão com classe em maiúscula não pode ser normalizado: {padrao!r}")
+    return re.compile(normalizar(padrao), flags)
@@ -0,0 +1,655 @@
+# -*- coding: utf-8 -*-
+"""Conversor de PDF em texto: OCR, correção via IA, conversão para ODT e fila de jobs."""
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from .configuracao import CACHE_DIR, obter_api_key
+from .dependencias import fitz, requests
+from .diagnostico import etapas_para_json, medir
+from .llm import GEMINI_API_URL, LimitadorDeTaxa
+from .mensagens import NIVEL_AVISO, NIVEL_ERRO, registrar
+
+# --- Cache de Artefatos do Conversor OCR ---
+OCR_CACHE_DIR = os.path.join(CACHE_DIR, "artefatos_ocr")
+OCR_CACHE_DB = os.path.join(CACHE_DIR, "artefatos_ocr.sqlite3")
+OCR_CACHE_MAX_BYTES = int(os.environ.get("OCR_CACHE_MAX_MB", "500")) * 1024 * 1024
+
+def chave_artefato(*partes):
+    return hashlib.sha256("\x1f".join(str(parte) for parte in partes).encode("utf-8")).hexdigest()
+
+def hash_conteudo(dados):
+    if isinstance(dados, str):
+        dados = dados.encode("utf-8")
+    return hashlib.sha256(dados).hexdigest()
+
+def _conectar_cache_artefatos():
+    os.makedirs(OCR_CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(OCR_CACHE_DB, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS artefatos ("
+        "chave TEXT PRIMARY KEY, tipo TEXT NOT NULL, tamanho INTEGER NOT NULL, ultimo_acesso REAL NOT NULL)"
+    )
+    return conn
+
+def ler_artefato(chave):
+    caminho = os.path.join(OCR_CACHE_DIR, chave)
+    try:
+        with closing(_conectar_cache_artefatos()) as conn:
+            if conn.execute("SELECT 1 FROM artefatos WHERE chave = ?", (chave,)).fetchone() is None:
+                return None
+            with open(caminho, "rb") as f:
+                dados = f.read()
+            conn.execute("UPDATE artefatos SET ultimo_acesso = ? WHERE chave = ?", (time.time(), chave))
+            conn.commit()
+            return dados
+    except (sqlite3.Error, OSError):
+        return None
+
+def ler_artefato_texto(chave):
+    dados = ler_artefato(chave)
+    return dados.decode("utf-8") if dados is not None else None
+
+def gravar_artefato(chave, tipo, dados):
+    if isinstance(dados, str):
+        dados = dados.encode("utf-8")
+    caminho = os.path.join(OCR_CACHE_DIR, chave)
+    try:
+        with closing(_conectar_cache_artefatos()) as conn:
+            caminho_temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(caminho_temporario, "wb") as f:
+                f.write(dados)
+            os.replace(caminho_temporario, caminho)
+            conn.execute(
+                "INSERT OR REPLACE INTO artefatos (chave, tipo, tamanho, ultimo_acesso) VALUES (?, ?, ?, ?)",
+                (chave, tipo, len(dados), time.time())
+            )
+            conn.commit()
+            _remover_artefatos_excedentes(conn)
+    except (sqlite3.Error, OSError):
+        pass
+
+def _remover_artefatos_excedentes(conn):
+    # Remove os artefatos usados há mais tempo (LRU) até o cache caber no limite.
+    total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM artefatos").fetchone()[0]
+    if total <= OCR_CACHE_MAX_BYTES:
+        return
+    removidos = []
+    for chave, tamanho in conn.execute("SELECT chave, tamanho FROM artefatos ORDER BY ultimo_acesso"):
+        if total <= OCR_CACHE_MAX_BYTES:
+            break
+        removidos.append(chave)
+        total -= tamanho
+    for chave in removidos:
+        caminho = os.path.join(OCR_CACHE_DIR, chave)
+        if os.path.exists(caminho):
+            os.unlink(caminho)
+    conn.executemany("DELETE FROM artefatos WHERE chave = ?", [(chave,) for chave in removidos])
+    conn.commit()
+
+def hash_pagina_pdf(doc, indice):
+    """Hash do conteúdo de uma página (fluxo de desenho, imagens, dimensões e rotação)."""
+    page = doc[indice]
+    h = hashlib.sha256(page.read_contents())
+    for imagem in page.get_images(full=True):
+        h.update(doc.xref_stream_raw(imagem[0]) or b"")
+    h.update(f"{tuple(page.rect)}|{page.rotation}".encode("utf-8"))
+    return h.hexdigest()
+
+# --- Correção e Extração de Texto ---
+MODELO_CORRECAO_OCR = "gemini-2.5-flash"
+VERSAO_PROMPT_CORRECAO_OCR = "1"
+OCR_CORRECAO_MAX_WORKERS = int(os.environ.get("OCR_CORRECAO_MAX_WORKERS", "4"))
+OCR_CORRECAO_MAX_REQ_POR_MINUTO = int(os.environ.get("OCR_CORRECAO_MAX_REQ_POR_MINUTO", "60"))
+OCR_CORRECAO_TIMEOUT = 120
+
+SYSTEM_PROMPT_CORRECAO_OCR = """
+Você é um corretor ortográfico e normalizador de texto brasileiro, especializado em documentos históricos.
+Sua tarefa é receber um texto bruto de OCR, corrigir erros e normalizar a ortografia arcaica (ex: 'Geraes' → 'Gerais', 'legaes' → 'legais').
+**Você deve retornar o resultado INTEIRO no formato Markdown.**
+
+Regras estritas:
+- **NÃO use negrito (`**` ou `__`) em NENHUMA parte do texto.**
+- **Remova o cabeçalho do jornal/documento**: TÍTULO (ex: "MINAS GERAES"), data, número da edição, assinatura, venda avulsa, linhas divisórias. Mantenha apenas o corpo do texto.
+- **Corrija erros óbvios de OCR** e normalize ortografia arcaica.
+- **Se o texto contiver pares claros de "rótulo … valor" (ex: "Ativo … 450:200$000"), recrie-os como uma tabela Markdown com DUAS COLUNAS, SEM CABEÇALHOS.**
+  - A primeira coluna deve conter o item descritivo (ex: "Saldo de 1930", "Rendas arrecadadas").
+  - A segunda coluna deve conter o valor correspondente (ex: "13:868$112", "243:234$308").
+  - **Não crie cabeçalhos como "Item" e "Valor". Deixe as células vazias na primeira linha ou use apenas `--- | ---` como separador.**
+  - **Se houver títulos seccionais (ex: "Receita:", "Despesa:", "Situação patrimonial..."), inclua-os como linhas de tabela, com o texto na primeira coluna e a segunda coluna vazia.**
+  - **Mantenha a ordem exata dos itens do texto original. Não invente, não resuma, não omita.**
+  - **Nunca adicione linhas como "Total", "Subtotal", "Geral", etc., a menos que estejam explicitamente no texto.**
+- **Retorne APENAS o texto corrigido em Markdown**, sem explicações, sem blocos de código (ex: ```markdown```), sem introduções.
+"""
+
+OCR_JOBS_PADRAO = os.cpu_count() or 1
+
+def validar_intervalo_paginas(intervalo):
+    intervalo = (intervalo or "").replace(" ", "")
+    if not intervalo:
+        return ""
+    if not re.fullmatch(r"\d+(?:-\d+)?(?:,\d+(?:-\d+)?)*", intervalo):
+        raise ValueError(f"Intervalo de páginas inválido: '{intervalo}'. Use o formato '1-10' ou '1,3,5-7'.")
+    for parte in intervalo.split(","):
+        inicio, _, fim = parte.partition("-")
+        if int(inicio) < 1 or (fim and int(fim) < int(inicio)):
+            raise ValueError(f"Intervalo de páginas inválido: '{parte}'.")
+    return intervalo
+
+def montar_comando_ocr(ocrmypdf_path, input_filepath, output_filepath, sidecar_filepath,
+                       jobs=None, paginas="", pular_paginas_com_texto=False, apenas_sidecar=True):
+    comando = [ocrmypdf_path]
+    comando.append("--skip-text" if pular_paginas_com_texto else "--force-ocr")
+    comando += ["--jobs", str(jobs or OCR_JOBS_PADRAO)]
+    if paginas:
+        comando += ["--pages", paginas]
+    if apenas_sidecar:
+        # O PDF de saída é descartado: evita a conversão para PDF/A e a otimização de imagens.
+        comando += ["--output-type", "pdf", "--optimize", "0"]
+    comando += ["--sidecar", sidecar_filepath, input_filepath, output_filepath]
+    return comando
+
+def dividir_sidecar_em_paginas(raw_text):
+    # O sidecar do ocrmypdf separa as páginas com form-feed (\f).
+    return raw_text.split("\f")
+
+# Texto que o ocrmypdf grava no sidecar no lugar das páginas fora de --pages ou puladas
+# por --skip-text. Não é conteúdo do documento: não vai à correção nem ao ODT.
+PAGINA_PULADA_PELO_OCR = re.compile(r"^\s*\[OCR skipped on page[^\]]*\]\s*$")
+
+def pagina_pulada_pelo_ocr(texto):
+    return PAGINA_PULADA_PELO_OCR.match(texto) is not None
+
+def recortar_sidecar(sidecar, pdf_filepath, paginas=""):
+    """
+    Sidecar de um ocrmypdf rodado sobre o documento inteiro (uma página do sidecar por página
+    do PDF) reduzido às páginas de `paginas`; nas puladas por --skip-text, que já tinham
+    texto, entra a camada de texto da própria página.
+    """
+    paginas_sidecar = dividir_sidecar_em_paginas(sidecar)
+    textos = []
+    with fitz.open(pdf_filepath) as doc:
+        for indice in expandir_intervalo_paginas(paginas, doc.page_count):
+            texto = paginas_sidecar[indice] if indice < len(paginas_sidecar) else ""
+            if pagina_pulada_pelo_ocr(texto):
+                texto = doc[indice].get_text("text")
+            textos.append(texto)
+    return "\f".join(textos)
+
+def _corrigir_trecho_ocr(trecho, api_key, limitador):
+    """Corrige um trecho (página) do OCR. Retorna (texto, erro); em caso de falha, devolve o texto bruto."""
+    if not trecho.strip():
+        return trecho, None
+    apiUrl = f"{GEMINI_API_URL}/models/{MODELO_CORRECAO_OCR}:generateContent?key={api_key}"
+    payload = {
+        "contents": [{"parts": [{"text": trecho}]}],
+        "system_instruction": {"parts": [{"text": SYSTEM_PROMPT_CORRECAO_OCR}]},
+    }
+    limitador.aguardar()
+    try:
+        response = requests.post(apiUrl,
+                                headers={'Content-Type': 'application/json'},
+                                data=json.dumps(payload),
+                                timeout=OCR_CORRECAO_TIMEOUT)
+        if response.status_code == 400:
+            return trecho, f"Erro detalhado da API (400): {response.text}"
+        response.raise_for_status()
+        result = response.json()
+        corrected_text = result.get("candidates", [])[0].get("content", {}).get("parts", [])[0].get("text", "")
+        return (corrected_text, None) if corrected_text else (trecho, "Resposta vazia da API")
+    except requests.exceptions.HTTPError as http_err:
+        return trecho, f"Erro HTTP ({http_err.response.status_code})"
+    except Exception as e:
+        return trecho, f"Erro inesperado: {e}"
+
+def corrigir_paginas_ocr(raw_text, api_key, progresso=None):
+    """
+    Corrige o sidecar página a página, em paralelo. Retorna (texto_corrigido, falhas),
+    onde `falhas` é uma lista de (numero_da_pagina, erro) das páginas mantidas com o texto bruto.
+    `progresso`, se informado, é chamado com (concluidos, total) a cada página corrigida.
+    """
+    paginas = ["" if pagina_pulada_pelo_ocr(pagina) else pagina for pagina in dividir_sidecar_em_paginas(raw_text)]
+    total = len(paginas)
+    limitador = LimitadorDeTaxa(OCR_CORRECAO_MAX_REQ_POR_MINUTO)
+    resultados = [None] * total
+    chaves = [
+        chave_artefato("correcao_pagina", MODELO_CORRECAO_OCR, VERSAO_PROMPT_CORRECAO_OCR, hash_conteudo(pagina))
+        for pagina in paginas
+    ]
+    for i, chave in enumerate(chaves):
+        if paginas[i].strip():
+            corrigida = ler_artefato_texto(chave)
+            if corrigida is not None:
+                resultados[i] = (corrigida, None)
+    concluidos = sum(1 for resultado in resultados if resultado is not None)
+    if progresso and concluidos:
+        progresso(concluidos, total)
+
+    pendentes = [i for i, resultado in enumerate(resultados) if resultado is None]
+    with ThreadPoolExecutor(max_workers=max(1, min(OCR_CORRECAO_MAX_WORKERS, len(pendentes)))) as executor:
+        futuros = {
+            executor.submit(_corrigir_trecho_ocr, paginas[i], api_key, limitador): i
+            for i in pendentes
+        }
+        for futuro in as_completed(futuros):
+            i = futuros[futuro]
+            resultados[i] = futuro.result()
+            texto_corrigido, erro = resultados[i]
+            if erro is None and paginas[i].strip():
+                gravar_artefato(chaves[i], "correcao_pagina", texto_corrigido)
+            concluidos += 1
+            if progresso:
+                progresso(concluidos, total)
+
+    falhas = [(i + 1, erro) for i, (_, erro) in enumerate(resultados) if erro]
+    texto = "\n\n".join(texto.strip() for texto, _ in resultados if texto.strip())
+    return texto, falhas
+
+def descrever_falhas_correcao(falhas):
+    detalhes = "; ".join(f"página {num}: {erro}" for num, erro in falhas[:5])
+    return f"{len(falhas)} página(s) não puderam ser corrigidas via Gemini e foram mantidas com o texto bruto ({detalhes})."
+
+def correct_ocr_text(raw_text, api_key=None, progresso=None, mensagens=None):
+    """
+    Chama a API da Gemini para corrigir erros de OCR, normalizar a ortografia arcaica,
+    remover cabeçalho e formatar dados estruturados como tabela em Markdown — SEM negrito.
+    O texto é dividido por página e corrigido em paralelo; páginas com falha mantêm o texto bruto.
+    """
+    api_key = api_key or obter_api_key()
+    if not api_key:
+        registrar(mensagens, NIVEL_ERRO, "Chave de API do Gemini não encontrada. Verifique as variáveis de ambiente ou secrets.")
+        return raw_text
+
+    texto, falhas = corrigir_paginas_ocr(raw_text, api_key, progresso)
+    if falhas:
+        registrar(mensagens, NIVEL_AVISO, descrever_falhas_correcao(falhas))
+    return texto
+
+# Incrementar quando o texto bruto montado a partir do sidecar mudar (invalida o cache de sidecars).
+VERSAO_SIDECAR = "2"
+OCR_MIN_CARACTERES_CAMADA_TEXTO = int(os.environ.get("OCR_MIN_CARACTERES_CAMADA_TEXTO", "50"))
+
+def expandir_intervalo_paginas(paginas, total_documento):
+    """Converte um intervalo como '1-3,5' na lista ordenada de índices (base 0) das páginas existentes."""
+    if not paginas:
+        return list(range(total_documento))
+    selecionadas = set()
+    for parte in paginas.split(","):
+        inicio, _, fim = parte.partition("-")
+        fim = fim or inicio
+        selecionadas.update(range(int(inicio) - 1, min(int(fim), total_documento)))
+    return sorted(selecionadas)
+
+def classificar_paginas_pdf(pdf_filepath, paginas=""):
+    """
+    Pré-análise com PyMuPDF: para cada página selecionada, retorna (indice, texto), em que
+    `texto` é a camada de texto existente quando aproveitável, ou None quando a página
+    é só imagem e precisa passar pelo OCR.
+    """
+    classificacao = []
+    with fitz.open(pdf_filepath) as doc:
+        for indice in expandir_intervalo_paginas(paginas, doc.page_count):
+            page = doc[indice]
+            texto = page.get_text("text")
+            if len(texto.strip()) >= OCR_MIN_CARACTERES_CAMADA_TEXTO or not page.get_images(full=False):
+                classificacao.append((indice, texto))
+            else:
+                classificacao.append((indice, None))
+    return classificacao
+
+def extrair_paginas_pdf(pdf_filepath, indices, destino_filepath):
+    with fitz.open(pdf_filepath) as doc, fitz.open() as novo:
+        for indice in indices:
+            novo.insert_pdf(doc, from_page=indice, to_page=indice)
+        novo.save(destino_filepath)
+
+def executar_ocrmypdf(command_ocr, progresso=None):
+    """
+    Executa o ocrmypdf acompanhando o stderr. As mensagens por página vêm prefixadas
+    com o número da página; `progresso` recebe a quantidade de páginas já vistas.
+    """
+    processo = subprocess.Popen(command_ocr, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    paginas_vistas = set()
+    linhas_stderr = []
+    for linha in processo.stderr:
+        linhas_stderr.append(linha)
+        match_pagina = re.match(r"^\s*(\d+)\s", linha)
+        if match_pagina and match_pagina.group(1) not in paginas_vistas:
+            paginas_vistas.add(match_pagina.group(1))
+            if progresso:
+                progresso(len(paginas_vistas))
+    processo.wait()
+    if processo.returncode != 0:
+        raise subprocess.CalledProcessError(processo.returncode, command_ocr, stderr="".join(linhas_stderr[-50:]))
+
+# --- Fila de Conversões OCR em Segundo Plano ---
+OCR_JOBS_DIR = os.path.join(CACHE_DIR, "jobs_ocr")
+OCR_JOBS_DB = os.path.join(CACHE_DIR, "jobs_ocr.sqlite3")
+OCR_MAX_JOBS_SIMULTANEOS = int(os.environ.get("OCR_MAX_JOBS_SIMULTANEOS", "1"))
+OCR_JOBS_RETENCAO_DIAS = int(os.environ.get("OCR_JOBS_RETENCAO_DIAS", "7"))
+
+STATUS_JOB_NA_FILA = "Na fila"
+STATUS_JOB_EXECUTANDO = "Em execução"
+STATUS_JOB_CONCLUIDO = "Concluído"
+STATUS_JOB_ERRO = "Erro"
+
+ETAPA_JOB_OCR = "OCR"
+ETAPA_JOB_CORRECAO = "Correção via IA"
+ETAPA_JOB_PANDOC = "Conversão para ODT (pandoc)"
+
+# Processo dono dos jobs que enfileira ("pid:identificador"). Um job pendente só é retomado
+# se o dono não for este processo nem outro processo ainda vivo.
+DONO_JOBS_OCR = f"{os.getpid()}:{os.urandom(4).hex()}"
+
+def _processo_vivo(dono):
+    pid = dono.split(":", 1)[0]
+    if not pid.isdigit() or int(pid) == os.getpid():
+        return False  # mesmo pid com outro identificador: processo anterior (ex.: pid 1 em contêiner)
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:  # existe, mas pertence a outro usuário
+        return True
+    return True
+
+def _conectar_jobs_ocr():
+    os.makedirs(OCR_JOBS_DIR, exist_ok=True)
+    conn = sqlite3.connect(OCR_JOBS_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        "id TEXT PRIMARY KEY, nome_arquivo TEXT NOT NULL, opcoes TEXT NOT NULL, status TEXT NOT NULL, "
+        "etapa TEXT NOT NULL DEFAULT '', progresso_atual INTEGER NOT NULL DEFAULT 0, "
+        "progresso_total INTEGER NOT NULL DEFAULT 0, mensagem TEXT NOT NULL DEFAULT '', "
+        "criado_em TEXT NOT NULL, atualizado_em TEXT NOT NULL, diagnostico TEXT NOT NULL DEFAULT '')"
+    )
+    colunas = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "diagnostico" not in colunas:  # bancos criados antes da coluna de diagnóstico
+        conn.execute("ALTER TABLE jobs ADD COLUMN diagnostico TEXT NOT NULL DEFAULT ''")
+    if "dono" not in colunas:  # bancos criados antes da coluna de dono
+        conn.execute("ALTER TABLE jobs ADD COLUMN dono TEXT NOT NULL DEFAULT ''")
+    return conn
+
+def caminho_entrada_job_ocr(job_id):
+    return os.path.join(OCR_JOBS_DIR, f"{job_id}.pdf")
+
+def caminho_resultado_job_ocr(job_id):
+    return os.path.join(OCR_JOBS_DIR, f"{job_id}.odt")
+
+def criar_job_ocr(pdf_bytes, nome_arquivo, opcoes):
+    job_id = hashlib.sha256(pdf_bytes + os.urandom(16)).hexdigest()[:16]
+    agora = datetime.now().isoformat()
+    with closing(_conectar_jobs_ocr()) as conn:
+        with open(caminho_entrada_job_ocr(job_id), "wb") as f:
+            f.write(pdf_bytes)
+        conn.execute(
+            "INSERT INTO jobs (id, nome_arquivo, opcoes, status, criado_em, atualizado_em, dono) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, nome_arquivo, json.dumps(opcoes), STATUS_JOB_NA_FILA, agora, agora, DONO_JOBS_OCR)
+        )
+        conn.commit()
+    return job_id
+
+def atualizar_job_ocr(job_id, **campos):
+    campos["atualizado_em"] = datetime.now().isoformat()
+    atribuicoes = ", ".join(f"{nome} = ?" for nome in campos)
+    with closing(_conectar_jobs_ocr()) as conn:
+        conn.execute(f"UPDATE jobs SET {atribuicoes} WHERE id = ?", (*campos.values(), job_id))
+        conn.commit()
+
+def obter_job_ocr(job_id):
+    with closing(_conectar_jobs_ocr()) as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return dict(row) if row else None
+
+def limpar_jobs_ocr_antigos():
+    limite = (datetime.now() - timedelta(days=OCR_JOBS_RETENCAO_DIAS)).isoformat()
+    with closing(_conectar_jobs_ocr()) as conn:
+        antigos = [row["id"] for row in conn.execute("SELECT id FROM jobs WHERE atualizado_em < ?", (limite,))]
+        for job_id in antigos:
+            for caminho in (caminho_entrada_job_ocr(job_id), caminho_resultado_job_ocr(job_id)):
+                if os.path.exists(caminho):
+                    os.unlink(caminho)
+        conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in antigos])
+        conn.commit()
+
+def extrair_texto_bruto_pdf(input_filepath, workspace, ocrmypdf_path, opcoes, progresso=None):
+    """
+    Produz o texto bruto do PDF no formato do sidecar (páginas separadas por form-feed).
+    Com `aproveitar_camada_texto`, só as páginas sem camada de texto passam pelo ocrmypdf;
+    as demais têm o texto extraído diretamente, e o resultado é remontado na ordem das páginas.
+    `progresso`, se informado, é chamado com (concluidos, total) das páginas enviadas ao OCR.
+    """
+    output_ocr_filepath = os.path.join(workspace, "output_ocr.pdf")
+    sidecar_filepath = os.path.join(workspace, "sidecar_ocr.txt")
+
+    with open(input_filepath, "rb") as f:
+        hash_pdf = hash_conteudo(f.read())
+    chave_sidecar = chave_artefato(
+        "sidecar", VERSAO_SIDECAR, hash_pdf, opcoes.get("paginas", ""), opcoes.get("aproveitar_camada_texto", True),
+        opcoes.get("pular_paginas_com_texto", False), OCR_MIN_CARACTERES_CAMADA_TEXTO
+    )
+    sidecar_em_cache = ler_artefato_texto(chave_sidecar)
+    if sidecar_em_cache is not None:
+        return sidecar_em_cache
+
+    sidecar_text_raw = _extrair_texto_bruto_sem_cache(
+        input_filepath, output_ocr_filepath, sidecar_filepath, workspace, ocrmypdf_path, opcoes, progresso
+    )
+    gravar_artefato(chave_sidecar, "sidecar", sidecar_text_raw)
+    return sidecar_text_raw
+
+def _extrair_texto_bruto_sem_cache(input_filepath, output_ocr_filepath, sidecar_filepath, workspace,
+                                   ocrmypdf_path, opcoes, progresso):
+    if not opcoes.get("aproveitar_camada_texto", True):
+        with fitz.open(input_filepath) as doc:
+            total = len(expandir_intervalo_paginas(opcoes.get("paginas", ""), doc.page_count))
+        command_ocr = montar_comando_ocr(
+            ocrmypdf_path,
+            input_filepath,
+            output_ocr_filepath,
+            sidecar_filepath,
+            jobs=opcoes.get("jobs"),
+            paginas=opcoes.get("paginas", ""),
+            pular_paginas_com_texto=opcoes.get("pular_paginas_com_texto", False)
+        )
+        executar_ocrmypdf(command_ocr, progresso=lambda n: progresso and progresso(min(n, total), total))
+        with open(sidecar_filepath, "r", encoding='utf-8') as f:
+            return recortar_sidecar(f.read(), input_filepath, opcoes.get("paginas", ""))
+
+    classificacao = classificar_paginas_pdf(input_filepath, opcoes.get("paginas", ""))
+    indices_sem_texto = [indice for indice, texto in classificacao if texto is None]
+    textos_ocr = {}
+    chaves_paginas = {}
+    if indices_sem_texto:
+        with fitz.open(input_filepath) as doc:
+            for indice in indices_sem_texto:
+                chaves_paginas[indice] = chave_artefato("ocr_pagina", hash_pagina_pdf(doc, indice))
+        for indice, chave in chaves_paginas.items():
+            texto_em_cache = ler_artefato_texto(chave)
+            if texto_em_cache is not None:
+                textos_ocr[indice] = texto_em_cache
+
+    indices_ocr = [indice for indice in indices_sem_texto if indice not in textos_ocr]
+    if indices_ocr:
+        paginas_ocr_filepath = os.path.join(workspace, "paginas_sem_texto.pdf")
+        extrair_paginas_pdf(input_filepath, indices_ocr, paginas_ocr_filepath)
+        total = len(indices_ocr)
+        if progresso:
+            progresso(0, total)
+        command_ocr = montar_comando_ocr(
+            ocrmypdf_path,
+            paginas_ocr_filepath,
+            output_ocr_filepath,
+            sidecar_filepath,
+            jobs=opcoes.get("jobs")
+        )
+        executar_ocrmypdf(command_ocr, progresso=lambda n: progresso and progresso(min(n, total), total))
+        with open(sidecar_filepath, "r", encoding='utf-8') as f:
+            for indice, texto in zip(indices_ocr, dividir_sidecar_em_paginas(f.read())):
+                textos_ocr[indice] = texto
+                gravar_artefato(chaves_paginas[indice], "ocr_pagina", texto)
+
+    return "\f".join(
+        texto if texto is not None else textos_ocr.get(indice, "")
+        for indice, texto in classificacao
+    )
+
+def executar_job_ocr(job_id, ocrmypdf_path, pandoc_path, api_key):
+    job = obter_job_ocr(job_id)
+    if job is None:
+        return
+    opcoes = json.loads(job["opcoes"])
+    input_filepath = caminho_entrada_job_ocr(job_id)
+    etapas = []
+
+    try:
+        if not api_key:
+            raise RuntimeError("Chave de API do Gemini não encontrada. Verifique as variáveis de ambiente ou secrets.")
+
+        atualizar_job_ocr(job_id, status=STATUS_JOB_EXECUTANDO, etapa=ETAPA_JOB_OCR,
+                          progresso_atual=0, progresso_total=0)
+
+        with tempfile.TemporaryDirectory(prefix="conversor_ocr_") as workspace:
+            markdown_filepath = os.path.join(workspace, "texto_temporario.md")
+            odt_filepath = os.path.join(workspace, "documento_final.odt")
+
+            with medir("ocr.texto_bruto", etapas, job=job_id, bytes=os.path.getsize(input_filepath)):
+                sidecar_text_raw = extrair_texto_bruto_pdf(
+                    input_filepath,
+                    workspace,
+                    ocrmypdf_path,
+                    opcoes,
+                    progresso=lambda n, total: atualizar_job_ocr(job_id, progresso_atual=n, progresso_total=total)
+                )
+
+            atualizar_job_ocr(job_id, etapa=ETAPA_JOB_CORRECAO, progresso_atual=0,
+                              progresso_total=len(dividir_sidecar_em_paginas(sidecar_text_raw)))
+            chave_markdown = chave_artefato(
+                "markdown", MODELO_CORRECAO_OCR, VERSAO_PROMPT_CORRECAO_OCR, hash_conteudo(sidecar_text_raw)
+            )
+            with medir("ocr.correcao", etapas, job=job_id) as atributos:
+                sidecar_text_corrected = ler_artefato_texto(chave_markdown)
+                atributos["cache"] = sidecar_text_corrected is not None
+                falhas = []
+                if sidecar_text_corrected is None:
+                    sidecar_text_corrected, falhas = corrigir_paginas_ocr(
+                        sidecar_text_raw,
+                        api_key,
+                        progresso=lambda n, total: atualizar_job_ocr(job_id, progresso_atual=n, progresso_total=total)
+                    )
+                    if not falhas:
+                        gravar_artefato(chave_markdown, "markdown", sidecar_text_corrected)
+            with open(markdown_filepath, "w", encoding='utf-8') as f:
+                f.write(sidecar_text_corrected)
+
+            atualizar_job_ocr(job_id, etapa=ETAPA_JOB_PANDOC, progresso_atual=0, progresso_total=1)
+            with medir("ocr.pandoc", etapas, job=job_id):
+                chave_odt = chave_artefato("odt", hash_conteudo(sidecar_text_corrected))
+                odt_em_cache = ler_artefato(chave_odt)
+                if odt_em_cache is not None:
+                    with open(odt_filepath, "wb") as f:
+                        f.write(odt_em_cache)
+                else:
+                    command_pandoc = [
+                        pandoc_path,
+                        "--standalone",
+                        "-s",
+                        markdown_filepath,
+                        "-o",
+                        odt_filepath
+                    ]
+                    subprocess.run(command_pandoc, check=True, capture_output=True, text=True)
+                    with open(odt_filepath, "rb") as f:
+                        gravar_artefato(chave_odt, "odt", f.read())
+            shutil.move(odt_filepath, caminho_resultado_job_ocr(job_id))
+
+        atualizar_job_ocr(job_id, status=STATUS_JOB_CONCLUIDO, etapa="", progresso_atual=1, progresso_total=1,
+                          mensagem=descrever_falhas_correcao(falhas) if falhas else "")
+    except subprocess.CalledProcessError as e:
+        atualizar_job_ocr(job_id, status=STATUS_JOB_ERRO,
+                          mensagem=f"Erro ao processar o arquivo (OCR ou Pandoc). Detalhes: {e.stderr}")
+    except Exception as e:
+        atualizar_job_ocr(job_id, status=STATUS_JOB_ERRO, mensagem=f"Ocorreu um erro inesperado: {e}")
+    finally:
+        atualizar_job_ocr(job_id, diagnostico=etapas_para_json(etapas))
+        if os.path.exists(input_filepath):
+            try:
+                os.unlink(input_filepath)
+            except Exception:
+                pass
+
+def reivindicar_job_ocr(job_id):
+    """
+    Passa um job pendente para este processo, numa única instrução (atômica no SQLite).
+    Retorna False se o job não estiver mais pendente ou já for deste processo.
+    """
+    with closing(_conectar_jobs_ocr()) as conn, conn:
+        cursor = conn.execute(
+            "UPDATE jobs SET dono = ?, status = ?, etapa = '', progresso_atual = 0, atualizado_em = ? "
+            "WHERE id = ? AND status IN (?, ?) AND dono != ?",
+            (DONO_JOBS_OCR, STATUS_JOB_NA_FILA, datetime.now().isoformat(),
+             job_id, STATUS_JOB_NA_FILA, STATUS_JOB_EXECUTANDO, DONO_JOBS_OCR)
+        )
+        return cursor.rowcount == 1
+
+# Um só executor por processo: o limite de conversões simultâneas vale para o servidor
+# inteiro, mesmo com várias filas (uma por chave de API).
+_executor_jobs_ocr = None
+_trava_executor_jobs_ocr = threading.Lock()
+
+def obter_executor_jobs_ocr(max_jobs=OCR_MAX_JOBS_SIMULTANEOS):
+    global _executor_jobs_ocr
+    with _trava_executor_jobs_ocr:
+        if _executor_jobs_ocr is None:
+            _executor_jobs_ocr = ThreadPoolExecutor(max_workers=max(1, max_jobs), thread_name_prefix="job_ocr")
+        return _executor_jobs_ocr
+
+class FilaJobsOCR:
+    """
+    Envia as conversões para o executor do processo, que as roda em segundo plano; o
+    número de workers limita quantas conversões pesadas rodam ao mesmo tempo. Jobs que
+    ficaram pendentes de um processo que já terminou são reivindicados e reenfileirados
+    na criação; os de outra fila deste processo, ou de outro processo vivo, não.
+    """
+    def __init__(self, ocrmypdf_path, pandoc_path, api_key, max_jobs=OCR_MAX_JOBS_SIMULTANEOS):
+        self.ocrmypdf_path = ocrmypdf_path
+        self.pandoc_path = pandoc_path
+        self.api_key = api_key
+        self.executor = obter_executor_jobs_ocr(max_jobs)
+        limpar_jobs_ocr_antigos()
+        self._retomar_pendentes()
+
+    def _retomar_pendentes(self):
+        with closing(_conectar_jobs_ocr()) as conn:
+            pendentes = [
+                (row["id"], row["dono"]) for row in conn.execute(
+                    "SELECT id, dono FROM jobs WHERE status IN (?, ?) ORDER BY criado_em",
+                    (STATUS_JOB_NA_FILA, STATUS_JOB_EXECUTANDO)
+                )
+            ]
+        for job_id, dono in pendentes:
+            if dono == DONO_JOBS_OCR or (dono and _processo_vivo(dono)):
+                continue
+            if not os.path.exists(caminho_entrada_job_ocr(job_id)):
+                atualizar_job_ocr(job_id, status=STATUS_JOB_ERRO, mensagem="Arquivo de entrada não encontrado.")
+            elif reivindicar_job_ocr(job_id):
+                self._submeter(job_id)
+
+    def _submeter(self, job_id):
+        self.executor.submit(executar_job_ocr, job_id, self.ocrmypdf_path, self.pandoc_path, self.api_key)
+
+    def enviar(self, pdf_bytes, nome_arquivo, opcoes):
+        job_id = criar_job_ocr(pdf_bytes, nome_arquivo, opcoes)
+        self._submeter(job_id)
+        return job_id
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Thesaurus (dicionário de termos) e geração de resumo e termos de indexação de proposições."""
+import re
+
+from .artefatos import carregar_ou_construir
+from .diagnostico import medir
+from .exemplos_indexacao import buscar_exemplos
+from .llm import gerar_resumo, gerar_termos_llm
+from .mensagens import NIVEL_ERRO, registrar
+from .normalizacao import TextoNormalizado, compilar_normalizado
+
+ARQUIVO_DICIONARIO_TERMOS = "dicionario_termos.txt"
+SEM_RESUMO = "Não precisa de resumo."
+
+# Regras de indexação fixa, sem diferença de maiúsculas nem acentos ("MUNICIPIO" de OCR
+# casa com "Município"): casam contra o texto normalizado da proposição.
+REGRA_DOACAO = compilar_normalizado(r"Município de ([\w\s-]+?)(?:\s+o\simóvel|\s+os\simóveis|\s*\d)")
+REGRA_SERVIDAO = compilar_normalizado(r"declara de utilidade pública,.*servidão.*no Município de ([\w\s-]+)", re.DOTALL)
+REGRA_UTILIDADE_PUBLICA = compilar_normalizado(r"declara de utilidade pública.*no Município de ([\w\s-]+)", re.DOTALL)
+REGRA_POLITICA_ESTADUAL = compilar_normalizado(
+    r"institui (?:a|o) (?:política|programa) estadual|cria (?:a|o) (?:política|programa) estadual"
+)
+
+def carregar_dicionario_termos(nome_arquivo, mensagens=None):
+    termos = []
+    mapa_hierarquia = {}
+    
+    try:
+        with open(nome_arquivo, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                
+                partes = [p.strip() for p in line.split('>') if p.strip()]
+                
+                if not partes:
+                    continue
+
+                termo_especifico = partes[-1]
+                if termo_especifico:
+                    termo_especifico = termo_especifico.replace('\t', '')
+                    termos.append(termo_especifico)
+                
+                if len(partes) > 1:
+                    termo_pai = partes[-2].replace('\t', '')
+                    if termo_pai not in mapa_hierarquia:
+                        mapa_hierarquia[termo_pai] = []
+                    mapa_hierarquia[termo_pai].append(termo_especifico)
+                    
+    except FileNotFoundError:
+        registrar(mensagens, NIVEL_ERRO, f"Erro: O arquivo '{nome_arquivo}' não foi encontrado.")
+        return [], {}
+    except Exception as e:
+        registrar(mensagens, NIVEL_ERRO, f"Ocorreu um erro ao carregar o dicionário de termos: {e}")
+        return [], {}
+        
+    return termos, mapa_hierarquia
+
+def obter_dicionario_termos(nome_arquivo, mensagens=None):
+    """Como `carregar_dicionario_termos`, mas lê do artefato pré-processado quando houver."""
+    def construir():
+        termos, mapa_hierarquia = carregar_dicionario_termos(nome_arquivo, mensagens)
+        return (termos, mapa_hierarquia) if termos else None
+    return carregar_ou_construir("thesaurus", nome_arquivo, construir) or ([], {})
+
+def aplicar_logica_hierarquia(termos_sugeridos, mapa_hierarquia):
+    termos_finais = set(termos_sugeridos)
+    mapa_inverso_hierarquia = {}
+    
+    for pai, filhos in mapa_hierarquia.items():
+        for filho in filhos:
+            mapa_inverso_hierarquia[filho] = pai
+    
+    termos_a_remover = set()
+    for termo in termos_sugeridos:
+        if termo in mapa_inverso_hierarquia:
+            termo_pai = mapa_inverso_hierarquia[termo]
+            if termo_pai in termos_finais:
+                termos_a_remover.add(termo_pai)
+                
+    termos_finais = termos_finais - termos_a_remover
+    return list(termos_finais)
+
+def termos_por_regra(texto_proposicao):
+    """
+    Proposições de doação de imóvel, servidão administrativa e utilidade pública têm
+    indexação fixa (tipo + município) e não precisam de resumo. Retorna os termos ou None.
+    O nome do município sai do texto original, com os acentos e as maiúsculas de lá.
+    """
+    normalizado = TextoNormalizado(texto_proposicao)
+    for regra, tipo in (
+        (REGRA_DOACAO, "Doação de Imóvel"),
+        (REGRA_SERVIDAO, "Servidão Administrativa"),
+        (REGRA_UTILIDADE_PUBLICA, "Utilidade Pública"),
+    ):
+        match = regra.search(normalizado.texto)
+        if match:
+            inicio, fim = normalizado.span_original(match, 1)
+            return [tipo, texto_proposicao[inicio:fim].strip()]
+    return None
+
+def gerar_resumo_e_termos(texto_proposicao, tipo_documento, termos_dicionario, mapa_hierarquia, num_termos,
+                          api_key=None, mensagens=None, etapas=None, usar_exemplos=True):
+    """
+    Retorna (resumo, termos_finais) para o texto de uma proposição ou requerimento.
+    Com `usar_exemplos`, os exemplos do Manual de Indexação mais parecidos com o texto vão no prompt dos termos.
+    """
+    termos_fixos = termos_por_regra(texto_proposicao)
+    if termos_fixos is not None:
+        return SEM_RESUMO, termos_fixos
+
+    resumo_gerado = ""
+    if tipo_documento == "Proposição":
+        with medir("termos.resumo", etapas, caracteres=len(texto_proposicao)):
+            resumo_gerado = gerar_resumo(texto_proposicao, api_key, mensagens)
+    elif tipo_documento == "Requerimento":
+        resumo_gerado = SEM_RESUMO
+
+    exemplos = []
+    if usar_exemplos:
+        with medir("termos.exemplos", etapas) as atributos:
+            exemplos = buscar_exemplos(texto_proposicao, mensagens=mensagens)
+            atributos["exemplos"] = len(exemplos)
+
+    with medir("termos.termos_llm", etapas, caracteres=len(texto_proposicao), num_termos=num_termos):
+        termos_sugeridos_brutos = gerar_termos_llm(
+            texto_proposicao, termos_dicionario, num_termos, api_key, mensagens, exemplos=exemplos
+        )
+
+    if REGRA_POLITICA_ESTADUAL.search(TextoNormalizado(texto_proposicao).texto):
+        if termos_sugeridos_brutos is not None and "Política Pública" not in termos_sugeridos_brutos:
+            termos_sugeridos_brutos.append("Política Pública")
+
+    if termos_sugeridos_brutos is not None:
+        termos_finais = aplicar_logica_hierarquia(termos_sugeridos_brutos, mapa_hierarquia)
+    else:
+        termos_finais = []
+    return resumo_gerado, termos_finais
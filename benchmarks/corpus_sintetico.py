@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Gera Diários sintéticos (Legislativo, Administrativo e Executivo) com tamanho e
+quantidade de atos controláveis, no formato que os processadores esperam.
+A geração é determinística para uma mesma semente.
+"""
+import random
+from dataclasses import dataclass
+
+MESES = ["JANEIRO", "FEVEREIRO", "MARÇO", "ABRIL", "MAIO", "JUNHO", "JULHO",
+         "AGOSTO", "SETEMBRO", "OUTUBRO", "NOVEMBRO", "DEZEMBRO"]
+
+PALAVRAS = (
+    "assembleia legislativa estado comissão reunião deputado parecer relator projeto "
+    "votação aprovação plenário ordem dia matéria ofício secretaria governo municipal "
+    "educação saúde segurança orçamento fiscal servidor público programa política"
+).split()
+
+LINHAS_POR_PAGINA = 60
+
+@dataclass
+class ParametrosCorpus:
+    paginas: int = 10
+    normas_por_pagina: float = 0.5
+    proposicoes_por_pagina: float = 1.0
+    requerimentos_por_pagina: float = 2.0
+    emendas_por_pagina: float = 0.5
+    semente: int = 2025
+
+def _numero(rng, minimo=1, maximo=99999):
+    return f"{rng.randint(minimo, maximo):,}".replace(",", ".")
+
+def _data_extenso(rng, ano=2025):
+    return f"{rng.randint(1, 28)} DE {rng.choice(MESES)} DE {ano}"
+
+def _frase(rng, palavras=12):
+    texto = " ".join(rng.choice(PALAVRAS) for _ in range(palavras))
+    return texto[0].upper() + texto[1:] + "."
+
+def _quantidade(rng, media_por_pagina):
+    inteiro = int(media_por_pagina)
+    return inteiro + (1 if rng.random() < media_por_pagina - inteiro else 0)
+
+def _preencher(rng, linhas, total):
+    while len(linhas) < total:
+        linhas.append(_frase(rng))
+    return linhas
+
+def paginas_legislativo(parametros):
+    """Retorna a lista de textos de página de um Diário do Legislativo sintético."""
+    rng = random.Random(parametros.semente)
+    paginas = []
+    inicio_pareceres = max(1, int(parametros.paginas * 0.6))
+    for i in range(parametros.paginas):
+        linhas = []
+        if i == 0:
+            linhas.append("Diário do Legislativo - Poder Legislativo")
+        for _ in range(_quantidade(rng, parametros.normas_por_pagina)):
+            tipo = rng.choice(["LEI", "LEI COMPLEMENTAR", "RESOLUÇÃO", "DELIBERAÇÃO DA MESA"])
+            linhas.append(f"{tipo} Nº {_numero(rng, 100, 26000)}, DE {_data_extenso(rng)}")
+            linhas.append(_frase(rng))
+        for _ in range(_quantidade(rng, parametros.proposicoes_por_pagina)):
+            tipo = rng.choice(["PROJETO DE LEI", "PROJETO DE RESOLUÇÃO", "INDICAÇÃO", "MENSAGEM"])
+            linhas.append(f"{tipo} Nº {_numero(rng, 1, 4999)}/2025")
+            if rng.random() < 0.2:
+                linhas.append("Declara de utilidade pública a associação do município.")
+            linhas.append(_frase(rng))
+        for _ in range(_quantidade(rng, parametros.requerimentos_por_pagina)):
+            forma = rng.random()
+            if forma < 0.3:
+                linhas.append("RECEBIMENTO DE PROPOSIÇÃO")
+                linhas.append(f"REQUERIMENTO Nº {_numero(rng, 10000, 19999)}/2025")
+            elif forma < 0.7:
+                linhas.append(f"Nº {_numero(rng, 10000, 19999)}/2025, do deputado Fulano de Tal, em que requer seja formulado voto de congratulações.")
+            else:
+                linhas.append(f"É recebido pela presidência, para posterior apreciação, o Requerimento nº {_numero(rng, 1, 999)}/2025, do deputado Beltrano.")
+        if i == inicio_pareceres:
+            linhas.append("TRAMITAÇÃO DE PROPOSIÇÕES")
+        if i >= inicio_pareceres:
+            for _ in range(_quantidade(rng, parametros.emendas_por_pagina)):
+                linhas.append(f"Conclusão Somos pela aprovação do Projeto de Lei nº {_numero(rng, 1, 4999)}/2025 com as emendas a seguir.")
+                linhas.append(f"EMENDA Nº {rng.randint(1, 9)}")
+                linhas.append(_frase(rng))
+        paginas.append("\n".join(_preencher(rng, linhas, LINHAS_POR_PAGINA)))
+    return paginas
+
+def texto_legislativo(parametros):
+    return "\n".join(paginas_legislativo(parametros))
+
+def paginas_administrativo(parametros):
+    rng = random.Random(parametros.semente)
+    paginas = []
+    for _ in range(parametros.paginas):
+        linhas = []
+        for _ in range(_quantidade(rng, parametros.normas_por_pagina * 2)):
+            tipo = rng.choice(["DELIBERAÇÃO DA MESA", "PORTARIA DGE", "ORDEM DE SERVIÇO PRES/PSEC"])
+            linhas.append(f"{tipo} Nº {_numero(rng, 1, 3999)}/2025")
+            linhas.append(_frase(rng))
+        if rng.random() < 0.1:
+            linhas.append("DECISÃO DA 1ª-SECRETARIA")
+        paginas.append("\n".join(_preencher(rng, linhas, LINHAS_POR_PAGINA)))
+    return paginas
+
+def colunas_executivo(parametros):
+    """Retorna, por página, o par (coluna_esquerda, coluna_direita) de um Diário do Executivo sintético."""
+    rng = random.Random(parametros.semente)
+    paginas = []
+    for i in range(parametros.paginas):
+        colunas = []
+        for col in range(2):
+            linhas = []
+            if i == 0 and col == 0:
+                linhas.append("Leis e Decretos")
+            for _ in range(_quantidade(rng, parametros.normas_por_pagina)):
+                tipo = rng.choice(["LEI", "DECRETO", "DECRETO NE", "LEI COMPLEMENTAR"])
+                linhas.append(f"{tipo} Nº {_numero(rng, 100, 49999)}, DE {_data_extenso(rng)}")
+                linhas.append(_frase(rng))
+                if rng.random() < 0.5:
+                    comando = rng.choice(["Ficam revogados", "Fica acrescentado", "passa a vigorar"])
+                    linhas.append(f"{comando} o Decreto nº {_numero(rng, 100, 49999)}, de 1º de janeiro de 2020.")
+            if i == parametros.paginas - 1 and col == 1:
+                linhas.append("Atos do Governador")
+            colunas.append("\n".join(_preencher(rng, linhas, LINHAS_POR_PAGINA // 2)))
+        paginas.append(tuple(colunas))
+    return paginas
+
+def _novo_pdf():
+    import fitz
+    return fitz.open()
+
+def pdf_de_paginas(paginas):
+    """Monta um PDF (bytes) com um texto por página, em coluna única."""
+    doc = _novo_pdf()
+    for texto in paginas:
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (36, 36, -36, -36), texto, fontsize=7)
+    dados = doc.tobytes()
+    doc.close()
+    return dados
+
+def pdf_de_colunas(paginas):
+    """Monta um PDF (bytes) em duas colunas por página."""
+    doc = _novo_pdf()
+    for esquerda, direita in paginas:
+        page = doc.new_page()
+        meio = page.rect.width / 2
+        page.insert_textbox((36, 36, meio - 9, page.rect.height - 36), esquerda, fontsize=7)
+        page.insert_textbox((meio + 9, 36, page.rect.width - 36, page.rect.height - 36), direita, fontsize=7)
+    dados = doc.tobytes()
+    doc.close()
+    return dados
+
+def pdf_legislativo(parametros):
+    return pdf_de_paginas(paginas_legislativo(parametros))
+
+def pdf_administrativo(parametros):
+    return pdf_de_paginas(paginas_administrativo(parametros))
+
+def pdf_executivo(parametros):
+    return pdf_de_colunas(colunas_executivo(parametros))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Mede o tempo de cada etapa dos motores de extração sobre Diários sintéticos
+de vários tamanhos e mostra como cada etapa escala com o número de páginas.
+
+Uso:
+    python benchmarks/extracao.py
+    python benchmarks/extracao.py --tamanhos 10 50 --repeticoes 5
+    python benchmarks/extracao.py --salvar benchmarks/baseline_extracao.json
+    python benchmarks/extracao.py --baseline benchmarks/baseline_extracao.json
+
+Com --baseline, termina com código 1 se alguma etapa ficar acima da
+referência além da tolerância. A referência versionada em
+benchmarks/baseline_extracao.json foi gravada com os parâmetros padrão; tempos
+dependem da máquina, então regrave-a (--salvar) antes de comparar em outro ambiente.
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_REPOSITORIO)
+
+from assistente_gil.diarios import (  # noqa: E402
+    AdministrativeProcessor,
+    ExecutiveProcessor,
+    LegislativeProcessor,
+    extrair_texto_legislativo,
+)
+import corpus_sintetico  # noqa: E402
+
+def cronometrar(funcao, repeticoes):
+    # Uma execução de aquecimento, fora da medição (importações tardias, caches do PyMuPDF etc.).
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+def etapas_para(parametros):
+    """Gera o corpus de um tamanho e devolve {etapa: função sem argumentos}."""
+    texto = corpus_sintetico.texto_legislativo(parametros)
+    pdf_legislativo = corpus_sintetico.pdf_legislativo(parametros)
+    pdf_administrativo = corpus_sintetico.pdf_administrativo(parametros)
+    pdf_executivo = corpus_sintetico.pdf_executivo(parametros)
+    legislativo = LegislativeProcessor(texto)
+    return {
+        "legislativo.extrair_texto": lambda: extrair_texto_legislativo(pdf_legislativo),
+        "legislativo.process_normas": legislativo.process_normas,
+        "legislativo.process_proposicoes": legislativo.process_proposicoes,
+        "legislativo.process_requerimentos": legislativo.process_requerimentos,
+        "legislativo.process_pareceres": legislativo.process_pareceres,
+        "legislativo.process_all": lambda: LegislativeProcessor(texto).process_all(paralelo=False),
+        "legislativo.process_all_paralelo": lambda: LegislativeProcessor(texto).process_all(paralelo=True),
+        "administrativo.process_pdf": lambda: AdministrativeProcessor(pdf_administrativo).process_pdf(),
+        "executivo.find_relevant_pages": lambda: ExecutiveProcessor(pdf_executivo).find_relevant_pages(),
+        "executivo.process_pdf": lambda: ExecutiveProcessor(pdf_executivo).process_pdf(),
+    }
+
+def expoente_escala(tamanhos, tempos):
+    """Inclinação log-log entre o menor e o maior tamanho (1 ≈ linear, 2 ≈ quadrático)."""
+    if len(tamanhos) < 2 or min(tempos[0], tempos[-1]) <= 0:
+        return float("nan")
+    return math.log(tempos[-1] / tempos[0]) / math.log(tamanhos[-1] / tamanhos[0])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10, 50, 100, 500],
+                        help="Número de páginas de cada Diário sintético.")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--normas-por-pagina", type=float, default=0.5)
+    parser.add_argument("--proposicoes-por-pagina", type=float, default=1.0)
+    parser.add_argument("--requerimentos-por-pagina", type=float, default=2.0)
+    parser.add_argument("--emendas-por-pagina", type=float, default=0.5)
+    parser.add_argument("--salvar", help="Grava as medições como nova referência (JSON).")
+    parser.add_argument("--baseline", help="Compara com uma referência gravada anteriormente.")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Aumento relativo aceito em relação à referência (padrão: 0.25).")
+    args = parser.parse_args()
+
+    tamanhos = sorted(args.tamanhos)
+    resultados = {}
+    for tamanho in tamanhos:
+        parametros = corpus_sintetico.ParametrosCorpus(
+            paginas=tamanho,
+            normas_por_pagina=args.normas_por_pagina,
+            proposicoes_por_pagina=args.proposicoes_por_pagina,
+            requerimentos_por_pagina=args.requerimentos_por_pagina,
+            emendas_por_pagina=args.emendas_por_pagina,
+        )
+        for etapa, funcao in etapas_para(parametros).items():
+            resultados.setdefault(etapa, {})[tamanho] = cronometrar(funcao, args.repeticoes)
+
+    largura = max(len(etapa) for etapa in resultados)
+    cabecalho = "".join(f"{f'{t} pág.':>12}" for t in tamanhos)
+    print(f"{'etapa':<{largura}}{cabecalho}{'escala':>9}")
+    for etapa, por_tamanho in resultados.items():
+        tempos = [por_tamanho[t] for t in tamanhos]
+        colunas = "".join(f"{segundos * 1000:10.1f}ms" for segundos in tempos)
+        print(f"{etapa:<{largura}}{colunas}{expoente_escala(tamanhos, tempos):9.2f}")
+
+    planos = {f"{etapa}@{tamanho}": segundos for etapa, por_tamanho in resultados.items()
+              for tamanho, segundos in por_tamanho.items()}
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as f:
+            json.dump(planos, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            referencia = json.load(f)
+        regressoes = [
+            (nome, referencia[nome], segundos) for nome, segundos in planos.items()
+            if nome in referencia and segundos > referencia[nome] * (1 + args.tolerancia)
+        ]
+        for nome, antes, depois in regressoes:
+            print(f"REGRESSÃO: {nome}: {antes * 1000:.1f} ms -> {depois * 1000:.1f} ms")
+        if regressoes:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
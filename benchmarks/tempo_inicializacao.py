@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Mede o tempo de inicialização do aplicativo e o tempo de importação das
+dependências de cada funcionalidade, cada medição num processo Python novo.
+
+Uso:
+    python benchmarks/tempo_inicializacao.py
+    python benchmarks/tempo_inicializacao.py --salvar benchmarks/baseline_inicializacao.json
+    python benchmarks/tempo_inicializacao.py --baseline benchmarks/baseline_inicializacao.json
+
+Com --baseline, termina com código 1 se alguma medição ficar acima da
+referência além da tolerância.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ETAPA_APP = "Importação do app.py"
+
+CODIGO_MEDICAO = """
+import json, sys, time
+sys.path.insert(0, {raiz!r})
+inicio = time.perf_counter()
+import app
+fim_app = time.perf_counter()
+funcionalidade = {funcionalidade!r}
+if funcionalidade:
+    app.carregar_dependencias_funcionalidade(funcionalidade)
+fim = time.perf_counter()
+print(json.dumps({{"app": fim_app - inicio, "funcionalidade": fim - fim_app}}))
+"""
+
+def medir(funcionalidade, repeticoes):
+    tempos_app, tempos_funcionalidade = [], []
+    codigo = CODIGO_MEDICAO.format(raiz=RAIZ_REPOSITORIO, funcionalidade=funcionalidade)
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", codigo],
+            check=True, capture_output=True, text=True, cwd=RAIZ_REPOSITORIO
+        )
+        resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+        tempos_app.append(resultado["app"])
+        tempos_funcionalidade.append(resultado["funcionalidade"])
+    return statistics.median(tempos_app), statistics.median(tempos_funcionalidade)
+
+def listar_funcionalidades():
+    codigo = (
+        f"import json, sys; sys.path.insert(0, {RAIZ_REPOSITORIO!r}); import app; "
+        "print(json.dumps(list(app.DEPENDENCIAS_POR_FUNCIONALIDADE)))"
+    )
+    saida = subprocess.run([sys.executable, "-c", codigo], check=True, capture_output=True, text=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--salvar", help="Grava as medições como nova referência (JSON).")
+    parser.add_argument("--baseline", help="Compara com uma referência gravada anteriormente.")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Aumento relativo aceito em relação à referência (padrão: 0.25).")
+    args = parser.parse_args()
+
+    resultados = {}
+    tempos_app = []
+    for funcionalidade in listar_funcionalidades():
+        tempo_app, tempo_funcionalidade = medir(funcionalidade, args.repeticoes)
+        tempos_app.append(tempo_app)
+        resultados[funcionalidade] = tempo_funcionalidade
+    resultados = {ETAPA_APP: statistics.median(tempos_app), **resultados}
+
+    largura = max(len(nome) for nome in resultados)
+    for nome, segundos in resultados.items():
+        print(f"{nome:<{largura}}  {segundos * 1000:9.1f} ms")
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            referencia = json.load(f)
+        regressoes = [
+            (nome, referencia[nome], segundos) for nome, segundos in resultados.items()
+            if nome in referencia and segundos > referencia[nome] * (1 + args.tolerancia)
+        ]
+        for nome, antes, depois in regressoes:
+            print(f"REGRESSÃO: {nome}: {antes * 1000:.1f} ms -> {depois * 1000:.1f} ms")
+        if regressoes:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Gera o corpus sintético de regressão em regressao/corpus/. Só precisa ser
+executado quando o corpus mudar; os arquivos gerados ficam versionados.
+
+Uso:
+    python regressao/gerar_corpus.py
+"""
+import os
+import sys
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(DIRETORIO), "benchmarks"))
+
+import corpus_sintetico  # noqa: E402
+
+DIRETORIO_CORPUS = os.path.join(DIRETORIO, "corpus")
+
+# Casos que o gerador aleatório não cobre: trechos que devem ser ignorados,
+# requerimentos aprovados/não recebidos e emendas a projetos de lei complementar.
+CASOS_ESPECIAIS_LEGISLATIVO = """
+Comissão de Constituição e Justiça. Opinamos por se dar à proposição a seguinte redação final:
+PROJETO DE LEI Nº 3.001/2025
+Estabelece diretrizes para a política estadual.
+PROJETO DE LEI Nº 3.002/2025
+(Redação do Vencido)
+PROJETO DE LEI Nº 3.003/2025
+Na publicação da matéria em epígrafe, onde se lê
+PROJETO DE LEI COMPLEMENTAR Nº 45/2025
+Declara de utilidade pública a Associação Comunitária do Bairro Centro.
+LEI COMPLEMENTAR Nº 180, DE 12 DE MAIO DE 2025
+RESOLUÇÃO Nº 5.612/2025
+Ofício nº 12/2025, da Secretaria de Governo, com informações relativas ao Requerimento nº 11.111/2025
+da Comissão de Saúde, informando que, na reunião de ontem, foi aprovado o Requerimento nº 11.112/2025
+RECEBIMENTO DE PROPOSIÇÃO
+REQUERIMENTO Nº 11.111/2025
+REQUERIMENTO Nº 11.113/2025
+É recebido pela presidência, submetido a votação e aprovado o Requerimento nº 2.345/2025, do deputado Ciclano.
+nº 12.001/2025, da deputada Fulana, em que requer seja formulada manifestação de pesar pelo falecimento.
+Nº 12.002/2025, do deputado Beltrano, em que requer seja formulada manifestação de repúdio.
+PROPOSIÇÕES NÃO RECEBIDAS
+REQUERIMENTO Nº 13.001/2025
+TRAMITAÇÃO DE PROPOSIÇÕES
+EMENDAS AO PROJETO DE LEI Nº 1.500/2025
+EMENDA Nº 2 AO PROJETO DE LEI COMPLEMENTAR Nº 46/2025
+Conclusão Somos pela aprovação do Projeto de Lei nº 1.501/2025 na forma do Substitutivo nº 1.
+SUBSTITUTIVO Nº 1
+EMENDA Nº 1
+Votação do Requerimento nº 9.999/2025 EMENDA Nº 7
+Diário do Legislativo
+"""
+
+def main():
+    os.makedirs(DIRETORIO_CORPUS, exist_ok=True)
+    parametros = corpus_sintetico.ParametrosCorpus(paginas=20, semente=36)
+
+    with open(os.path.join(DIRETORIO_CORPUS, "legislativo.txt"), "w", encoding="utf-8") as f:
+        f.write(corpus_sintetico.texto_legislativo(parametros) + CASOS_ESPECIAIS_LEGISLATIVO)
+    with open(os.path.join(DIRETORIO_CORPUS, "administrativo.pdf"), "wb") as f:
+        f.write(corpus_sintetico.pdf_administrativo(parametros))
+    with open(os.path.join(DIRETORIO_CORPUS, "executivo.pdf"), "wb") as f:
+        f.write(corpus_sintetico.pdf_executivo(parametros))
+
+if __name__ == "__main__":
+    main()
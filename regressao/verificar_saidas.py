@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Verifica, sem acesso à rede, se os motores de extração produzem exatamente as
+planilhas esperadas para o corpus de regressão. Use antes de publicar qualquer
+otimização das regras de extração.
+
+Uso:
+    python regressao/verificar_saidas.py              # compara; código 1 se houver diferença
+    python regressao/verificar_saidas.py --atualizar  # regrava as saídas esperadas
+
+Só use --atualizar quando a mudança de saída for intencional.
+"""
+import argparse
+import difflib
+import os
+import sys
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRETORIO))
+
+from assistente_gil.diarios import AdministrativeProcessor, ExecutiveProcessor, LegislativeProcessor  # noqa: E402
+
+DIRETORIO_CORPUS = os.path.join(DIRETORIO, "corpus")
+DIRETORIO_ESPERADO = os.path.join(DIRETORIO, "esperado")
+
+def _ler(nome, modo="r"):
+    caminho = os.path.join(DIRETORIO_CORPUS, nome)
+    if modo == "rb":
+        with open(caminho, "rb") as f:
+            return f.read()
+    with open(caminho, "r", encoding="utf-8") as f:
+        return f.read()
+
+def saidas_atuais():
+    """Retorna {nome_do_arquivo_esperado: DataFrame} para todo o corpus."""
+    saidas = {}
+    for sheet_name, df in LegislativeProcessor(_ler("legislativo.txt")).process_all().items():
+        saidas[f"legislativo_{sheet_name}.csv"] = df
+    saidas["administrativo.csv"] = AdministrativeProcessor(_ler("administrativo.pdf", "rb")).process_pdf()
+    saidas["executivo.csv"] = ExecutiveProcessor(_ler("executivo.pdf", "rb")).process_pdf()
+    return saidas
+
+def para_csv(df):
+    return df.to_csv(index=False, lineterminator="\n")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--atualizar", action="store_true", help="Regrava as saídas esperadas.")
+    args = parser.parse_args()
+
+    os.makedirs(DIRETORIO_ESPERADO, exist_ok=True)
+    divergencias = 0
+    for nome, df in saidas_atuais().items():
+        caminho = os.path.join(DIRETORIO_ESPERADO, nome)
+        atual = para_csv(df)
+        if args.atualizar:
+            with open(caminho, "w", encoding="utf-8", newline="\n") as f:
+                f.write(atual)
+            print(f"atualizado: {nome} ({len(df)} linhas)")
+            continue
+        if not os.path.exists(caminho):
+            print(f"FALTANDO: {nome} (rode com --atualizar)")
+            divergencias += 1
+            continue
+        with open(caminho, "r", encoding="utf-8", newline="") as f:
+            esperado = f.read()
+        if atual == esperado:
+            print(f"ok: {nome} ({len(df)} linhas)")
+        else:
+            divergencias += 1
+            print(f"DIVERGENTE: {nome}")
+            sys.stdout.writelines(difflib.unified_diff(
+                esperado.splitlines(keepends=True), atual.splitlines(keepends=True),
+                fromfile=f"esperado/{nome}", tofile=f"atual/{nome}"
+            ))
+
+    if divergencias:
+        print(f"{divergencias} saída(s) divergente(s).")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_REPOSITORIO)
+# Caches e bancos dos testes ficam num diretório próprio, e não no cache do servidor.
+os.environ.setdefault("GIL_CACHE_DIR", tempfile.mkdtemp(prefix="gil_testes_"))
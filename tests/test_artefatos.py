@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from dataclasses import asdict
+
+import pytest
+
+from assistente_gil import artefatos
+from assistente_gil.exemplos_indexacao import ExemploIndexacao
+
+@pytest.fixture
+def origem(tmp_path, monkeypatch):
+    monkeypatch.setattr(artefatos, "DIRETORIO_ARTEFATOS", str(tmp_path / "artefatos"))
+    caminho = tmp_path / "dicionario.txt"
+    caminho.write_text("Saúde > Hospital\n", encoding="utf-8")
+    return str(caminho)
+
+def test_artefato_gravado_em_json_e_reaproveitado(origem):
+    dados = [["Saúde", "Hospital"], {"Saúde": ["Hospital"]}]
+    construcoes = []
+
+    def construir():
+        construcoes.append(1)
+        return dados
+
+    assert artefatos.carregar_ou_construir("thesaurus", origem, construir) == dados
+    assert artefatos.carregar_ou_construir("thesaurus", origem, construir) == dados
+    assert len(construcoes) == 1
+    with open(artefatos.caminho_artefato("thesaurus", origem), encoding="utf-8") as f:
+        assert json.load(f)["dados"][1] == {"Saúde": ["Hospital"]}
+
+def test_artefato_ilegivel_e_refeito(origem):
+    artefatos.carregar_ou_construir("texto", origem, lambda: "texto")
+    with open(artefatos.caminho_artefato("texto", origem), "wb") as f:
+        f.write(b"\x80\x04\x95 nao e json")
+    assert not artefatos.artefato_valido("texto", origem)
+    assert artefatos.carregar_ou_construir("texto", origem, lambda: "refeito") == "refeito"
+
+def test_falha_ao_gravar_nao_deixa_temporario(origem, monkeypatch):
+    def replace(origem, destino):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(artefatos.os, "replace", replace)
+    assert artefatos.carregar_ou_construir("texto", origem, lambda: "texto") == "texto"
+    assert os.listdir(artefatos.DIRETORIO_ARTEFATOS) == []
+
+def test_exemplo_volta_do_json_igual():
+    exemplo = ExemploIndexacao(tipo="PL 1/2025", ementa="Ementa.", indexacao=("Thesaurus/Tema",), resumo="",
+                               pagina=3, secao="2.1.", outros=(("Apelido", "Lei X"),))
+    assert ExemploIndexacao.de_dicionario(json.loads(json.dumps(asdict(exemplo)))) == exemplo
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from assistente_gil.dependencias import fitz
+from assistente_gil.diarios import ExecutiveProcessor, colunas_da_pagina
+from assistente_gil.normalizacao import TextoNormalizado
+
+def _chaves(texto):
+    _, referencias = ExecutiveProcessor(b"").indexar_referencias(TextoNormalizado(texto))
+    return [chave for _, _, chave in referencias]
+
+def test_ano_da_referencia_nao_vem_de_outra_norma():
+    texto = (
+        "Fica acrescentado ao Decreto nº 555, de acordo com o disposto no regulamento, "
+        + "o seguinte parágrafo, com a redação dada pelo órgão competente. " * 10
+        + "LEI Nº 9, DE 5 DE MAIO DE 2019"
+    )
+    assert _chaves(texto) == ["DEC 555", "LEI 9 2019"]
+
+def test_ano_da_data_por_extenso():
+    assert _chaves("alterado pela Lei Complementar nº 1.234, de 31 de dezembro de 2019.") == ["LCP 1234 2019"]
+
+# --- Ordem de leitura das colunas (colunas_da_pagina) ---
+COLUNAS_2 = ((40, 290), (305, 555))
+COLUNAS_3 = ((40, 200), (215, 375), (390, 555))
+TITULO_LARGO = (40, 140, 555, "TITULO LARGO QUE ATRAVESSA AS COLUNAS DA PAGINA DE UMA MARGEM A OUTRA")
+
+def _pagina(trechos):
+    """PDF de uma página com cada (x0, y0, x1, texto) num bloco de texto próprio."""
+    doc = fitz.open()
+    pagina = doc.new_page(width=595, height=842)
+    for x0, y0, x1, texto in trechos:
+        pagina.insert_textbox(fitz.Rect(x0, y0, x1, y0 + 14 * (texto.count("\n") + 1) + 4), texto, fontsize=10)
+    return doc
+
+def _faixa(colunas, y0, rotulo, linhas=3):
+    return [
+        (x0, y0, x1, "\n".join(f"{rotulo}{numero} linha {i}" for i in range(linhas)))
+        for numero, (x0, x1) in enumerate(colunas, start=1)
+    ]
+
+def _ordem(doc):
+    return [(coluna, texto.split()[0]) for coluna, texto in colunas_da_pagina(doc[0])]
+
+def test_duas_colunas_com_titulo_largo():
+    doc = _pagina(_faixa(COLUNAS_2, 60, "A") + [TITULO_LARGO] + _faixa(COLUNAS_2, 180, "B"))
+    assert _ordem(doc) == [(1, "A1"), (2, "A2"), (1, "TITULO"), (1, "B1"), (2, "B2")]
+
+def test_tres_colunas_com_titulo_largo():
+    doc = _pagina(_faixa(COLUNAS_3, 60, "A") + [TITULO_LARGO] + _faixa(COLUNAS_3, 180, "B"))
+    assert _ordem(doc) == [(1, "A1"), (2, "A2"), (3, "A3"), (1, "TITULO"), (1, "B1"), (2, "B2"), (3, "B3")]
+
+def test_tres_colunas_com_titulo_curto_na_margem():
+    doc = _pagina(_faixa(COLUNAS_3, 60, "A") + [(40, 140, 160, "CURTO")] + _faixa(COLUNAS_3, 180, "B"))
+    assert _ordem(doc) == [(1, "A1"), (2, "A2"), (3, "A3"), (1, "CURTO"), (1, "B1"), (2, "B2"), (3, "B3")]
+
+def test_coluna_mais_longa_continua_na_faixa():
+    doc = _pagina(_faixa(COLUNAS_3, 60, "A") + [(40, 140, 200, "A1 continua\nem duas linhas\ne mais uma")])
+    assert _ordem(doc) == [(1, "A1"), (2, "A2"), (3, "A3")]
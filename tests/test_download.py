@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+from contextlib import closing
+
+import pytest
+
+from assistente_gil import download
+from assistente_gil.documento import DocumentoPDF
+
+@pytest.fixture
+def cache_downloads(tmp_path, monkeypatch):
+    monkeypatch.setattr(download, "DOWNLOAD_CACHE_DIR", str(tmp_path / "downloads"))
+    monkeypatch.setattr(download, "DOWNLOAD_CACHE_DB", str(tmp_path / "downloads.sqlite3"))
+    monkeypatch.setattr(download, "DOWNLOAD_CACHE_MAX_BYTES", 10)
+    monkeypatch.setattr(download, "_downloads_em_uso", {})
+    monkeypatch.setattr(download, "_downloads_substituidos", set())
+
+def _entrada(conn, nome, ultimo_acesso):
+    caminho = os.path.join(download.DOWNLOAD_CACHE_DIR, nome)
+    with open(caminho, "wb") as f:
+        f.write(b"%PDF-" + b"x" * 3)
+    conn.execute(
+        "INSERT INTO downloads (url, arquivo, tamanho, ultimo_acesso) VALUES (?, ?, ?, ?)",
+        (f"http://exemplo/{nome}", nome, 8, ultimo_acesso)
+    )
+    conn.commit()
+    return caminho
+
+def test_limpeza_pula_arquivo_em_uso(cache_downloads):
+    agora = time.time()
+    with closing(download._conectar_cache_downloads()) as conn:
+        antigo = _entrada(conn, "antigo", agora - 20)
+        medio = _entrada(conn, "medio", agora - 10)
+        _entrada(conn, "novo", agora)
+        documento = DocumentoPDF(caminho=antigo, ao_fechar=download.liberar_download)
+        download.reservar_download(antigo)
+
+        download._remover_downloads_excedentes(conn)
+
+        assert os.path.exists(antigo)  # mais antigo, mas aberto: fica
+        assert not os.path.exists(medio)
+
+        documento.fechar()
+        documento.fechar()  # fechar de novo não libera duas vezes
+        assert download._downloads_em_uso == {}
+        _entrada(conn, "outro", agora + 10)
+        download._remover_downloads_excedentes(conn)
+        assert not os.path.exists(antigo)
+
+class RespostaFalsa:
+    status_code = 200
+
+    def __init__(self, conteudo):
+        self.conteudo = conteudo
+        self.headers = {"Content-Type": "application/pdf", "ETag": str(hash(conteudo))}
+
+    def iter_content(self, tamanho):
+        yield self.conteudo
+
+    def close(self):
+        pass
+
+def test_versao_nova_nao_sobrescreve_arquivo_em_uso(cache_downloads, monkeypatch):
+    monkeypatch.setattr(download, "DOWNLOAD_CACHE_MAX_BYTES", 1024)
+    versoes = iter([b"%PDF-versao 1", b"%PDF-versao 2"])
+
+    class SessaoFalsa:
+        def get(self, url, headers, stream, timeout):
+            return RespostaFalsa(next(versoes))
+
+    monkeypatch.setattr(download, "obter_sessao", SessaoFalsa)
+    url = "http://exemplo/diario.pdf"
+
+    primeiro = download.baixar_pdf(url)  # continua aberto em outra sessão
+    segundo = download.baixar_pdf(url)
+
+    assert primeiro != segundo
+    with open(primeiro, "rb") as f:
+        assert f.read() == b"%PDF-versao 1"
+    with open(segundo, "rb") as f:
+        assert f.read() == b"%PDF-versao 2"
+
+    download.liberar_download(primeiro)  # versão antiga, sem entrada no cache: sai ao ser liberada
+    assert not os.path.exists(primeiro)
+    download.liberar_download(segundo)
+    assert os.path.exists(segundo)
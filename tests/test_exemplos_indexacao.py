@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from assistente_gil import exemplos_indexacao
+from assistente_gil.exemplos_indexacao import ExemploIndexacao, IndiceExemplos, contexto_manual_indexacao
+
+EMENTAS = (
+    "Transfere, simbolicamente, a Capital do Estado para o Município de Mariana.",
+    "Requer seja formulado voto de congratulações com a comunidade escolar pelos 50 anos da escola.",
+    "Declara de utilidade pública a Associação Comunitária do Bairro Centro, com sede no Município de Betim.",
+    "Dá denominação a escola estadual situada no Município de Ouro Preto.",
+    "Estabelece regras gerais para a concessão de pensão especial.",
+)
+
+@pytest.fixture
+def indice(monkeypatch):
+    exemplos = [
+        ExemploIndexacao(tipo=f"PL {numero}/2025", ementa=ementa, indexacao=("Thesaurus/Tema",), resumo="", pagina=numero)
+        for numero, ementa in enumerate(EMENTAS, start=1)
+    ]
+    indice = IndiceExemplos(exemplos, [f"Texto da página {numero}" for numero in range(1, len(EMENTAS) + 1)])
+    monkeypatch.setattr(exemplos_indexacao, "_indice_exemplos", indice)
+    return indice
+
+@pytest.mark.parametrize("pergunta", [
+    "Qual é a capital da França?",
+    "quais as regras gerais para escrever um resumo?",
+])
+def test_pergunta_fora_do_assunto_usa_o_manual_inteiro(indice, pergunta):
+    assert contexto_manual_indexacao(pergunta) is None
+
+def test_pergunta_sobre_um_exemplo_usa_o_trecho(indice):
+    contexto = contexto_manual_indexacao("Como indexar requerimento de voto de congratulações?")
+    assert contexto is not None
+    assert "[Página 2]" in contexto
+    assert "voto de congratulações" in contexto
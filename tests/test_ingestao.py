@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+from collections import Counter
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from assistente_gil import download, indice, ingestao
+
+PDF_EXECUTIVO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "regressao", "corpus", "executivo.pdf")
+
+# Respostas do servidor local por data: 200 com o PDF, ou o status de "sem edição".
+RESPOSTAS = {"2025-03-10": 200, "2025-03-11": 200, "2025-03-12": 404, "2025-03-13": 410}
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    monkeypatch.setattr(download, "DOWNLOAD_CACHE_DIR", str(tmp_path / "downloads"))
+    monkeypatch.setattr(download, "DOWNLOAD_CACHE_DB", str(tmp_path / "downloads.sqlite3"))
+    monkeypatch.setattr(indice, "INDICE_DB", str(tmp_path / "indice.sqlite3"))
+    monkeypatch.setattr(ingestao, "INDICE_DB", str(tmp_path / "indice.sqlite3"))
+    with open(PDF_EXECUTIVO, "rb") as f:
+        conteudo = f.read()
+    pedidos = Counter()
+
+    class Espelho(BaseHTTPRequestHandler):
+        def do_GET(self):
+            data = os.path.splitext(os.path.basename(self.path))[0]
+            pedidos[data] += 1
+            status = RESPOSTAS.get(data, 404)
+            self.send_response(status)
+            if status == 200:
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(len(conteudo)))
+                self.end_headers()
+                self.wfile.write(conteudo)
+            else:
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    http = ThreadingHTTPServer(("127.0.0.1", 0), Espelho)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{http.server_port}/{{diario}}/{{data:%Y-%m-%d}}.pdf", pedidos
+    http.shutdown()
+    http.server_close()
+
+def test_sem_modelo_de_link_falha_com_mensagem_clara():
+    with pytest.raises(ValueError, match="modelo do link do PDF"):
+        ingestao.gerador_de_links("executivo", "")
+
+def test_retoma_ingestao_interrompida(servidor):
+    modelo, pedidos = servidor
+    inicio, fim = date(2025, 3, 10), date(2025, 3, 13)
+
+    class Interrupcao(Exception):
+        pass
+
+    def interromper(feitas, total):
+        raise Interrupcao()
+
+    # A primeira data termina e é registrada; a ingestão para antes das demais.
+    with pytest.raises(Interrupcao):
+        ingestao.ingerir_periodo("executivo", inicio, fim, ingestao.gerador_de_links("executivo", modelo),
+                                 max_trabalhos=1, progresso=interromper)
+
+    contagem = ingestao.ingerir_periodo("executivo", inicio, fim, ingestao.gerador_de_links("executivo", modelo),
+                                        max_trabalhos=1)
+
+    assert contagem == {ingestao.STATUS_INGESTAO_CONCLUIDA: 2, ingestao.STATUS_INGESTAO_SEM_EDICAO: 2,
+                        ingestao.STATUS_INGESTAO_ERRO: 0}
+    assert pedidos["2025-03-10"] == 1  # concluída antes da interrupção: não é baixada de novo
+    andamento = ingestao.obter_andamento_ingestao("executivo", inicio, fim)
+    assert andamento["2025-03-12"]["status"] == ingestao.STATUS_INGESTAO_SEM_EDICAO
+    assert andamento["2025-03-13"]["status"] == ingestao.STATUS_INGESTAO_SEM_EDICAO
+    assert andamento["2025-03-11"]["registros"] > 0
+
+    # Uma nova execução não baixa nada: todas as datas já têm status final.
+    antes = sum(pedidos.values())
+    ingestao.ingerir_periodo("executivo", inicio, fim, ingestao.gerador_de_links("executivo", modelo))
+    assert sum(pedidos.values()) == antes
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+from contextlib import closing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from assistente_gil import llm
+
+class RespostaFalsa:
+    def __init__(self, texto, status_code=200):
+        self.texto = texto
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"candidates": [{"content": {"parts": [{"text": self.texto}]}}]}
+
+@pytest.fixture
+def cache_respostas(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm, "CACHE_RESPOSTAS_DB", str(tmp_path / "respostas.sqlite3"))
+
+def test_resposta_ilegivel_nao_vai_para_o_cache(cache_respostas, monkeypatch):
+    respostas = iter([RespostaFalsa("não sei"), RespostaFalsa('["Saúde"]')])
+    chamadas = []
+
+    def post(url, json):
+        chamadas.append(url)
+        return next(respostas)
+
+    monkeypatch.setattr(llm.requests, "post", post)
+    assert llm.gerar_termos_llm("Texto da proposição.", ["Saúde"], 3, api_key="k") == []
+    assert llm.gerar_termos_llm("Texto da proposição.", ["Saúde"], 3, api_key="k") == ["Saúde"]
+    # A lista válida fica em cache: a terceira chamada não vai à API.
+    assert llm.gerar_termos_llm("Texto da proposição.", ["Saúde"], 3, api_key="k") == ["Saúde"]
+    assert len(chamadas) == 2
+
+class ApiFalsa:
+    """Servidor HTTP local no lugar da API Gemini: cachedContents e generateContent."""
+    def __init__(self):
+        self.pedidos = []  # (método, caminho sem a query, corpo)
+        self.contextos = set()
+        self.status_forcado = None  # status de todas as respostas de generateContent, se definido
+        api = self
+
+        class Tratador(BaseHTTPRequestHandler):
+            def _responder(self, status, corpo):
+                dados = json.dumps(corpo).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def do_POST(self):
+                corpo = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                caminho = self.path.split("?")[0]
+                api.pedidos.append(("POST", caminho, corpo))
+                if caminho == "/cachedContents":
+                    nome = f"cachedContents/c{len(api.contextos) + len(api.pedidos)}"
+                    api.contextos.add(nome)
+                    return self._responder(200, {"name": nome})
+                if api.status_forcado:
+                    return self._responder(api.status_forcado, {"error": {"code": api.status_forcado}})
+                if corpo.get("cachedContent") and corpo["cachedContent"] not in api.contextos:
+                    return self._responder(404, {"error": {"code": 404}})
+                self._responder(200, {"candidates": [{"content": {"parts": [{"text": "resposta"}]}}]})
+
+            def log_message(self, *args):
+                pass
+
+        self.http = ThreadingHTTPServer(("127.0.0.1", 0), Tratador)
+        self.url = f"http://127.0.0.1:{self.http.server_port}"
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+    def gerados(self):
+        """Corpos dos pedidos de generateContent, em ordem."""
+        return [corpo for metodo, caminho, corpo in self.pedidos if caminho.endswith(":generateContent")]
+
+    def criados(self):
+        return [caminho for metodo, caminho, corpo in self.pedidos if caminho == "/cachedContents"]
+
+@pytest.fixture
+def api_falsa(cache_respostas, monkeypatch):
+    api = ApiFalsa()
+    monkeypatch.setattr(llm, "GEMINI_API_URL", api.url)
+    monkeypatch.setattr(llm, "CONTEXTO_CACHE_HABILITADO", True)
+    yield api
+    api.http.shutdown()
+    api.http.server_close()
+
+def test_contexto_em_cache_criado_reaproveitado_e_substituido(api_falsa):
+    documento = "Texto do Regimento Interno. " * 50
+
+    assert llm.answer_from_document("Pergunta 1", "k", documento) == "resposta"
+    assert llm.answer_from_document("Pergunta 2", "k", documento) == "resposta"
+    assert len(api_falsa.criados()) == 1
+    nome = api_falsa.gerados()[0]["cachedContent"]
+    assert [corpo.get("cachedContent") for corpo in api_falsa.gerados()] == [nome, nome]
+    assert documento not in json.dumps(api_falsa.gerados())
+
+    # Contexto apagado na API antes do prazo: 404, e o documento vai no próprio pedido.
+    api_falsa.contextos.clear()
+    assert llm.answer_from_document("Pergunta 3", "k", documento) == "resposta"
+    recusado, em_linha = api_falsa.gerados()[-2:]
+    assert recusado["cachedContent"] == nome
+    assert "cachedContent" not in em_linha
+    assert em_linha["contents"][0]["parts"][0]["text"] == documento
+
+    # O registro foi esquecido: a próxima pergunta cria outro contexto.
+    assert llm.answer_from_document("Pergunta 4", "k", documento) == "resposta"
+    assert len(api_falsa.criados()) == 2
+    novo = api_falsa.gerados()[-1]["cachedContent"]
+    assert novo != nome
+
+    # Registro vencido: cria outro sem tentar usar o antigo.
+    with closing(llm._conectar_contextos()) as conn, conn:
+        conn.execute("UPDATE contextos SET expira_em = 0")
+    assert llm.answer_from_document("Pergunta 5", "k", documento) == "resposta"
+    assert len(api_falsa.criados()) == 3
+    assert api_falsa.gerados()[-1]["cachedContent"] not in (nome, novo)
+
+def test_resumo_usa_o_endereco_configurado(api_falsa):
+    assert llm.gerar_resumo("Texto da proposição.", api_key="k") == "resposta"
+    assert api_falsa.pedidos[-1][1] == f"/models/{llm.MODELO_RESUMO}:generateContent"
+
+def test_contexto_por_chave_de_api(api_falsa):
+    documento = "Texto da Constituição do Estado. " * 50
+
+    for chave in ("chave-1", "chave-2", "chave-1", "chave-2"):
+        assert llm.answer_from_document("Pergunta", chave, documento) == "resposta"
+
+    assert len(api_falsa.criados()) == 2  # um por chave, cada um reaproveitado
+    usados = [corpo["cachedContent"] for corpo in api_falsa.gerados()]
+    assert usados[0] == usados[2] and usados[1] == usados[3] and usados[0] != usados[1]
+    assert llm._travas_contextos == {}
+
+def test_erro_400_nao_descarta_o_contexto(api_falsa):
+    documento = "Texto do Manual de Indexação. " * 50
+    assert llm.answer_from_document("Pergunta 1", "k", documento) == "resposta"
+
+    api_falsa.status_forcado = 400
+    assert llm.answer_from_document("Pergunta 2", "k", documento).startswith("Erro na comunicação com a API")
+    api_falsa.status_forcado = None
+
+    assert llm.answer_from_document("Pergunta 3", "k", documento) == "resposta"
+    assert len(api_falsa.criados()) == 1
+    assert all("cachedContent" in corpo for corpo in api_falsa.gerados())
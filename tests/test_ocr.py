@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from assistente_gil import ocr
+from assistente_gil.dependencias import fitz
+
+class RespostaFalsa:
+    status_code = 200
+
+    def __init__(self, texto):
+        self.texto = texto
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"candidates": [{"content": {"parts": [{"text": self.texto}]}}]}
+
+@pytest.fixture
+def cache_ocr(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr, "OCR_CACHE_DIR", str(tmp_path / "artefatos_ocr"))
+    monkeypatch.setattr(ocr, "OCR_CACHE_DB", str(tmp_path / "artefatos_ocr.sqlite3"))
+
+def test_paginas_puladas_pelo_ocr_nao_vao_a_api(cache_ocr, monkeypatch):
+    enviados = []
+
+    def post(url, headers, data, timeout):
+        enviados.append(data)
+        return RespostaFalsa("corrigida")
+
+    monkeypatch.setattr(ocr.requests, "post", post)
+    sidecar = "[OCR skipped on page 1]\fTexto da página dois\f[OCR skipped on page 3]\n\fTexto da página quatro"
+    texto, falhas = ocr.corrigir_paginas_ocr(sidecar, "k")
+
+    assert len(enviados) == 2
+    assert all("OCR skipped" not in dados for dados in enviados)
+    assert "OCR skipped" not in texto
+    assert falhas == []
+
+def test_sidecar_recortado_as_paginas_pedidas(tmp_path):
+    caminho = str(tmp_path / "documento.pdf")
+    with fitz.open() as doc:
+        for numero in range(1, 5):
+            doc.new_page().insert_text((72, 72), f"Camada de texto da pagina {numero}")
+        doc.save(caminho)
+    # --pages 2-3 com --skip-text: a página 3 já tinha texto e foi pulada.
+    sidecar = "[OCR skipped on page 1]\fOCR da pagina 2\f[OCR skipped on page 3]\f[OCR skipped on page 4]"
+
+    paginas = ocr.dividir_sidecar_em_paginas(ocr.recortar_sidecar(sidecar, caminho, "2-3"))
+
+    assert paginas[0] == "OCR da pagina 2"
+    assert "Camada de texto da pagina 3" in paginas[1]
+    assert len(paginas) == 2
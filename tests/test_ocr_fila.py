@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from assistente_gil import ocr
+
+@pytest.fixture
+def banco_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr, "OCR_JOBS_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(ocr, "OCR_JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+    executados = []
+    monkeypatch.setattr(ocr, "executar_job_ocr", lambda job_id, *args: executados.append(job_id))
+    return executados
+
+def _job_de_processo_encerrado():
+    job_id = ocr.criar_job_ocr(b"%PDF-1.4", "a.pdf", {})
+    ocr.atualizar_job_ocr(job_id, status=ocr.STATUS_JOB_EXECUTANDO, dono="999999999:abcd")
+    return job_id
+
+def test_pendente_retomado_uma_vez_com_varias_filas(banco_jobs):
+    job_id = _job_de_processo_encerrado()
+    ocr.FilaJobsOCR("ocrmypdf", "pandoc", "chave-1")
+    ocr.FilaJobsOCR("ocrmypdf", "pandoc", "chave-2")  # outra chave de API, mesmo processo
+    ocr.obter_executor_jobs_ocr().submit(lambda: None).result(5)
+    assert banco_jobs == [job_id]
+    assert ocr.obter_job_ocr(job_id)["dono"] == ocr.DONO_JOBS_OCR
+
+def test_reivindicacao_e_atomica(banco_jobs):
+    job_id = _job_de_processo_encerrado()
+    assert ocr.reivindicar_job_ocr(job_id)
+    assert not ocr.reivindicar_job_ocr(job_id)
+
+def test_filas_compartilham_o_executor(banco_jobs):
+    assert ocr.FilaJobsOCR("o", "p", "a").executor is ocr.FilaJobsOCR("o", "p", "b").executor
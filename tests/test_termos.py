@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from assistente_gil.termos import termos_por_regra
+
+@pytest.mark.parametrize("texto, termos", [
+    ("Autoriza o Poder Executivo a doar ao Município de São João del-Rei o imóvel que especifica.",
+     ["Doação de Imóvel", "São João del-Rei"]),
+    ("AUTORIZA O PODER EXECUTIVO A DOAR AO MUNICIPIO DE CONCEIÇÃO DO MATO DENTRO OS IMÓVEIS QUE ESPECIFICA.",
+     ["Doação de Imóvel", "CONCEIÇÃO DO MATO DENTRO"]),
+    ("DECLARA DE UTILIDADE PUBLICA, para fins de constituição de servidão, o terreno no Municipio de Itabirito",
+     ["Servidão Administrativa", "Itabirito"]),
+    ("Declara de utilidade pública a Associação Comunitária do Bairro Centro, com sede no município de Pará de Minas",
+     ["Utilidade Pública", "Pará de Minas"]),
+])
+def test_regras_fixas_sem_diferenca_de_caixa_nem_acento(texto, termos):
+    assert termos_por_regra(texto) == termos
+
+def test_proposicao_sem_regra_fixa():
+    assert termos_por_regra("Estabelece regras gerais para a concessão de pensão especial.") is None